@@ -22,9 +22,11 @@ from cloudshell.cp.vcenter.handlers.switch_handler import (
     DvSwitchNotFound,
     VSwitchNotFound,
 )
+from cloudshell.cp.vcenter.handlers.vm_handler import PowerState, VmIsNotPowered
 from cloudshell.cp.vcenter.models.deploy_app import (
     BaseVCenterDeployApp,
     VMFromImageDeployApp,
+    VMFromInstantCloneDeployApp,
     VMFromLinkedCloneDeployApp,
     VMFromTemplateDeployApp,
     VMFromVMDeployApp,
@@ -161,6 +163,34 @@ class ValidationActions:
         vm = dc.get_vm_by_path(vm_path)
         vm.get_snapshot_by_path(snapshot_path)
 
+    def validate_deploy_app_from_instant_clone(
+        self, deploy_app: VMFromInstantCloneDeployApp
+    ):
+        logger.info("Validating deploy app from Instant Clone")
+        self.validate_instant_clone_app_attrs(deploy_app)
+        self.validate_app_from_instant_clone(deploy_app.vcenter_vm)
+
+    @staticmethod
+    def validate_instant_clone_app_attrs(deploy_app: VMFromInstantCloneDeployApp):
+        a_names = VMFromInstantCloneDeployApp.ATTR_NAMES
+        for value, attr_name in (
+            (deploy_app.cpu_num, a_names.cpu_num),
+            (deploy_app.ram_amount, a_names.ram_amount),
+            (deploy_app.hdd_specs, a_names.hdd_specs),
+        ):
+            if value:
+                raise InvalidAttributeException(
+                    f"{attr_name} cannot be changed for the Instant Clone"
+                )
+        deploy_app.guest_info  # raises if the format is wrong
+
+    def validate_app_from_instant_clone(self, vm_path: str):
+        _is_not_empty(vm_path, VMFromInstantCloneDeployApp.ATTR_NAMES.vcenter_vm)
+        dc = self._get_dc()
+        vm = dc.get_vm_by_path(vm_path)
+        if vm.power_state is not PowerState.ON:
+            raise VmIsNotPowered(vm)
+
     def validate_deploy_app_from_image(self, deploy_app: VMFromImageDeployApp):
         logger.info("Validating deploy app from Image")
         self.validate_app_from_image(deploy_app.vcenter_image)
@@ -169,11 +199,6 @@ class ValidationActions:
         _is_not_empty(image_url, VMFromImageDeployApp.ATTR_NAMES.vcenter_image)
         _is_valid_url(image_url, VMFromImageDeployApp.ATTR_NAMES.vcenter_image)
 
-    def validate_ovf_tool(self, ovf_tool_path):
-        logger.info("Validating OVF Tool")
-        _is_not_empty(ovf_tool_path, self._resource_conf.ATTR_NAMES.ovf_tool_path)
-        _is_valid_url(ovf_tool_path, self._resource_conf.ATTR_NAMES.ovf_tool_path)
-
     @staticmethod
     def validate_cluster(cluster: ClusterHandler) -> None:
         if not cluster.hosts:
@@ -7,6 +7,7 @@ VM_FROM_VM_DEPLOYMENT_PATH = f"{SHELL_NAME}.vCenter VM From VM 2G"
 VM_FROM_TEMPLATE_DEPLOYMENT_PATH = f"{SHELL_NAME}.vCenter VM From Template 2G"
 VM_FROM_LINKED_CLONE_DEPLOYMENT_PATH = f"{SHELL_NAME}.vCenter VM From Linked Clone 2G"
 VM_FROM_IMAGE_DEPLOYMENT_PATH = f"{SHELL_NAME}.vCenter VM From Image 2G"
+VM_FROM_INSTANT_CLONE_DEPLOYMENT_PATH = f"{SHELL_NAME}.vCenter VM From Instant Clone 2G"
 
 DEPLOYED_APPS_FOLDER = "Deployed Apps"
 
@@ -39,11 +39,3 @@ class VMIPNotFoundException(BaseVCenterException):
         if self.ip_regex:
             msg = f"{msg} by regex: {self.ip_regex}"
         return msg
-
-
-class EmptyOVFToolResultException(BaseVCenterException):
-    """No response result from the OVF tool."""
-
-
-class DeployOVFToolException(BaseVCenterException):
-    """Failed to deploy VM via OVF tool."""
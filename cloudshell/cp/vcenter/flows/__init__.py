@@ -2,6 +2,7 @@ from .autoload import VCenterAutoloadFlow
 from .cluster_usage import get_cluster_usage
 from .delete_instance import DeleteFlow
 from .deploy_vm import get_deploy_flow
+from .deploy_vm.batch_flow import VCenterBatchDeployFlow
 from .get_attribute_hints.command import get_hints
 from .get_vm_web_console import get_vm_web_console
 from .power_flow import VCenterPowerFlow
@@ -16,6 +17,7 @@ __all__ = (
     VCenterAutoloadFlow,
     VCenterPowerFlow,
     get_deploy_flow,
+    VCenterBatchDeployFlow,
     DeleteFlow,
     get_vm_uuid_by_name,
     get_cluster_usage,
@@ -33,6 +33,7 @@ class VCenterAutoloadFlow:
             si=self._si,
         )
         if vsphere_client is not None:
+            vsphere_client.preload_cache(force=True)
             vsphere_client.create_categories()
             tags = VCenterTagsManager.get_tags_created_by()
             vsphere_client.assign_tags(deployed_apps_folder, tags)
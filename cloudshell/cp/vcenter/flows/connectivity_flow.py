@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 import logging
+from collections import Counter, defaultdict
 from contextlib import suppress
 from functools import cached_property
-from itertools import chain
 from typing import TYPE_CHECKING, Any
 
 from attrs import define, field
@@ -30,7 +30,6 @@ from cloudshell.cp.vcenter.handlers.si_handler import ResourceInUse, SiHandler
 from cloudshell.cp.vcenter.handlers.switch_handler import (
     AbstractSwitchHandler,
     DvSwitchHandler,
-    DvSwitchNotFound,
     PortGroupExists,
     VSwitchHandler,
 )
@@ -48,7 +47,15 @@ from cloudshell.cp.vcenter.utils.connectivity_helpers import (
     create_new_vnic,
     is_network_generated_name,
 )
-from cloudshell.cp.vcenter.utils.network_watcher import NetworkWatcher
+from cloudshell.cp.vcenter.utils.network_watcher import (
+    NetworkWatcher,
+    shared_network_watcher,
+)
+from cloudshell.cp.vcenter.utils.port_group_pool import PortGroupPool
+from cloudshell.cp.vcenter.utils.switch_watcher import (
+    SwitchWatcher,
+    shared_switch_watcher,
+)
 from cloudshell.cp.vcenter.utils.threading import LockHandler
 
 if TYPE_CHECKING:
@@ -69,13 +76,21 @@ class VCenterConnectivityFlow(AbcCloudProviderConnectivityFlow):
     _si: SiHandler
     _resource_conf: VCenterResourceConfig
     _reservation_info: ReservationInfo
-    _switches: dict[tuple[str, str], AbstractSwitchHandler] = field(
-        init=False, factory=dict
-    )
     _networks: dict[str, NetworkHandler | DVPortGroupHandler] = field(
         init=False, factory=dict
     )
+    # {action_id: NetworkSettings}  noqa: E800
+    _network_settings: dict[str, NetworkSettings] = field(init=False, factory=dict)
+    # {pg_name: number of vNICs to connect}  noqa: E800
+    _expected_connections: Counter[str] = field(init=False, factory=Counter)
+    # {vm_uuid: names of networks to connect}  noqa: E800
+    _target_networks: defaultdict[str, set[str]] = field(
+        init=False, factory=lambda: defaultdict(set)
+    )
+    # {dv_switch_name: PortGroupPool}  noqa: E800
+    _port_group_pools: dict[str, PortGroupPool] = field(init=False, factory=dict)
     _networks_watcher: NetworkWatcher = field(init=False)
+    _switches_watcher: SwitchWatcher = field(init=False)
 
     def __attrs_post_init__(self):
         self._vsphere_client = VSphereSDKHandler.from_config(
@@ -84,10 +99,17 @@ class VCenterConnectivityFlow(AbcCloudProviderConnectivityFlow):
             si=self._si,
         )
         self._dc = DcHandler.get_dc(self._resource_conf.default_datacenter, self._si)
-        self._networks_watcher = NetworkWatcher(self._si, self._dc)
-        self._networks_watcher.populate_in_bg()
         self._sandbox_id = self._reservation_info.reservation_id
 
+    def apply_connectivity(self, request: str) -> str:
+        # watchers are released even if the request fails and kept warm for next
+        # flows in the session
+        with shared_network_watcher(self._si, self._dc) as networks_watcher:
+            with shared_switch_watcher(self._si, self._dc) as switches_watcher:
+                self._networks_watcher = networks_watcher
+                self._switches_watcher = switches_watcher
+                return super().apply_connectivity(request)
+
     @cached_property
     def _holding_network(self) -> NetworkHandler | DVPortGroupHandler:
         return self._networks_watcher.get_network(self._resource_conf.holding_network)
@@ -109,6 +131,9 @@ class VCenterConnectivityFlow(AbcCloudProviderConnectivityFlow):
 
         for action in filter(is_set_action, actions):
             net_settings = self._get_network_settings(action)
+            self._expected_connections[net_settings.name] += 1
+            vm_uuid = action.custom_action_attrs.vm_uuid
+            self._target_networks[vm_uuid].add(net_settings.name)
             if net_settings.existed:
                 existed_pg_names.add(net_settings.name)
             else:
@@ -129,6 +154,10 @@ class VCenterConnectivityFlow(AbcCloudProviderConnectivityFlow):
         # create networks
         tuple(executor.map(self._get_or_create_network, net_to_create.values()))
 
+        # refill port group pools while VMs are connecting
+        for pool in self._port_group_pools.values():
+            pool.refill_in_bg()
+
     def load_target(self, target_name: str) -> Any:
         try:
             vm = self._dc.get_vm_by_uuid(target_name)
@@ -137,11 +166,18 @@ class VCenterConnectivityFlow(AbcCloudProviderConnectivityFlow):
         return vm
 
     def get_vnics(self, vm: VmHandler) -> Collection[VnicInfo]:
+        # VM can be found by BIOS UUID as well
+        vm_uuid = vm.uuid if vm.uuid in self._target_networks else vm.bios_uuid
+        target_networks = self._target_networks.get(vm_uuid, set())
+
         def get_vnic_info(vnic: Vnic) -> VnicInfo:
+            network = vnic.network
             return VnicInfo(
                 vnic.name,
                 int(self.vnic_name_to_index(vnic.name, vm)),
-                self._network_can_be_replaced(vnic.network),
+                # vNIC can be connected to the target network on deploy
+                network.name in target_networks
+                or self._network_can_be_replaced(network),
             )
 
         return tuple(map(get_vnic_info, vm.vnics))
@@ -160,7 +196,10 @@ class VCenterConnectivityFlow(AbcCloudProviderConnectivityFlow):
         except VnicNotFound:
             vnic = create_new_vnic(target, network, vnic_name)
         else:
-            vnic.connect(network)
+            if vnic.is_connected_to_network(network):
+                logger.info(f"{vnic} is already connected to the {network}")
+            else:
+                vnic.connect(network)
 
         return vnic.mac_address
 
@@ -213,40 +252,31 @@ class VCenterConnectivityFlow(AbcCloudProviderConnectivityFlow):
                     key = (net_settings.name, host_name)
                     net_to_remove[key] = net_settings
 
+        # tags of all removed networks are listed in one request
+        tags = self._get_networks_tags(net_to_remove.values())
         # remove unused networks
-        r = executor.map(self._remove_pg_with_checks, net_to_remove.values())
-        tags = set(chain.from_iterable(r))
+        list(executor.map(self._remove_pg_with_checks, net_to_remove.values()))
 
-        # remove property collector
-        self._networks_watcher.destroy()
+        for pool in self._port_group_pools.values():
+            pool.wait_refilled()
 
         # remove tags
         self._remove_tags(tags)
 
     def _get_switch(self, net_settings: NetworkSettings) -> AbstractSwitchHandler:
-        switch_name = net_settings.switch_name
         vm = self.get_target(net_settings.vm_uuid)
-        host_name = vm.host.name
-        key = (switch_name, host_name)
-
-        switch = self._switches.get(key)
-        if not switch:
-            with switch_lock.lock(switch_name):
-                if not (switch := self._switches.get(key)):
-                    try:
-                        switch = self._dc.get_dv_switch(switch_name)
-                    except DvSwitchNotFound:
-                        switch = vm.get_v_switch(switch_name)
-                    self._switches[key] = switch
-        return switch
+        return self._switches_watcher.get_switch(net_settings.switch_name, vm.host)
 
-    @staticmethod
     def _validate_network(
+        self,
         network: NetworkHandler | DVPortGroupHandler,
         switch: AbstractSwitchHandler,
         net_settings: NetworkSettings,
     ) -> None:
-        if isinstance(network, NetworkHandler) and isinstance(switch, VSwitchHandler):
+        if isinstance(network, DVPortGroupHandler):
+            # port groups created earlier could be not elastic
+            network.ensure_free_ports(self._expected_connections[net_settings.name])
+        elif isinstance(network, NetworkHandler) and isinstance(switch, VSwitchHandler):
             if not switch.port_group_exists(network.name):
                 # In vCenter the host's PG can be deleted but the network remains.
                 # In this case we need to recreate the port group.
@@ -285,29 +315,48 @@ class VCenterConnectivityFlow(AbcCloudProviderConnectivityFlow):
     def _create_network(
         self, switch: AbstractSwitchHandler, net_settings: NetworkSettings
     ) -> AbstractNetwork:
+        network = None
         try:
-            # create Port Group - Host PG or DV PG
-            switch.create_port_group(
-                net_settings.name,
-                net_settings.vlan_id,
-                net_settings.port_mode,
-                net_settings.promiscuous_mode,
-                net_settings.forged_transmits,
-                net_settings.mac_changes,
-            )
+            if pool := self._get_port_group_pool(switch):
+                # reconfigure pre-created DV port group
+                network = pool.claim(net_settings)
+            if not network:
+                # create Port Group - Host PG or DV PG
+                switch.create_port_group(
+                    net_settings.name,
+                    net_settings.vlan_id,
+                    net_settings.port_mode,
+                    net_settings.promiscuous_mode,
+                    net_settings.forged_transmits,
+                    net_settings.mac_changes,
+                    num_ports=self._expected_connections[net_settings.name],
+                )
         except PortGroupExists:
             pass
-        network = self._networks_watcher.wait_appears(net_settings.name)
+        if not network:
+            network = self._networks_watcher.wait_appears(net_settings.name)
         self._add_tags(network)
         return network
 
-    def _remove_pg_with_checks(self, net_settings: NetworkSettings) -> set[str]:
-        def remove(name: str, existed: bool, vm_uuid: str) -> tuple[set[str], bool]:
-            net_tags = set()
+    def _get_port_group_pool(
+        self, switch: AbstractSwitchHandler
+    ) -> PortGroupPool | None:
+        pool_size = self._resource_conf.port_group_pool_size
+        if not pool_size or not isinstance(switch, DvSwitchHandler):
+            return None
+
+        with switch_lock.lock(switch.name):
+            if not (pool := self._port_group_pools.get(switch.name)):
+                pool = PortGroupPool(switch, self._networks_watcher, pool_size)
+                self._port_group_pools[switch.name] = pool
+        return pool
+
+    def _remove_pg_with_checks(self, net_settings: NetworkSettings) -> None:
+        def remove(name: str, existed: bool, vm_uuid: str) -> bool:
             net_not_found = False
 
             try:
-                net_tags = self._remove_pg(name, existed, vm_uuid)
+                self._remove_pg(name, existed, vm_uuid)
             except PgCanNotBeRemoved as e:
                 logger.info(f"Port group {e.name} should not be removed")
             except NetworkNotFound as e:
@@ -315,40 +364,32 @@ class VCenterConnectivityFlow(AbcCloudProviderConnectivityFlow):
                 net_not_found = True
             except ResourceInUse as e:
                 logger.info(f"Network {e.name} is still in use, skip removing")
-            return net_tags, net_not_found
+            return net_not_found
 
         # remove network with new standard name
-        tags, not_found = remove(
+        not_found = remove(
             net_settings.name, net_settings.existed, net_settings.vm_uuid
         )
         if not_found:
             # remove network with old standard name
-            tags, _ = remove(
-                net_settings.old_name, net_settings.existed, net_settings.vm_uuid
-            )
-
-        return tags
+            remove(net_settings.old_name, net_settings.existed, net_settings.vm_uuid)
 
-    def _remove_pg(self, pg_name: str, existed: bool, vm_uuid: str) -> set[str]:
+    def _remove_pg(self, pg_name: str, existed: bool, vm_uuid: str) -> None:
         check_pg_can_be_removed(pg_name, existed)
         network = self._networks_watcher.get_network(pg_name)
         network.wait_network_become_free(raise_=True)
 
-        try:
-            tags = self._get_network_tags(network)
-        finally:
-            if isinstance(network, DVPortGroupHandler):
-                network.destroy()
+        if isinstance(network, DVPortGroupHandler):
+            network.destroy()
+        else:
+            vm = self.get_target(vm_uuid)
+            # remove from the host where the VM is located
+            if vm:
+                vm.host.remove_port_group(network.name)
             else:
-                vm = self.get_target(vm_uuid)
-                # remove from the host where the VM is located
-                if vm:
-                    vm.host.remove_port_group(network.name)
-                else:
-                    self._delete_pg_from_every_host(network)
-            del network
+                self._delete_pg_from_every_host(network)
+        del network
         logger.info(f"Network {pg_name} was removed")
-        return tags
 
     def _delete_pg_from_every_host(self, network: NetworkHandler) -> None:
         """Delete Virtual Port Group from every host in the cluster."""
@@ -361,13 +402,24 @@ class VCenterConnectivityFlow(AbcCloudProviderConnectivityFlow):
             except ResourceInUse:
                 logger.info(f"Network '{net_name}' is still in use on the {host}")
 
-    def _get_network_tags(
-        self, network: NetworkHandler | DVPortGroupHandler
+    def _get_networks_tags(
+        self, nets_settings: Collection[NetworkSettings]
     ) -> set[str]:
-        """Get network's tag IDs."""
+        """Get tag IDs of the networks that can be removed."""
         tags = set()
         if self._vsphere_client and self._resource_conf.is_static:
-            tags |= self._vsphere_client.get_attached_tags(network)
+            networks = []
+            for net_settings in nets_settings:
+                for name in (net_settings.name, net_settings.old_name):
+                    try:
+                        check_pg_can_be_removed(name, net_settings.existed)
+                        networks.append(self._networks_watcher.get_network(name))
+                    except (PgCanNotBeRemoved, NetworkNotFound):
+                        continue
+                    else:
+                        break
+            if networks:
+                tags |= self._vsphere_client.get_attached_tags_on_objects(networks)
         return tags
 
     def _remove_tags(self, tags: set[str]) -> None:
@@ -396,7 +448,11 @@ class VCenterConnectivityFlow(AbcCloudProviderConnectivityFlow):
     def _get_network_settings(
         self, action: VcenterConnectivityActionModel
     ) -> NetworkSettings:
-        return NetworkSettings.convert(action, self._resource_conf)
+        """Parse the action once and share the settings between all phases."""
+        if not (net_settings := self._network_settings.get(action.action_id)):
+            net_settings = NetworkSettings.convert(action, self._resource_conf)
+            self._network_settings[action.action_id] = net_settings
+        return net_settings
 
     def _is_remove_vlan_or_failed(self, action: VcenterConnectivityActionModel) -> bool:
         if is_remove_action(action):
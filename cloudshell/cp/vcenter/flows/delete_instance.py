@@ -49,7 +49,7 @@ class DeleteFlow:
             tags |= vm_tags
         finally:
             try:
-                tags |= self._delete_folder(folder)
+                self._delete_folder(folder)
             finally:
                 self._delete_tags(tags)
 
@@ -69,28 +69,25 @@ class DeleteFlow:
                     self._si.delete_customization_spec(vm.name)
                 finally:
                     try:
-                        tags |= self._get_tags(vm)
+                        # VM and folder tags are listed in one request
+                        tags |= self._get_tags([vm, folder])
                     finally:
                         vm.power_off(soft=False)
                         vm.delete()
         return tags, folder
 
-    def _delete_folder(self, folder: FolderHandler | None) -> set[str]:
-        tags = set()
+    def _delete_folder(self, folder: FolderHandler | None) -> None:
         if folder is not None:
             with folder_delete_lock:
                 if folder.is_exists():
-                    try:
-                        tags |= self._get_tags(folder)
-                    finally:
-                        with suppress(FolderIsNotEmpty):
-                            folder.destroy()
-        return tags
+                    with suppress(FolderIsNotEmpty):
+                        folder.destroy()
 
-    def _get_tags(self, obj) -> set[str]:
+    def _get_tags(self, objs: list) -> set[str]:
         tags = set()
         if self._vsphere_client:
-            tags |= set(self._vsphere_client.get_attached_tags(obj))
+            objs = [obj for obj in objs if obj is not None]
+            tags |= self._vsphere_client.get_attached_tags_on_objects(objs)
         return tags
 
     def _delete_tags(self, tags: set[str]) -> None:
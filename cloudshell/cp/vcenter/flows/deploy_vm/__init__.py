@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from .base_flow import AbstractVCenterDeployVMFlow
 from .from_image import VCenterDeployVMFromImageFlow
+from .from_instant_clone import VCenterDeployVMFromInstantCloneFlow
 from .from_linked_clone import VCenterDeployVMFromLinkedCloneFlow
 from .from_template import VCenterDeployVMFromTemplateFlow
 from .from_vm import VCenterDeployVMFromVMFlow
@@ -10,6 +11,7 @@ from cloudshell.cp.vcenter.models import deploy_app
 
 DEPLOY_APP_TO_FLOW = (
     (deploy_app.VMFromLinkedCloneDeployApp, VCenterDeployVMFromLinkedCloneFlow),
+    (deploy_app.VMFromInstantCloneDeployApp, VCenterDeployVMFromInstantCloneFlow),
     (deploy_app.VMFromVMDeployApp, VCenterDeployVMFromVMFlow),
     (deploy_app.VMFromImageDeployApp, VCenterDeployVMFromImageFlow),
     (deploy_app.VMFromTemplateDeployApp, VCenterDeployVMFromTemplateFlow),
@@ -29,5 +31,6 @@ __all__ = (
     VCenterDeployVMFromImageFlow,
     VCenterDeployVMFromTemplateFlow,
     VCenterDeployVMFromLinkedCloneFlow,
+    VCenterDeployVMFromInstantCloneFlow,
     get_deploy_flow,
 )
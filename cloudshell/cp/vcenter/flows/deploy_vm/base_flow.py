@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import logging
 from abc import abstractmethod
-from contextlib import suppress
-from typing import TYPE_CHECKING
+from collections.abc import Callable, Generator, Hashable
+from concurrent.futures import Future
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import TYPE_CHECKING, TypeVar
 
 from cloudshell.cp.core.flows.deploy import AbstractDeployFlow
 from cloudshell.cp.core.request_actions.models import (
@@ -16,29 +18,45 @@ from cloudshell.cp.core.utils.name_generator import NameGenerator
 
 from cloudshell.cp.vcenter.actions.validation import ValidationActions
 from cloudshell.cp.vcenter.flows.deploy_vm.commands import (
+    ClaimPooledVMCommand,
     CloneVMCommand,
     CreateVmCustomSpec,
     CreateVmFolder,
 )
+from cloudshell.cp.vcenter.handlers.cluster_handler import ClusterHandler, HostHandler
 from cloudshell.cp.vcenter.handlers.config_spec_handler import ConfigSpecHandler
 from cloudshell.cp.vcenter.handlers.custom_spec_handler import CustomSpecHandler
 from cloudshell.cp.vcenter.handlers.datastore_handler import DatastoreHandler
 from cloudshell.cp.vcenter.handlers.dc_handler import DcHandler
-from cloudshell.cp.vcenter.handlers.folder_handler import (
-    FolderHandler,
-    FolderIsNotEmpty,
+from cloudshell.cp.vcenter.handlers.folder_handler import FolderHandler
+from cloudshell.cp.vcenter.handlers.network_handler import (
+    DVPortGroupHandler,
+    NetworkHandler,
+    NetworkNotFound,
 )
 from cloudshell.cp.vcenter.handlers.resource_pool import ResourcePoolHandler
 from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
-from cloudshell.cp.vcenter.handlers.snapshot_handler import SnapshotHandler
+from cloudshell.cp.vcenter.handlers.storage_pod_handler import StoragePodHandler
 from cloudshell.cp.vcenter.handlers.vcenter_path import VcenterPath
 from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
 from cloudshell.cp.vcenter.handlers.vsphere_sdk_handler import VSphereSDKHandler
+from cloudshell.cp.vcenter.utils.clone_governor import CloneLimits
 from cloudshell.cp.vcenter.utils.cs_helpers import on_task_progress_check_if_cancelled
+from cloudshell.cp.vcenter.utils.datastore_ledger import datastore_ledger
+from cloudshell.cp.vcenter.utils.host_load_watcher import shared_host_load_watcher
+from cloudshell.cp.vcenter.utils.template_replicas import (
+    TEMPLATE_REPLICA_FOLDER,
+    TemplateReplicas,
+)
+from cloudshell.cp.vcenter.utils.template_watcher import (
+    VmSource,
+    shared_template_watcher,
+)
 from cloudshell.cp.vcenter.utils.vm_console_link_attr import (
     get_deploy_app_vm_console_link_attr,
 )
 from cloudshell.cp.vcenter.utils.vm_helpers import get_vm_folder_path
+from cloudshell.cp.vcenter.utils.vm_pool import VM_POOL_FOLDER, VmPool
 
 if TYPE_CHECKING:
     from cloudshell.api.cloudshell_api import CloudShellAPISession
@@ -46,12 +64,24 @@ if TYPE_CHECKING:
     from cloudshell.cp.core.request_actions import DeployVMRequestActions
     from cloudshell.cp.core.reservation_info import ReservationInfo
 
+    from cloudshell.cp.vcenter.flows.deploy_vm.placement import DeployPlacement
     from cloudshell.cp.vcenter.models.deploy_app import BaseVCenterDeployApp
     from cloudshell.cp.vcenter.resource_config import VCenterResourceConfig
 
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+# attributes that define the deployment source
+SOURCE_ATTRS = (
+    "vcenter_template",
+    "vcenter_vm",
+    "vcenter_vm_snapshot",
+    "vcenter_image",
+)
+# attributes that are checked by the validation
+VALIDATED_ATTRS = ("vm_cluster", "vm_storage", "vm_location", *SOURCE_ATTRS)
+
 
 class AbstractVCenterDeployVMFlow(AbstractDeployFlow):
     def __init__(
@@ -61,6 +91,7 @@ class AbstractVCenterDeployVMFlow(AbstractDeployFlow):
         cs_api: CloudShellAPISession,
         reservation_info: ReservationInfo,
         cancellation_manager: CancellationContextManager,
+        placement: DeployPlacement | None = None,
     ):
         super().__init__(logger=logger)
         self._resource_config = resource_config
@@ -72,12 +103,30 @@ class AbstractVCenterDeployVMFlow(AbstractDeployFlow):
             cancellation_manager
         )
         self._si = si
-        self._vsphere_client = VSphereSDKHandler.from_config(
-            resource_config=self._resource_config,
-            reservation_info=self._reservation_info,
-            si=self._si,
+        # shared by deployments of the batch
+        self._placement = placement
+        self._vsphere_client = self._resolve(
+            ("vsphere_client",),
+            lambda: VSphereSDKHandler.from_config(
+                resource_config=self._resource_config,
+                reservation_info=self._reservation_info,
+                si=self._si,
+            ),
         )
         self.generate_name = NameGenerator(max_length=80)
+        # tags created for this deployment, others can be used by other ones
+        self._created_tag_ids: set[str] = set()
+
+    def _resolve(self, key: tuple[Hashable, ...], fn: Callable[[], T]) -> T:
+        """Resolve the object once per batch, the key starts with the stage name."""
+        if self._placement is None:
+            return fn()
+        return self._placement.resolve(key, fn)
+
+    def _stage(self, name: str) -> AbstractContextManager[None]:
+        if self._placement is None:
+            return nullcontext()
+        return self._placement.stage(name)
 
     @abstractmethod
     def _prepare_vm_details_data(
@@ -92,13 +141,25 @@ class AbstractVCenterDeployVMFlow(AbstractDeployFlow):
         deploy_app: BaseVCenterDeployApp,
         vm_name: str,
         vm_resource_pool: ResourcePoolHandler,
-        vm_storage: DatastoreHandler,
+        vm_storage: DatastoreHandler | StoragePodHandler,
         vm_folder: FolderHandler,
         dc: DcHandler,
     ) -> VmHandler:
-        """Create VM on the vCenter."""
+        """Create VM on the vCenter.
+
+        The datastore of the VM is picked by _reserve_datastore.
+        """
         pass
 
+    def _validate_deploy_app_once(self, deploy_app: BaseVCenterDeployApp) -> None:
+        key = (
+            type(deploy_app),
+            *(getattr(deploy_app, name, None) for name in VALIDATED_ATTRS),
+        )
+        self._resolve(
+            ("validation", key), lambda: self._validate_deploy_app(deploy_app)
+        )
+
     def _validate_deploy_app(self, deploy_app: BaseVCenterDeployApp) -> None:
         """Validate Deploy App before deployment."""
         logger.info("Validating Deploy App data")
@@ -158,10 +219,13 @@ class AbstractVCenterDeployVMFlow(AbstractDeployFlow):
         vm_resource_pool_name = deploy_app.vm_resource_pool or conf.vm_resource_pool
         vm_cluster_name = deploy_app.vm_cluster or conf.vm_cluster
 
-        logger.info(f"Get resource pool: {vm_resource_pool_name or 'default'}")
-        compute_entity = dc.get_compute_entity(vm_cluster_name)
-        resource_pool = compute_entity.get_resource_pool(vm_resource_pool_name)
-        return resource_pool
+        def get_resource_pool() -> ResourcePoolHandler:
+            logger.info(f"Get resource pool: {vm_resource_pool_name or 'default'}")
+            compute_entity = dc.get_compute_entity(vm_cluster_name)
+            return compute_entity.get_resource_pool(vm_resource_pool_name)
+
+        key = ("resource_pool", vm_cluster_name, vm_resource_pool_name)
+        return self._resolve(key, get_resource_pool)
 
     def _prepare_vm_folder_path(self, deploy_app: BaseVCenterDeployApp) -> VcenterPath:
         logger.info("Preparing VM folder")
@@ -172,12 +236,16 @@ class AbstractVCenterDeployVMFlow(AbstractDeployFlow):
     def _get_or_create_vm_folder(
         self, folder_path: VcenterPath, dc: DcHandler
     ) -> FolderHandler:
+        if self._placement is not None:
+            # shared folder is removed by the batch if it's left empty
+            key = ("vm_folder", str(folder_path))
+            return self._resolve(key, lambda: dc.get_or_create_vm_folder(folder_path))
+
         return CreateVmFolder(
             self._rollback_manager,
             self._cancellation_manager,
             dc,
             folder_path,
-            self._vsphere_client,
         ).execute()
 
     def _deploy(self, request_actions: DeployVMRequestActions) -> DeployAppResult:
@@ -187,7 +255,7 @@ class AbstractVCenterDeployVMFlow(AbstractDeployFlow):
         deploy_app: BaseVCenterDeployApp = request_actions.deploy_app
 
         with self._cancellation_manager:
-            self._validate_deploy_app(deploy_app)
+            self._validate_deploy_app_once(deploy_app)
 
         if deploy_app.autogenerated_name:
             vm_name = self.generate_name(deploy_app.app_name)
@@ -201,7 +269,10 @@ class AbstractVCenterDeployVMFlow(AbstractDeployFlow):
 
         with self._cancellation_manager:
             logger.info(f"Getting Datacenter {conf.default_datacenter}")
-            dc = DcHandler.get_dc(conf.default_datacenter, self._si)
+            dc = self._resolve(
+                ("dc", conf.default_datacenter),
+                lambda: DcHandler.get_dc(conf.default_datacenter, self._si),
+            )
 
         with self._cancellation_manager:
             vm_resource_pool = self._get_vm_resource_pool(deploy_app, dc)
@@ -210,100 +281,358 @@ class AbstractVCenterDeployVMFlow(AbstractDeployFlow):
         with self._cancellation_manager:
             vm_storage_name = deploy_app.vm_storage or conf.vm_storage
             logger.info(f"Getting VM storage {vm_storage_name}")
-            vm_storage = dc.get_datastore(vm_storage_name)
-
-        with self._rollback_manager:
-            vm_folder = self._get_or_create_vm_folder(vm_folder_path, dc)
-
-            logger.info(f"Creating VM {vm_name}")
-            deployed_vm = self._create_vm(
-                deploy_app=deploy_app,
-                vm_name=vm_name,
-                vm_resource_pool=vm_resource_pool,
-                vm_storage=vm_storage,
-                vm_folder=vm_folder,
-                dc=dc,
+            vm_storage = self._resolve(
+                ("datastore", vm_storage_name),
+                lambda: dc.get_datastore_or_storage_pod(vm_storage_name),
             )
-            self._add_tags(deployed_vm, vm_folder)
+
+        # tags are created while the VM is being cloned
+        tag_ids = self._get_tag_ids_in_bg()
+        try:
+            with self._rollback_manager:
+                vm_folder = self._get_or_create_vm_folder(vm_folder_path, dc)
+
+                logger.info(f"Creating VM {vm_name}")
+                with self._stage("create_vm"):
+                    deployed_vm = self._create_vm(
+                        deploy_app=deploy_app,
+                        vm_name=vm_name,
+                        vm_resource_pool=vm_resource_pool,
+                        vm_storage=vm_storage,
+                        vm_folder=vm_folder,
+                        dc=dc,
+                    )
+        except Exception:
+            self._discard_tag_ids(tag_ids)
+            raise
+        tagging = self._add_tags_in_bg(deployed_vm, vm_folder, tag_ids)
 
         logger.info(f"Preparing Deploy App result for the {deployed_vm}")
-        return self._prepare_deploy_app_result(
-            deployed_vm=deployed_vm,
-            deploy_app=deploy_app,
-            vm_name=vm_name,
-        )
+        try:
+            with self._stage("deploy_app_result"):
+                result = self._prepare_deploy_app_result(
+                    deployed_vm=deployed_vm,
+                    deploy_app=deploy_app,
+                    vm_name=vm_name,
+                )
+        except Exception:
+            # the error is raised anyway, the tagging error is only logged
+            if tagging is not None and (e := tagging.exception()):
+                logger.warning(f"Failed to assign tags to {deployed_vm}. Error: {e}")
+            raise
+        with self._stage("tags"):
+            self._wait_tags(tagging, deployed_vm)
+        return result
+
+    @staticmethod
+    @contextmanager
+    def _reserve_datastore(
+        vm_storage: DatastoreHandler | StoragePodHandler,
+        get_vm_size: Callable[[], int] | None = None,
+    ) -> Generator[DatastoreHandler, None, None]:
+        """Pick the datastore and reserve the space the VM needs while it's created.
+
+        The size is needed only to pick the datastore of the storage pod.
+        """
+        vm_size = 0
+        if get_vm_size and isinstance(vm_storage, StoragePodHandler):
+            vm_size = get_vm_size()
+        with datastore_ledger.reserved(vm_storage, vm_size) as vm_datastore:
+            yield vm_datastore
+
+    def _get_tag_ids_in_bg(self) -> Future[list[str]] | None:
+        if self._vsphere_client is not None:
+            return self._vsphere_client.get_or_create_tag_ids_in_bg(
+                created=self._created_tag_ids
+            )
 
-    def _add_tags(self, vm: VmHandler, folder: FolderHandler) -> None:
+    def _discard_tag_ids(self, tag_ids: Future[list[str]] | None) -> None:
+        """The VM isn't created, remove tags created for it that nothing uses.
+
+        Tags found in the cache can be attached by other deployments any time.
+        """
+        if tag_ids is None or tag_ids.cancel():
+            return
+        try:
+            tag_ids.result()  # wait until they're created
+            if self._created_tag_ids:
+                self._vsphere_client.delete_unused_tags(self._created_tag_ids, wait=0)
+        except Exception:
+            logger.warning("Failed to remove tags of the failed VM", exc_info=True)
+
+    def _add_tags_in_bg(
+        self,
+        vm: VmHandler,
+        folder: FolderHandler,
+        tag_ids: Future[list[str]] | None,
+    ) -> Future[None] | None:
         if self._vsphere_client is not None:
+            return self._vsphere_client.attach_tags_in_bg([vm, folder], tag_ids)
+
+    def _wait_tags(self, tagging: Future[None] | None, vm: VmHandler) -> None:
+        if tagging is not None:
             try:
-                self._vsphere_client.assign_tags(obj=vm)
+                tagging.result()
             except Exception as e:
                 logger.warning(f"Failed to assign tags to {vm}. Error: {e}")
-                vm.delete()
-                with suppress(FolderIsNotEmpty):
-                    folder.destroy()
-                raise
+                # removes the VM, its customization spec and folder
+                with self._rollback_manager:
+                    raise
 
 
 class AbstractVCenterDeployVMFromTemplateFlow(AbstractVCenterDeployVMFlow):
     @abstractmethod
-    def _get_vm_template(
-        self, deploy_app: BaseVCenterDeployApp, dc: DcHandler
-    ) -> VmHandler:
-        """Get VM template to clone VM from."""
+    def _get_vm_template_path(self, deploy_app: BaseVCenterDeployApp) -> str:
+        """Get path of the VM template to clone VM from."""
         pass
 
+    def _get_vm_snapshot_path(self, deploy_app: BaseVCenterDeployApp) -> str:
+        """Get path of the VM Snapshot to clone from."""
+        return ""
+
+    def _get_vm_source(
+        self, deploy_app: BaseVCenterDeployApp, dc: DcHandler
+    ) -> VmSource:
+        with shared_template_watcher(self._si, dc) as watcher:
+            return watcher.get_source(
+                self._get_vm_template_path(deploy_app),
+                self._get_vm_snapshot_path(deploy_app),
+            )
+
+    def _get_vm_size(self, vm_source: VmSource) -> int:
+        """Space the VM cloned from the source needs on the datastore."""
+        return vm_source.vm.disks_size
+
     def _create_vm_customization_spec(
-        self, deploy_app: BaseVCenterDeployApp, vm_template: VmHandler, vm_name: str
-    ) -> CustomSpecHandler:
+        self,
+        deploy_app: BaseVCenterDeployApp,
+        vm_source: VmSource,
+        vm_name: str,
+        save: bool = True,
+    ) -> CustomSpecHandler | None:
         return CreateVmCustomSpec(
             self._rollback_manager,
             self._cancellation_manager,
             self._si,
             deploy_app,
-            vm_template,
+            vm_source,
             vm_name,
+            save,
         ).execute()
 
-    def _get_vm_snapshot(
-        self, deploy_app: BaseVCenterDeployApp, vm_template: VmHandler
-    ) -> SnapshotHandler:
-        """Get VM Snapshot to clone from."""
-        pass
-
     def _create_vm(
         self,
         deploy_app: BaseVCenterDeployApp,
         vm_name: str,
         vm_resource_pool: ResourcePoolHandler,
-        vm_storage: DatastoreHandler,
+        vm_storage: DatastoreHandler | StoragePodHandler,
         vm_folder: FolderHandler,
         dc: DcHandler,
     ) -> VmHandler:
         """Create VM on the vCenter."""
-        with self._cancellation_manager:
-            vm_template = self._get_vm_template(deploy_app, dc)
+        with self._cancellation_manager, self._stage("vm_source"):
+            vm_source = self._get_vm_source(deploy_app, dc)
+
+        with self._reserve_datastore(
+            vm_storage, lambda: self._get_vm_size(vm_source)
+        ) as vm_datastore:
+            return self._create_vm_from_source(
+                deploy_app,
+                vm_name,
+                vm_resource_pool,
+                vm_datastore,
+                vm_folder,
+                dc,
+                vm_source,
+            )
 
-        with self._cancellation_manager:
-            # we create customization spec here and will set it on PowerOn command
-            self._create_vm_customization_spec(deploy_app, vm_template, vm_name)
+    def _create_vm_from_source(
+        self,
+        deploy_app: BaseVCenterDeployApp,
+        vm_name: str,
+        vm_resource_pool: ResourcePoolHandler,
+        vm_storage: DatastoreHandler,
+        vm_folder: FolderHandler,
+        dc: DcHandler,
+        vm_source: VmSource,
+    ) -> VmHandler:
+        vm_template = vm_source.vm
 
+        customize_on_clone = self._resource_config.customize_on_clone
         with self._cancellation_manager:
-            snapshot = self._get_vm_snapshot(deploy_app, vm_template)
+            # we create customization spec here and will set it on PowerOn command
+            # or pass it to the clone task, vCenter applies it on the first power on
+            custom_spec = self._create_vm_customization_spec(
+                deploy_app, vm_source, vm_name, save=not customize_on_clone
+            )
+        customization = custom_spec if customize_on_clone else None
 
         config_spec = ConfigSpecHandler.from_deploy_add(deploy_app)
         if deploy_app.copy_source_uuid:
             config_spec.bios_uuid = vm_template.bios_uuid
+        with self._cancellation_manager:
+            config_spec.vnic_networks = self._get_vnic_networks(deploy_app, dc)
+
+        vm_pool = self._get_vm_pool(vm_source, vm_resource_pool, vm_storage, dc)
+        try:
+            if vm_pool and (
+                vm := ClaimPooledVMCommand(
+                    vm_pool=vm_pool,
+                    rollback_manager=self._rollback_manager,
+                    cancellation_manager=self._cancellation_manager,
+                    vm_name=vm_name,
+                    vm_folder=vm_folder,
+                    config_spec=config_spec,
+                    on_task_progress=self._on_task_progress,
+                    customization=customization,
+                ).execute()
+            ):
+                return vm
+            return self._clone_vm(
+                deploy_app,
+                vm_name,
+                vm_resource_pool,
+                vm_storage,
+                vm_folder,
+                dc,
+                vm_source,
+                config_spec,
+                customization,
+            )
+        finally:
+            if vm_pool:
+                vm_pool.refill()
 
-        return CloneVMCommand(
-            rollback_manager=self._rollback_manager,
-            cancellation_manager=self._cancellation_manager,
-            on_task_progress=self._on_task_progress,
-            vm_template=vm_template,
-            vm_name=vm_name,
-            vm_resource_pool=vm_resource_pool,
-            vm_storage=vm_storage,
-            vm_folder=vm_folder,
-            vm_snapshot=snapshot,
-            config_spec=config_spec,
-        ).execute()
+    def _clone_vm(
+        self,
+        deploy_app: BaseVCenterDeployApp,
+        vm_name: str,
+        vm_resource_pool: ResourcePoolHandler,
+        vm_storage: DatastoreHandler,
+        vm_folder: FolderHandler,
+        dc: DcHandler,
+        vm_source: VmSource,
+        config_spec: ConfigSpecHandler,
+        customization: CustomSpecHandler | None,
+    ) -> VmHandler:
+        vm_template = vm_source.vm
+        conf = self._resource_config
+        replicas = self._get_template_replicas(vm_source, vm_resource_pool, dc)
+        if replicas:
+            vm_template = replicas.get_replica(vm_storage) or vm_template
+        try:
+            with self._reserve_host(deploy_app, dc, vm_template, vm_storage) as vm_host:
+                return CloneVMCommand(
+                    rollback_manager=self._rollback_manager,
+                    cancellation_manager=self._cancellation_manager,
+                    on_task_progress=self._on_task_progress,
+                    vm_template=vm_template,
+                    vm_name=vm_name,
+                    vm_resource_pool=vm_resource_pool,
+                    vm_storage=vm_storage,
+                    vm_folder=vm_folder,
+                    vm_snapshot=vm_source.snapshot,
+                    config_spec=config_spec,
+                    clone_limits=CloneLimits(
+                        source_datastore=conf.max_clones_per_source_datastore,
+                        target_datastore=conf.max_clones_per_target_datastore,
+                        host=conf.max_clones_per_host,
+                    ),
+                    vm_host=vm_host,
+                    customization=customization,
+                    shared_folder=self._placement is not None,
+                ).execute()
+        finally:
+            if replicas:
+                replicas.refresh(vm_storage)
+
+    def _get_vnic_networks(
+        self, deploy_app: BaseVCenterDeployApp, dc: DcHandler
+    ) -> dict[str, NetworkHandler | DVPortGroupHandler]:
+        """Networks that vNICs are connected to on clone.
+
+        Networks that don't exist yet are connected by the Connectivity.
+        """
+        networks = {}
+        for vnic_name, network_name in deploy_app.vnic_networks.items():
+            try:
+                networks[vnic_name] = self._resolve(
+                    ("network", network_name),
+                    lambda name=network_name: dc.get_network(name),
+                )
+            except NetworkNotFound:
+                logger.info(
+                    f"Network {network_name} not found, {vnic_name} will be "
+                    f"connected by the Connectivity"
+                )
+        return networks
+
+    def _get_vm_pool(
+        self,
+        vm_source: VmSource,
+        vm_resource_pool: ResourcePoolHandler,
+        vm_storage: DatastoreHandler,
+        dc: DcHandler,
+    ) -> VmPool | None:
+        pool_size = self._resource_config.vm_pool_size
+        if not pool_size:
+            return None
+
+        pool_folder = self._resolve(
+            ("vm_pool_folder",), lambda: dc.get_or_create_vm_folder(VM_POOL_FOLDER)
+        )
+        return VmPool(
+            vm_source.vm,
+            vm_source.snapshot,
+            vm_resource_pool,
+            vm_storage,
+            pool_folder,
+            pool_size,
+        )
+
+    def _get_template_replicas(
+        self,
+        vm_source: VmSource,
+        vm_resource_pool: ResourcePoolHandler,
+        dc: DcHandler,
+    ) -> TemplateReplicas | None:
+        """Replicas are kept for templates only, disks of VMs can be changed."""
+        max_replicas = self._resource_config.template_replicas
+        if not max_replicas or vm_source.snapshot or not vm_source.vm.is_template:
+            return None
+
+        replica_folder = self._resolve(
+            ("template_replica_folder",),
+            lambda: dc.get_or_create_vm_folder(TEMPLATE_REPLICA_FOLDER),
+        )
+        return TemplateReplicas(
+            vm_source.vm, replica_folder, vm_resource_pool, max_replicas
+        )
+
+    @contextmanager
+    def _reserve_host(
+        self,
+        deploy_app: BaseVCenterDeployApp,
+        dc: DcHandler,
+        vm_template: VmHandler,
+        vm_storage: DatastoreHandler,
+    ) -> Generator[HostHandler | None, None, None]:
+        """Pick the least loaded host of the cluster if it's enabled."""
+        conf = self._resource_config
+        if not conf.load_aware_host_placement:
+            yield None
+            return
+
+        vm_cluster_name = deploy_app.vm_cluster or conf.vm_cluster
+        compute_entity = self._resolve(
+            ("compute_entity", vm_cluster_name),
+            lambda: dc.get_compute_entity(vm_cluster_name),
+        )
+        if not isinstance(compute_entity, ClusterHandler):
+            yield None  # the host is set by the user
+            return
+
+        with shared_host_load_watcher(self._si, compute_entity) as watcher:
+            memory = vm_template.memory_size
+            with watcher.reserved_host(memory, vm_storage) as vm_host:
+                yield vm_host
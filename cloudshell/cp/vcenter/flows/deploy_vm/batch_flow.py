@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Collection
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from typing import TYPE_CHECKING
+
+from attrs import define
+
+from cloudshell.cp.vcenter.flows.deploy_vm import get_deploy_flow
+from cloudshell.cp.vcenter.flows.deploy_vm.placement import DeployPlacement
+from cloudshell.cp.vcenter.handlers.folder_handler import FolderIsNotEmpty
+
+if TYPE_CHECKING:
+    from cloudshell.api.cloudshell_api import CloudShellAPISession
+    from cloudshell.cp.core.cancellation_manager import CancellationContextManager
+    from cloudshell.cp.core.request_actions import DeployVMRequestActions
+    from cloudshell.cp.core.reservation_info import ReservationInfo
+
+    from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
+    from cloudshell.cp.vcenter.resource_config import VCenterResourceConfig
+
+
+logger = logging.getLogger(__name__)
+
+
+@define
+class BatchDeployResult:
+    action_id: str
+    result: str | None = None  # driver response JSON
+    error: Exception | None = None
+
+
+@define
+class VCenterBatchDeployFlow:
+    """Deploy many apps sharing the placement objects.
+
+    Datacenter, resource pools, datastores, folders, templates and vSphere client
+    are resolved once for the batch, VMs are created concurrently. Every app has
+    its own result and rollback. The number of VMs deployed at the same time is
+    limited by the Max Deploy Workers attribute.
+    """
+
+    _si: SiHandler
+    _resource_config: VCenterResourceConfig
+    _cs_api: CloudShellAPISession
+    _reservation_info: ReservationInfo
+    _cancellation_manager: CancellationContextManager
+
+    def deploy(
+        self, requests_actions: Collection[DeployVMRequestActions]
+    ) -> list[BatchDeployResult]:
+        placement = DeployPlacement()
+        max_workers = self._resource_config.max_deploy_workers
+        workers = max(min(max_workers, len(requests_actions)), 1)
+        with ThreadPoolExecutor(workers) as executor:
+            futures = [
+                (
+                    request_actions,
+                    executor.submit(self._deploy_app, request_actions, placement),
+                )
+                for request_actions in requests_actions
+            ]
+
+        results = []
+        for request_actions, future in futures:
+            action_id = request_actions.deploy_app.actionId
+            try:
+                results.append(BatchDeployResult(action_id, result=future.result()))
+            except Exception as e:
+                logger.exception(f"Failed to deploy the app {action_id}")
+                results.append(BatchDeployResult(action_id, error=e))
+
+        if any(r.error for r in results):
+            self._remove_empty_folders(placement)
+        for stage, timing in placement.timings.items():
+            logger.info(
+                f"Stage {stage}: count {timing.count}, total {timing.total:.2f}s, "
+                f"average {timing.average:.2f}s"
+            )
+        return results
+
+    def _deploy_app(
+        self, request_actions: DeployVMRequestActions, placement: DeployPlacement
+    ) -> str:
+        flow_class = get_deploy_flow(request_actions)
+        flow = flow_class(
+            self._si,
+            self._resource_config,
+            self._cs_api,
+            self._reservation_info,
+            self._cancellation_manager,
+            placement=placement,
+        )
+        return flow.deploy(request_actions)
+
+    @staticmethod
+    def _remove_empty_folders(placement: DeployPlacement) -> None:
+        for folder in placement.get_resolved("vm_folder"):
+            with suppress(FolderIsNotEmpty):
+                folder.destroy()
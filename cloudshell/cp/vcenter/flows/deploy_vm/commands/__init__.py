@@ -1,6 +1,15 @@
+from .claim_pooled_vm import ClaimPooledVMCommand
 from .clone_vm import CloneVMCommand
 from .create_custom_spec import CreateVmCustomSpec
 from .create_vm_folder import CreateVmFolder
 from .deploy_vm_from_image import DeployVMFromImageCommand
+from .instant_clone_vm import InstantCloneVMCommand
 
-__all__ = (CloneVMCommand, CreateVmCustomSpec, CreateVmFolder, DeployVMFromImageCommand)
+__all__ = (
+    ClaimPooledVMCommand,
+    CloneVMCommand,
+    CreateVmCustomSpec,
+    CreateVmFolder,
+    DeployVMFromImageCommand,
+    InstantCloneVMCommand,
+)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from cloudshell.cp.core.cancellation_manager import CancellationContextManager
+from cloudshell.cp.core.rollback import RollbackCommand, RollbackCommandsManager
+
+from cloudshell.cp.vcenter.handlers.config_spec_handler import ConfigSpecHandler
+from cloudshell.cp.vcenter.handlers.custom_spec_handler import CustomSpecHandler
+from cloudshell.cp.vcenter.handlers.folder_handler import FolderHandler
+from cloudshell.cp.vcenter.handlers.task import ON_TASK_PROGRESS_TYPE
+from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+from cloudshell.cp.vcenter.utils.vm_pool import VmPool
+
+
+class ClaimPooledVMCommand(RollbackCommand):
+    def __init__(
+        self,
+        vm_pool: VmPool,
+        rollback_manager: RollbackCommandsManager,
+        cancellation_manager: CancellationContextManager,
+        vm_name: str,
+        vm_folder: FolderHandler,
+        config_spec: ConfigSpecHandler,
+        on_task_progress: ON_TASK_PROGRESS_TYPE | None = None,
+        customization: CustomSpecHandler | None = None,
+    ):
+        super().__init__(
+            rollback_manager=rollback_manager, cancellation_manager=cancellation_manager
+        )
+        self._vm_pool = vm_pool
+        self._vm_name = vm_name
+        self._vm_folder = vm_folder
+        self._config_spec = config_spec
+        self._on_task_progress = on_task_progress
+        self._customization = customization
+        self._claimed_vm: VmHandler | None = None
+
+    def _execute(self) -> VmHandler | None:
+        vm = self._vm_pool.claim(
+            vm_name=self._vm_name,
+            vm_folder=self._vm_folder,
+            config_spec=self._config_spec,
+            on_task_progress=self._on_task_progress,
+            customization=self._customization,
+        )
+        self._claimed_vm = vm
+        return vm
+
+    def rollback(self):
+        if self._claimed_vm:
+            self._claimed_vm.delete()
@@ -5,7 +5,9 @@ from contextlib import suppress
 from cloudshell.cp.core.cancellation_manager import CancellationContextManager
 from cloudshell.cp.core.rollback import RollbackCommand, RollbackCommandsManager
 
+from cloudshell.cp.vcenter.handlers.cluster_handler import HostHandler
 from cloudshell.cp.vcenter.handlers.config_spec_handler import ConfigSpecHandler
+from cloudshell.cp.vcenter.handlers.custom_spec_handler import CustomSpecHandler
 from cloudshell.cp.vcenter.handlers.datastore_handler import DatastoreHandler
 from cloudshell.cp.vcenter.handlers.folder_handler import (
     FolderHandler,
@@ -15,6 +17,14 @@ from cloudshell.cp.vcenter.handlers.resource_pool import ResourcePoolHandler
 from cloudshell.cp.vcenter.handlers.snapshot_handler import SnapshotHandler
 from cloudshell.cp.vcenter.handlers.task import ON_TASK_PROGRESS_TYPE
 from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+from cloudshell.cp.vcenter.utils.clone_governor import (
+    HOST,
+    SOURCE_DATASTORE,
+    TARGET_DATASTORE,
+    CloneLimits,
+    ResourceKey,
+    clone_governor,
+)
 
 
 class CloneVMCommand(RollbackCommand):
@@ -30,6 +40,10 @@ class CloneVMCommand(RollbackCommand):
         vm_snapshot: SnapshotHandler | None = None,
         config_spec: ConfigSpecHandler | None = None,
         on_task_progress: ON_TASK_PROGRESS_TYPE | None = None,
+        clone_limits: CloneLimits | None = None,
+        vm_host: HostHandler | None = None,
+        customization: CustomSpecHandler | None = None,
+        shared_folder: bool = False,
     ):
         super().__init__(
             rollback_manager=rollback_manager, cancellation_manager=cancellation_manager
@@ -42,29 +56,56 @@ class CloneVMCommand(RollbackCommand):
         self._vm_snapshot = vm_snapshot
         self._config_spec = config_spec
         self._on_task_progress = on_task_progress
+        self._clone_limits = clone_limits or CloneLimits()
+        self._vm_host = vm_host
+        self._customization = customization
+        # the folder is used by other deployments of the batch, it removes it
+        self._shared_folder = shared_folder
         self._cloned_vm: VmHandler | None = None
 
     def _execute(self) -> VmHandler:
         try:
-            vm = self._vm_template.clone_vm(
-                vm_name=self._vm_name,
-                vm_storage=self._vm_storage,
-                vm_folder=self._vm_folder,
-                vm_resource_pool=self._vm_resource_pool,
-                snapshot=self._vm_snapshot,
-                config_spec=self._config_spec,
-                on_task_progress=self._on_task_progress,
-            )
+            with clone_governor.clone_slot(self._get_limits(), self._is_cancelled):
+                vm = self._vm_template.clone_vm(
+                    vm_name=self._vm_name,
+                    vm_storage=self._vm_storage,
+                    vm_folder=self._vm_folder,
+                    vm_resource_pool=self._vm_resource_pool,
+                    snapshot=self._vm_snapshot,
+                    config_spec=self._config_spec,
+                    on_task_progress=self._on_task_progress,
+                    vm_host=self._vm_host,
+                    customization=self._customization,
+                )
         except Exception:
-            with suppress(FolderIsNotEmpty):
-                self._vm_folder.destroy()
+            self._remove_folder()
             raise
         else:
             self._cloned_vm = vm
             return vm
 
+    def _get_limits(self) -> dict[ResourceKey, int]:
+        limits = self._clone_limits
+        if not limits.enabled:
+            return {}
+
+        result = {(TARGET_DATASTORE, self._vm_storage.name): limits.target_datastore}
+        for datastore in self._vm_template.datastores:
+            result[(SOURCE_DATASTORE, datastore.name)] = limits.source_datastore
+        # the clone is created on the pinned host if it's set
+        host = self._vm_host or self._vm_template.host
+        result[(HOST, host.name)] = limits.host
+        return result
+
+    def _is_cancelled(self) -> bool:
+        return self._cancellation_manager.cancellation_context.is_cancelled
+
     def rollback(self):
         if self._cloned_vm:
             self._cloned_vm.delete()
-        with suppress(FolderIsNotEmpty):
-            self._vm_folder.destroy()
+        self._remove_folder()
+
+    def _remove_folder(self) -> None:
+        if not self._shared_folder:
+            with suppress(FolderIsNotEmpty):
+                self._vm_folder.destroy()
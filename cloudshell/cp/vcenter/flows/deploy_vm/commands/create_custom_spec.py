@@ -5,10 +5,10 @@ from cloudshell.cp.core.rollback import RollbackCommand, RollbackCommandsManager
 
 from cloudshell.cp.vcenter.handlers.custom_spec_handler import CustomSpecHandler
 from cloudshell.cp.vcenter.handlers.si_handler import CustomSpecNotFound, SiHandler
-from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
 from cloudshell.cp.vcenter.models.custom_spec import get_custom_spec_params
 from cloudshell.cp.vcenter.models.deploy_app import BaseVCenterDeployApp
 from cloudshell.cp.vcenter.utils.customization_params import prepare_custom_spec
+from cloudshell.cp.vcenter.utils.template_watcher import VmSource
 
 
 class CreateVmCustomSpec(RollbackCommand):
@@ -18,26 +18,34 @@ class CreateVmCustomSpec(RollbackCommand):
         cancellation_manager: CancellationContextManager,
         si: SiHandler,
         deploy_app: BaseVCenterDeployApp,
-        vm_template: VmHandler,
+        vm_source: VmSource,
         vm_name: str,
+        save: bool = True,
     ):
         super().__init__(rollback_manager, cancellation_manager)
         self._si = si
         self._deploy_app = deploy_app
-        self._vm_template = vm_template
+        self._vm_source = vm_source
         self._vm_name = vm_name
+        self._save = save
 
     def _execute(self, *args, **kwargs) -> CustomSpecHandler:
-        custom_spec_params = get_custom_spec_params(self._deploy_app, self._vm_template)
+        custom_spec_params = get_custom_spec_params(
+            self._deploy_app, self._vm_source.vm, self._vm_source.guest_id
+        )
         spec = prepare_custom_spec(
             custom_spec_params,
             self._deploy_app.customization_spec,
-            self._vm_template,
+            self._vm_source.vm,
             self._vm_name,
             self._si,
+            self._vm_source.num_vnics,
+            save=self._save,
         )
         return spec
 
     def rollback(self):
+        if not self._save:
+            return
         with suppress(CustomSpecNotFound):
             self._si.delete_customization_spec(self._vm_name)
@@ -5,11 +5,11 @@ from cloudshell.cp.core.rollback import RollbackCommand, RollbackCommandsManager
 
 from cloudshell.cp.vcenter.handlers.datastore_handler import DatastoreHandler
 from cloudshell.cp.vcenter.handlers.dc_handler import DcHandler
+from cloudshell.cp.vcenter.handlers.folder_handler import FolderHandler
 from cloudshell.cp.vcenter.handlers.resource_pool import ResourcePoolHandler
-from cloudshell.cp.vcenter.handlers.vcenter_path import VcenterPath
 from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
 from cloudshell.cp.vcenter.resource_config import VCenterResourceConfig
-from cloudshell.cp.vcenter.utils.ovf_tool import OVFToolScript
+from cloudshell.cp.vcenter.utils.ovf_importer import ImageArguments, OvfImporter
 
 
 class DeployVMFromImageCommand(RollbackCommand):
@@ -23,7 +23,7 @@ class DeployVMFromImageCommand(RollbackCommand):
         vm_name: str,
         vm_resource_pool: ResourcePoolHandler,
         vm_storage: DatastoreHandler,
-        vm_folder_path: VcenterPath,
+        vm_folder: FolderHandler,
         dc: DcHandler,
     ):
         super().__init__(
@@ -35,29 +35,28 @@ class DeployVMFromImageCommand(RollbackCommand):
         self._vm_name = vm_name
         self._vm_resource_pool = vm_resource_pool
         self._vm_storage = vm_storage
-        self._vm_folder_path = vm_folder_path
+        self._vm_folder = vm_folder
         self._dc = dc
         self._deployed_vm: VmHandler | None = None
 
     def _execute(self) -> VmHandler:
-        ovf_tool_script = OVFToolScript(
-            ovf_tool_path=self._resource_conf.ovf_tool_path,
-            datacenter=self._resource_conf.default_datacenter,
-            vm_cluster=self._resource_conf.vm_cluster,
-            vm_storage=self._vm_storage.name,
-            vm_folder=str(self._vm_folder_path),
-            vm_resource_pool=self._resource_conf.vm_resource_pool,
+        image_args = ImageArguments.from_list(self._vcenter_image_arguments)
+        networks = {
+            name: self._dc.get_network(network_name)
+            for name, network_name in image_args.networks.items()
+        }
+        importer = OvfImporter(
+            self._dc.si, self._cancellation_manager, self._resource_conf.address
+        )
+        vm = importer.import_vm(
+            image=self._vcenter_image,
             vm_name=self._vm_name,
-            vcenter_image=self._vcenter_image,
-            custom_args=self._vcenter_image_arguments,
-            vcenter_user=self._resource_conf.user,
-            vcenter_password=self._resource_conf.password,
-            vcenter_host=self._resource_conf.address,
+            vm_resource_pool=self._vm_resource_pool,
+            vm_storage=self._vm_storage,
+            vm_folder=self._vm_folder,
+            image_args=image_args,
+            networks=networks,
         )
-        ovf_tool_script.run()
-
-        path = self._vm_folder_path + self._vm_name
-        vm = self._dc.get_vm_by_path(path)
         self._deployed_vm = vm
         return vm
 
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from cloudshell.cp.core.cancellation_manager import CancellationContextManager
+from cloudshell.cp.core.rollback import RollbackCommand, RollbackCommandsManager
+
+from cloudshell.cp.vcenter.handlers.datastore_handler import DatastoreHandler
+from cloudshell.cp.vcenter.handlers.folder_handler import FolderHandler
+from cloudshell.cp.vcenter.handlers.resource_pool import ResourcePoolHandler
+from cloudshell.cp.vcenter.handlers.task import ON_TASK_PROGRESS_TYPE
+from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+
+
+class InstantCloneVMCommand(RollbackCommand):
+    def __init__(
+        self,
+        parent_vm: VmHandler,
+        rollback_manager: RollbackCommandsManager,
+        cancellation_manager: CancellationContextManager,
+        vm_name: str,
+        vm_storage: DatastoreHandler,
+        vm_folder: FolderHandler,
+        vm_resource_pool: ResourcePoolHandler | None = None,
+        guest_info: dict[str, str] | None = None,
+        on_task_progress: ON_TASK_PROGRESS_TYPE | None = None,
+    ):
+        super().__init__(
+            rollback_manager=rollback_manager, cancellation_manager=cancellation_manager
+        )
+        self._parent_vm = parent_vm
+        self._vm_name = vm_name
+        self._vm_storage = vm_storage
+        self._vm_folder = vm_folder
+        self._vm_resource_pool = vm_resource_pool
+        self._guest_info = guest_info
+        self._on_task_progress = on_task_progress
+        self._cloned_vm: VmHandler | None = None
+
+    def _execute(self) -> VmHandler:
+        vm = self._parent_vm.instant_clone(
+            vm_name=self._vm_name,
+            vm_storage=self._vm_storage,
+            vm_folder=self._vm_folder,
+            vm_resource_pool=self._vm_resource_pool,
+            guest_info=self._guest_info,
+            on_task_progress=self._on_task_progress,
+        )
+        self._cloned_vm = vm
+        return vm
+
+    def rollback(self):
+        if self._cloned_vm:
+            # instant clone is running, it can't be deleted powered on
+            self._cloned_vm.power_off(soft=False)
+            self._cloned_vm.delete()
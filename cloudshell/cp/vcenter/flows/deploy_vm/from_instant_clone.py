@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from cloudshell.cp.core.request_actions.models import VmDetailsData
+
+from cloudshell.cp.vcenter.actions.validation import ValidationActions
+from cloudshell.cp.vcenter.actions.vm_details import VMDetailsActions
+from cloudshell.cp.vcenter.flows.deploy_vm.base_flow import AbstractVCenterDeployVMFlow
+from cloudshell.cp.vcenter.flows.deploy_vm.commands import InstantCloneVMCommand
+from cloudshell.cp.vcenter.handlers.datastore_handler import DatastoreHandler
+from cloudshell.cp.vcenter.handlers.dc_handler import DcHandler
+from cloudshell.cp.vcenter.handlers.folder_handler import FolderHandler
+from cloudshell.cp.vcenter.handlers.resource_pool import ResourcePoolHandler
+from cloudshell.cp.vcenter.handlers.storage_pod_handler import StoragePodHandler
+from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+from cloudshell.cp.vcenter.models.deploy_app import VMFromInstantCloneDeployApp
+
+# the guest reads its network identity from these variables
+GUEST_INFO_HOSTNAME = "guestinfo.hostname"
+GUEST_INFO_IP_ADDRESS = "guestinfo.ipaddress"
+
+
+class VCenterDeployVMFromInstantCloneFlow(AbstractVCenterDeployVMFlow):
+    """Deploy running VM that shares memory and disks of the running parent VM.
+
+    There is no guest customization, the network identity is passed to the guest
+    via guestinfo variables.
+    """
+
+    def _validate_deploy_app_once(self, deploy_app: VMFromInstantCloneDeployApp):
+        # these attributes could differ for apps with the same parent VM
+        ValidationActions.validate_instant_clone_app_attrs(deploy_app)
+        super()._validate_deploy_app_once(deploy_app)
+
+    def _validate_deploy_app(self, deploy_app: VMFromInstantCloneDeployApp):
+        """Validate Deploy App before deployment."""
+        super()._validate_deploy_app(deploy_app)
+        validation_actions = ValidationActions(
+            self._si,
+            self._resource_config,
+        )
+        validation_actions.validate_deploy_app_from_instant_clone(deploy_app)
+
+    def _prepare_vm_details_data(
+        self, deployed_vm: VmHandler, deploy_app: VMFromInstantCloneDeployApp
+    ) -> VmDetailsData:
+        """Prepare CloudShell VM Details model."""
+        vm_details_actions = VMDetailsActions(
+            self._si,
+            self._resource_config,
+            self._cancellation_manager,
+        )
+        return vm_details_actions.create(deployed_vm, deploy_app)
+
+    def _create_vm(
+        self,
+        deploy_app: VMFromInstantCloneDeployApp,
+        vm_name: str,
+        vm_resource_pool: ResourcePoolHandler,
+        vm_storage: DatastoreHandler | StoragePodHandler,
+        vm_folder: FolderHandler,
+        dc: DcHandler,
+    ) -> VmHandler:
+        """Create VM on the vCenter, it starts with empty delta disks."""
+        with self._cancellation_manager, self._stage("vm_source"):
+            parent_vm = self._resolve(
+                ("vm_source", deploy_app.vcenter_vm),
+                lambda: dc.get_vm_by_path(deploy_app.vcenter_vm),
+            )
+
+        with self._reserve_datastore(vm_storage) as vm_datastore:
+            return InstantCloneVMCommand(
+                parent_vm=parent_vm,
+                rollback_manager=self._rollback_manager,
+                cancellation_manager=self._cancellation_manager,
+                on_task_progress=self._on_task_progress,
+                vm_name=vm_name,
+                vm_storage=vm_datastore,
+                vm_folder=vm_folder,
+                vm_resource_pool=vm_resource_pool,
+                guest_info=get_guest_info(deploy_app, vm_name),
+            ).execute()
+
+
+def get_guest_info(
+    deploy_app: VMFromInstantCloneDeployApp, vm_name: str
+) -> dict[str, str]:
+    guest_info = {GUEST_INFO_HOSTNAME: deploy_app.hostname or vm_name}
+    if deploy_app.private_ip:
+        guest_info[GUEST_INFO_IP_ADDRESS] = deploy_app.private_ip
+    guest_info.update(deploy_app.guest_info)
+    return guest_info
@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+import logging
+
 from cloudshell.cp.core.request_actions.models import VmDetailsData
 
 from cloudshell.cp.vcenter.actions.validation import ValidationActions
@@ -8,14 +12,62 @@ from cloudshell.cp.vcenter.flows.deploy_vm.base_flow import (
 from cloudshell.cp.vcenter.handlers.dc_handler import DcHandler
 from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
 from cloudshell.cp.vcenter.models.deploy_app import VMFromTemplateDeployApp
+from cloudshell.cp.vcenter.utils.linked_clone_base import (
+    LINKED_CLONE_BASE_FOLDER,
+    get_base_vm_name,
+    get_linked_clone_base,
+)
+from cloudshell.cp.vcenter.utils.template_watcher import VmSource
+
+logger = logging.getLogger(__name__)
 
 
 class VCenterDeployVMFromTemplateFlow(AbstractVCenterDeployVMFromTemplateFlow):
-    def _get_vm_template(
+    def _get_vm_template_path(self, deploy_app: VMFromTemplateDeployApp) -> str:
+        """Get path of the VM template to clone VM from."""
+        return deploy_app.vcenter_template
+
+    def _get_vm_source(
         self, deploy_app: VMFromTemplateDeployApp, dc: DcHandler
-    ) -> VmHandler:
-        """Get VM template to clone VM from."""
-        return dc.get_vm_by_path(deploy_app.vcenter_template)
+    ) -> VmSource:
+        """Get the source, linked clone base of the template if it's enabled.
+
+        HDD specs change disks that are shared by linked clones, such apps are
+        deployed as full clones of the template.
+        """
+        vm_source = super()._get_vm_source(deploy_app, dc)
+        if not deploy_app.linked_clone or deploy_app.hdd_specs:
+            return vm_source
+
+        key = ("vm_source", "linked_clone_base", get_base_vm_name(vm_source.vm))
+        return self._resolve(
+            key, lambda: self._get_linked_clone_source(deploy_app, dc, vm_source)
+        )
+
+    def _get_linked_clone_source(
+        self, deploy_app: VMFromTemplateDeployApp, dc: DcHandler, vm_source: VmSource
+    ) -> VmSource:
+        try:
+            base_folder = self._resolve(
+                ("linked_clone_base_folder",),
+                lambda: dc.get_or_create_vm_folder(LINKED_CLONE_BASE_FOLDER),
+            )
+            # the base is shared, cancelled deployment doesn't cancel its creation
+            base_vm, snapshot = get_linked_clone_base(
+                vm_source.vm, base_folder, self._get_vm_resource_pool(deploy_app, dc)
+            )
+        except Exception:
+            logger.warning(
+                f"Failed to get the linked clone base of the {vm_source.vm}, "
+                f"deploying a full clone",
+                exc_info=True,
+            )
+            return vm_source
+        return VmSource(base_vm, snapshot, vm_source.num_vnics, vm_source.guest_id)
+
+    def _get_vm_size(self, vm_source: VmSource) -> int:
+        """Linked clone starts with empty delta disks."""
+        return 0 if vm_source.snapshot else vm_source.vm.disks_size
 
     def _validate_deploy_app(self, deploy_app: VMFromTemplateDeployApp):
         """Validate Deploy App before deployment."""
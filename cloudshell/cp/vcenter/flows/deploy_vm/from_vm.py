@@ -9,7 +9,6 @@ from cloudshell.cp.vcenter.actions.vm_details import VMDetailsActions
 from cloudshell.cp.vcenter.flows.deploy_vm.base_flow import (
     AbstractVCenterDeployVMFromTemplateFlow,
 )
-from cloudshell.cp.vcenter.handlers.dc_handler import DcHandler
 from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
 
 if TYPE_CHECKING:
@@ -17,11 +16,9 @@ if TYPE_CHECKING:
 
 
 class VCenterDeployVMFromVMFlow(AbstractVCenterDeployVMFromTemplateFlow):
-    def _get_vm_template(
-        self, deploy_app: VMFromVMDeployApp, dc: DcHandler
-    ) -> VmHandler:
-        """Get VM template to clone VM from."""
-        return dc.get_vm_by_path(deploy_app.vcenter_vm)
+    def _get_vm_template_path(self, deploy_app: VMFromVMDeployApp) -> str:
+        """Get path of the VM template to clone VM from."""
+        return deploy_app.vcenter_vm
 
     def _validate_deploy_app(self, deploy_app: VMFromVMDeployApp):
         """Validate Deploy App before deployment."""
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Callable, Generator, Hashable
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, TypeVar
+
+from attrs import define, field
+
+from cloudshell.cp.vcenter.utils.threading import LockHandler
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+@define
+class StageTiming:
+    count: int = 0
+    total: float = 0.0
+
+    @property
+    def average(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@define
+class DeployPlacement:
+    """Objects shared by the deployments of one batch.
+
+    Every object is resolved once by the first deployment that needs it, others
+    wait for it and reuse it. Failures are not cached.
+    Also accumulates time spent in every deployment stage.
+    """
+
+    _resolved: dict[Hashable, Any] = field(init=False, factory=dict)
+    _locks: LockHandler = field(init=False, factory=LockHandler)
+    _timings: dict[str, StageTiming] = field(
+        init=False, factory=lambda: defaultdict(StageTiming)
+    )
+    _timings_lock: Lock = field(init=False, factory=Lock)
+
+    def resolve(self, key: tuple[Hashable, ...], fn: Callable[[], T]) -> T:
+        """Get the object by the key, the first element is the stage name."""
+        if key in self._resolved:
+            return self._resolved[key]
+
+        with self._locks.lock(repr(key)):
+            if key not in self._resolved:
+                with self.stage(key[0]):
+                    self._resolved[key] = fn()
+        return self._resolved[key]
+
+    def get_resolved(self, stage: str) -> list[Any]:
+        return [obj for key, obj in self._resolved.copy().items() if key[0] == stage]
+
+    @contextmanager
+    def stage(self, name: str) -> Generator[None, None, None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            with self._timings_lock:
+                timing = self._timings[name]
+                timing.count += 1
+                timing.total += duration
+
+    @property
+    def timings(self) -> dict[str, StageTiming]:
+        with self._timings_lock:
+            return {
+                name: StageTiming(t.count, t.total) for name, t in self._timings.items()
+            }
@@ -68,6 +68,15 @@ class VMFromLinkedCloneHintsHandler(AbstractHintsHandler):
     )
 
 
+class VMFromInstantCloneHintsHandler(AbstractHintsHandler):
+    DEPLOYMENT_PATH = constants.VM_FROM_INSTANT_CLONE_DEPLOYMENT_PATH
+    ATTRIBUTES = (
+        attribute_hints.VcenterVMAttributeHint,
+        attribute_hints.VMClusterAttributeHint,
+        attribute_hints.VMStorageAttributeHint,
+    )
+
+
 class VMFromImageHintsHandler(AbstractHintsHandler):
     DEPLOYMENT_PATH = constants.VM_FROM_IMAGE_DEPLOYMENT_PATH
     ATTRIBUTES = (
@@ -81,6 +90,7 @@ def get_handler(request: DeployDataHolder, dc: DcHandler) -> AbstractHintsHandle
         VMFromVMHintsHandler,
         VMFromTemplateHintsHandler,
         VMFromLinkedCloneHintsHandler,
+        VMFromInstantCloneHintsHandler,
         VMFromImageHintsHandler,
     )
 
@@ -26,6 +26,13 @@ class VCenterPowerFlow:
         vm = self._get_vm()
 
         logger.info(f"Powering On the {vm}")
+        if vm.customization_pending:
+            # customization spec was passed to the clone task
+            powered_time = vm.power_on()
+            vm.wait_for_customization_ready(powered_time)
+            vm.clear_customization_pending()
+            return
+
         spec_name = vm.name
         spec = None
         try:
@@ -8,6 +8,7 @@ from cloudshell.cp.core.request_actions.models import (
 from cloudshell.cp.vcenter.actions.validation import ValidationActions
 from cloudshell.cp.vcenter.constants import (
     VM_FROM_IMAGE_DEPLOYMENT_PATH,
+    VM_FROM_INSTANT_CLONE_DEPLOYMENT_PATH,
     VM_FROM_LINKED_CLONE_DEPLOYMENT_PATH,
     VM_FROM_TEMPLATE_DEPLOYMENT_PATH,
     VM_FROM_VM_DEPLOYMENT_PATH,
@@ -17,6 +18,7 @@ from cloudshell.cp.vcenter.models.base_deployment_app import (
     VCenterDeploymentAppAttributeNames,
     VCenterVMFromCloneDeployAppAttributeNames,
     VCenterVMFromImageDeploymentAppAttributeNames,
+    VCenterVMFromInstantCloneDeployAppAttributeNames,
     VCenterVMFromTemplateDeploymentAppAttributeNames,
     VCenterVMFromVMDeploymentAppAttributeNames,
 )
@@ -31,6 +33,7 @@ def validate_attributes(
         VM_FROM_TEMPLATE_DEPLOYMENT_PATH: _validate_app_from_template,
         VM_FROM_LINKED_CLONE_DEPLOYMENT_PATH: _validate_app_from_clone,
         VM_FROM_IMAGE_DEPLOYMENT_PATH: _validate_app_from_image,
+        VM_FROM_INSTANT_CLONE_DEPLOYMENT_PATH: _validate_app_from_instant_clone,
     }
     action = ValidateAttributes.from_request(request)
     validator = ValidationActions(si, resource_conf)
@@ -79,3 +82,10 @@ def _validate_app_from_clone(action: ValidateAttributes, validator: ValidationAc
 def _validate_app_from_image(action: ValidateAttributes, validator: ValidationActions):
     a_names = VCenterVMFromImageDeploymentAppAttributeNames
     validator.validate_app_from_image(action.get(a_names.vcenter_image))
+
+
+def _validate_app_from_instant_clone(
+    action: ValidateAttributes, validator: ValidationActions
+):
+    a_names = VCenterVMFromInstantCloneDeployAppAttributeNames
+    validator.validate_app_from_instant_clone(action.get(a_names.vcenter_vm))
@@ -18,6 +18,10 @@ from cloudshell.cp.vcenter.utils.vm_helpers import (
 )
 
 if TYPE_CHECKING:
+    from cloudshell.cp.vcenter.handlers.network_handler import (
+        DVPortGroupHandler,
+        NetworkHandler,
+    )
     from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
     from cloudshell.cp.vcenter.models.deploy_app import BaseVCenterDeployApp
 
@@ -103,9 +107,19 @@ class ConfigSpecHandler:
     ram_amount: float | None
     hdd_specs: list[HddSpec]
     bios_uuid: str | None = None
+    # {vNIC name or index: network}  noqa: E800
+    vnic_networks: dict[str, NetworkHandler | DVPortGroupHandler] = attr.Factory(dict)
 
     def __bool__(self) -> bool:
-        return any((self.cpu_num, self.ram_amount, self.hdd_specs, self.bios_uuid))
+        return any(
+            (
+                self.cpu_num,
+                self.ram_amount,
+                self.hdd_specs,
+                self.bios_uuid,
+                self.vnic_networks,
+            )
+        )
 
     @classmethod
     def from_deploy_add(cls, deploy_app: BaseVCenterDeployApp) -> ConfigSpecHandler:
@@ -194,6 +208,16 @@ class ConfigSpecHandler:
             raise UnableToFindScsiController()
         return key
 
+    def can_be_applied_on_clone(self, vm: VmHandler, linked: bool) -> bool:
+        """Check that the spec computed from the source VM is valid for the clone.
+
+        Linked clone gets new child disks and full clone consolidates disks that
+        have parents, so disk changes are computed from the cloned VM then.
+        """
+        if not self.hdd_specs:
+            return True
+        return not linked and not any(disk.has_parent for disk in vm.disks)
+
     def get_spec_for_vm(self, vm: VmHandler) -> vim.vm.ConfigSpec:
         config_spec = vim.vm.ConfigSpec(
             cpuHotAddEnabled=True, cpuHotRemoveEnabled=True, memoryHotAddEnabled=True
@@ -207,6 +231,9 @@ class ConfigSpecHandler:
             self._update_hdd_specs(config_spec, vm.get_vc_obj())
         if self.bios_uuid:
             config_spec.uuid = self.bios_uuid
+        for vnic_name, network in self.vnic_networks.items():
+            vnic = vm.get_vnic(vnic_name)
+            config_spec.deviceChange.append(vnic.get_connect_spec(network))
         return config_spec
 
     def _validate_hdd_spec(self, vm: VmHandler):
@@ -38,7 +38,7 @@ from cloudshell.cp.vcenter.handlers.switch_handler import (
 )
 from cloudshell.cp.vcenter.handlers.vcenter_path import VcenterPath
 from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler, VmNotFound
-from cloudshell.cp.vcenter.utils.network_watcher import NetworkWatcher
+from cloudshell.cp.vcenter.utils.network_watcher import shared_network_watcher
 
 logger = logging.getLogger(__name__)
 
@@ -76,14 +76,14 @@ class DcHandler(ManagedEntityHandler):
         return [ClusterHandler(vc_cluster, self.si) for vc_cluster in vc_clusters]
 
     def get_network(self, name: str) -> NetworkHandler | DVPortGroupHandler:
-        """Collecting all networks is not quick for many networks.
+        """Get the network by name.
 
-        If you need to get a network several times in the flow use NetworkWatcher
-        separately.
+        FindChild doesn't look into sub folders, in that case we use the session's
+        shared NetworkWatcher, so collecting all networks happens once per session.
         """
         network_folder = self.get_network_folder()
         if not (net := network_folder.find_child(name)):
-            with NetworkWatcher(self.si, network_folder) as networks:
+            with shared_network_watcher(self.si, self) as networks:
                 network = networks.get_network(name)
         else:
             network = get_network_handler(net, self.si)
@@ -165,6 +165,14 @@ class DcHandler(ManagedEntityHandler):
         return compute_entity
 
     def get_datastore(self, path: str | VcenterPath) -> DatastoreHandler:
+        datastore = self.get_datastore_or_storage_pod(path)
+        if isinstance(datastore, StoragePodHandler):
+            datastore = datastore.get_datastore_with_max_free_space()
+        return datastore
+
+    def get_datastore_or_storage_pod(
+        self, path: str | VcenterPath
+    ) -> DatastoreHandler | StoragePodHandler:
         if not isinstance(path, VcenterPath):
             path = VcenterPath(path)
         # we ignore datastore parents for now
@@ -174,8 +182,7 @@ class DcHandler(ManagedEntityHandler):
             datastore = self.get_datastore_by_name(datastore_name)
         except DatastoreNotFound as exc:
             try:
-                storage_pod = self.get_storage_pod(datastore_name)
-                datastore = storage_pod.get_datastore_with_max_free_space()
+                datastore = self.get_storage_pod(datastore_name)
             except StoragePodNotFound:
                 raise exc
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import logging
 import time
 from abc import abstractmethod
 from collections.abc import Generator
@@ -16,6 +17,9 @@ from cloudshell.cp.vcenter.handlers.managed_entity_handler import (
     ManagedEntityNotFound,
 )
 from cloudshell.cp.vcenter.handlers.si_handler import ResourceInUse, SiHandler
+from cloudshell.cp.vcenter.handlers.task import Task
+from cloudshell.cp.vcenter.utils.connectivity_helpers import is_shell_port_group_name
+from cloudshell.cp.vcenter.utils.threading import LockHandler
 
 if TYPE_CHECKING:
     from cloudshell.cp.vcenter.handlers.cluster_handler import HostHandler
@@ -23,6 +27,13 @@ if TYPE_CHECKING:
     from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
 
 
+logger = logging.getLogger(__name__)
+dv_port_group_lock = LockHandler()
+# vCenter instance UUID and key of DV port groups that vCenter grows itself,
+# elastic and ephemeral ones, keys are unique only in one vCenter
+elastic_dv_port_group_keys: set[tuple[str, str]] = set()
+
+
 class NetworkNotFound(BaseVCenterException):
     def __init__(self, entity: ManagedEntityHandler, name: str):
         self.name = name
@@ -153,10 +164,66 @@ class DVPortGroupHandler(AbstractNetwork, AbstractPortGroupHandler):
     def switch_uuid(self) -> str:
         return self._vc_obj.config.distributedVirtualSwitch.uuid
 
+    @property
+    def num_ports(self) -> int:
+        return self._vc_obj.config.numPorts
+
+    @property
+    def config_version(self) -> str:
+        return self._vc_obj.config.configVersion
+
+    @property
+    def auto_expand(self) -> bool:
+        return bool(self._vc_obj.config.autoExpand)
+
+    @property
+    def is_ephemeral(self) -> bool:
+        return self._vc_obj.config.type == "ephemeral"
+
     @property
     def _class_name(self) -> str:
         return "Distributed Virtual Port group"
 
+    def get_used_ports_count(self) -> int:
+        vc_dvs = self._vc_obj.config.distributedVirtualSwitch
+        criteria = vim.dvs.PortCriteria(connected=True, portgroupKey=[self.key])
+        return len(vc_dvs.FetchDVPorts(criteria))
+
+    def ensure_free_ports(self, count: int) -> None:
+        """Grow the port group before it would be exhausted.
+
+        Elastic and ephemeral port groups are grown by vCenter. Port groups
+        created by the Shell are made elastic and resized to have at least count
+        free ports, others are not changed and vCenter decides.
+        """
+        elastic_key = (self.si.instance_uuid, self.key)
+        if elastic_key in elastic_dv_port_group_keys:
+            return
+        if self.auto_expand or self.is_ephemeral:
+            elastic_dv_port_group_keys.add(elastic_key)
+            return
+        with dv_port_group_lock.lock(self.key):
+            used_ports = self.get_used_ports_count()
+            num_ports = used_ports + count
+            if self.auto_expand or num_ports <= self.num_ports:
+                return
+            if not is_shell_port_group_name(self.name):
+                logger.warning(
+                    f"{self} has {self.num_ports - used_ports} free ports but "
+                    f"{count} are needed, it isn't created by the Shell"
+                )
+                return
+
+            logger.info(f"Expanding the {self} to {num_ports} ports")
+            spec = vim.dvs.DistributedVirtualPortgroup.ConfigSpec(
+                configVersion=self.config_version,
+                numPorts=num_ports,
+                autoExpand=True,
+            )
+            vc_task = self._vc_obj.ReconfigureDVPortgroup_Task(spec)
+            Task(vc_task).wait()
+        elastic_dv_port_group_keys.add(elastic_key)
+
     def destroy(self):
         try:
             self._vc_obj.Destroy()
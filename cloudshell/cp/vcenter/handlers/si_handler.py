@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Callable
 from contextlib import suppress
 from functools import partial
 from threading import Lock
 from typing import TYPE_CHECKING, Any
 
-from attrs import define
+from attrs import define, field
 from pyVim.connect import Disconnect
 from pyVmomi import vim
 
@@ -40,11 +41,13 @@ class ResourceInUse(BaseVCenterException):
 @define
 class SiHandler:
     _vc_obj: vim.ServiceInstance
+    _on_disconnect: list[Callable[[], None]] = field(init=False, factory=list)
 
     def __enter__(self) -> Self:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        self._run_on_disconnect()
         Disconnect(self._vc_obj)
         # Disconnect makes session not valid but left opened socket ...
         # we have to destroy it
@@ -60,6 +63,28 @@ class SiHandler:
         si = get_si(host, user, password)
         return cls(si)
 
+    @property
+    def session_key(self) -> Any:
+        """Identifies the API session, objects bound to it can't outlive it."""
+        return self._vc_obj._stub
+
+    @property
+    def session_cookie(self) -> str:
+        """Authenticates HTTP requests, e.g. uploads to the NFC lease URLs."""
+        return self._vc_obj._stub.cookie
+
+    def add_on_disconnect(self, callback: Callable[[], None]) -> None:
+        """Register a callback to release session resources before disconnect."""
+        self._on_disconnect.append(callback)
+
+    def _run_on_disconnect(self) -> None:
+        while self._on_disconnect:
+            callback = self._on_disconnect.pop()
+            try:
+                callback()
+            except Exception:
+                logger.warning("Failed to release session resources", exc_info=True)
+
     @property
     def root_folder(self):
         return self._vc_obj.content.rootFolder
@@ -18,7 +18,13 @@ class StoragePodNotFound(BaseVCenterException):
         super().__init__(f"Storage Pod with name '{name}' not found in {entity}")
 
 
-@attr.s(auto_attribs=True)
+class StoragePodIsEmpty(BaseVCenterException):
+    def __init__(self, storage_pod: StoragePodHandler):
+        self.storage_pod = storage_pod
+        super().__init__(f"{storage_pod} doesn't have datastores")
+
+
+@attr.s(auto_attribs=True, repr=False)
 class StoragePodHandler(ManagedEntityHandler):
     @property
     def datastores(self) -> list[DatastoreHandler]:
@@ -12,7 +12,10 @@ from cloudshell.shell.flows.connectivity.models.connectivity_model import (
 
 from cloudshell.cp.vcenter.exceptions import BaseVCenterException
 from cloudshell.cp.vcenter.handlers.managed_entity_handler import ManagedEntityHandler
-from cloudshell.cp.vcenter.handlers.network_handler import PortGroupNotFound
+from cloudshell.cp.vcenter.handlers.network_handler import (
+    DVPortGroupHandler,
+    PortGroupNotFound,
+)
 from cloudshell.cp.vcenter.handlers.task import ON_TASK_PROGRESS_TYPE, Task
 
 if TYPE_CHECKING:
@@ -21,6 +24,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# elastic port group is expanded by vCenter when all ports are used
+MIN_DV_PORTS = 8
+
 
 class DvSwitchNotFound(BaseVCenterException):
     def __init__(self, entity: ManagedEntityHandler, name: str):
@@ -58,6 +64,24 @@ def get_vlan_spec(port_mode: ConnectionModeEnum, vlan_range: str):
     return spec(vlanId=vlan_id, inherited=False)
 
 
+def get_port_config_policy(
+    vlan_range: str,
+    port_mode: ConnectionModeEnum,
+    promiscuous_mode: bool,
+    forged_transmits: bool,
+    mac_changes: bool,
+):
+    return vim.dvs.VmwareDistributedVirtualSwitch.VmwarePortConfigPolicy(
+        securityPolicy=vim.dvs.VmwareDistributedVirtualSwitch.SecurityPolicy(
+            allowPromiscuous=vim.BoolPolicy(value=promiscuous_mode),
+            forgedTransmits=vim.BoolPolicy(value=forged_transmits),
+            macChanges=vim.BoolPolicy(value=mac_changes),
+            inherited=False,
+        ),
+        vlan=get_vlan_spec(port_mode, vlan_range),
+    )
+
+
 class AbstractSwitchHandler(Protocol):
     @property
     def name(self) -> str:
@@ -94,20 +118,13 @@ class DvSwitchHandler(ManagedEntityHandler, AbstractSwitchHandler):
         on_task_progress: ON_TASK_PROGRESS_TYPE | None = None,
     ) -> None:
         logger.debug(f"Creating dv port group {dv_port_name} on {self}")
-        port_conf_policy = (
-            vim.dvs.VmwareDistributedVirtualSwitch.VmwarePortConfigPolicy(
-                securityPolicy=vim.dvs.VmwareDistributedVirtualSwitch.SecurityPolicy(
-                    allowPromiscuous=vim.BoolPolicy(value=promiscuous_mode),
-                    forgedTransmits=vim.BoolPolicy(value=forged_transmits),
-                    macChanges=vim.BoolPolicy(value=mac_changes),
-                    inherited=False,
-                ),
-                vlan=get_vlan_spec(port_mode, vlan_range),
-            )
+        port_conf_policy = get_port_config_policy(
+            vlan_range, port_mode, promiscuous_mode, forged_transmits, mac_changes
         )
         dv_pg_spec = vim.dvs.DistributedVirtualPortgroup.ConfigSpec(
             name=dv_port_name,
-            numPorts=num_ports,
+            numPorts=max(num_ports, MIN_DV_PORTS),
+            autoExpand=True,
             type=vim.dvs.DistributedVirtualPortgroup.PortgroupType.earlyBinding,
             defaultPortConfig=port_conf_policy,
         )
@@ -117,6 +134,35 @@ class DvSwitchHandler(ManagedEntityHandler, AbstractSwitchHandler):
         task = Task(vc_task)
         task.wait(on_progress=on_task_progress)
 
+    def reconfigure_port_group(
+        self,
+        port_group: DVPortGroupHandler,
+        dv_port_name: str,
+        vlan_range: str,
+        port_mode: ConnectionModeEnum,
+        promiscuous_mode: bool,
+        forged_transmits: bool,
+        mac_changes: bool,
+        on_task_progress: ON_TASK_PROGRESS_TYPE | None = None,
+    ) -> None:
+        """Rename the port group and change its VLAN and security policy.
+
+        Fails if the port group was reconfigured after we read its config version.
+        """
+        logger.debug(f"Reconfiguring {port_group} to {dv_port_name} on {self}")
+        dv_pg_spec = vim.dvs.DistributedVirtualPortgroup.ConfigSpec(
+            configVersion=port_group.config_version,
+            name=dv_port_name,
+            defaultPortConfig=get_port_config_policy(
+                vlan_range, port_mode, promiscuous_mode, forged_transmits, mac_changes
+            ),
+        )
+
+        vc_task = port_group.get_vc_obj().ReconfigureDVPortgroup_Task(dv_pg_spec)
+        logger.info(f"DV Port Group '{dv_port_name}' RECONFIGURE Task")
+        task = Task(vc_task)
+        task.wait(on_progress=on_task_progress)
+
 
 @define(repr=False)
 class VSwitchHandler(AbstractSwitchHandler):
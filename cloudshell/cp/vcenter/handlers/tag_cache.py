@@ -1,35 +1,134 @@
 from __future__ import annotations
 
-from collections import defaultdict
+import time
+from collections import OrderedDict, defaultdict
 from collections.abc import Collection
+from threading import Lock, RLock
 
 from attrs import define, field
 
+from cloudshell.cp.vcenter.handlers.tag_cache_store import TagsCacheStore
+
+# every reservation adds a tag, so only recently used tags are kept in memory
+MAX_TAGS = 10_000
+
+
+@define
+class TagsCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    categories: int = 0
+    tags: int = 0
+
 
 @define
 class TagsCache:
+    """Categories and tags cache.
+
+    If the store is set, the cache is filled from it on creation, changes are
+    written through and misses are looked up in the store, so driver processes
+    share what they've learned.
+    Categories are always kept, tags are evicted in LRU order above max_tags.
+    """
+
+    _store: TagsCacheStore | None = None
+    max_tags: int = MAX_TAGS
     _category_name_to_id: dict[str:str] = field(factory=dict)
     _category_id_to_name: dict[str:str] = field(factory=dict)
     # {category_id: {tag_name: tag_id}}  noqa: E800
     _tag_name_to_id: dict[str, dict[str:str]] = field(factory=lambda: defaultdict(dict))
-    # {tag_id: (tag_name, category_id)}  noqa: E800
-    _tag_id_to_name: dict[str, tuple[str, str]] = field(factory=dict)
+    # {tag_id: (tag_name, category_id)} in LRU order  noqa: E800
+    _tag_id_to_name: OrderedDict[str, tuple[str, str]] = field(factory=OrderedDict)
+    _loaded_at: float | None = field(default=None)
+    _stats: TagsCacheStats = field(init=False, factory=TagsCacheStats)
+    _lock: RLock = field(init=False, factory=RLock)
+    load_lock: Lock = field(factory=Lock)
+
+    def __attrs_post_init__(self):
+        if self._store and (stored := self._store.load()):
+            categories, tags = stored
+            for category_id, name in categories.items():
+                self._add_category(name, category_id)
+            for tag_id, (name, category_id) in tags.items():
+                self._add_tag(category_id, name, tag_id)
+
+    @property
+    def stats(self) -> TagsCacheStats:
+        with self._lock:
+            return TagsCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                evictions=self._stats.evictions,
+                categories=len(self._category_id_to_name),
+                tags=len(self._tag_id_to_name),
+            )
+
+    def _count(self, found: bool) -> None:
+        if found:
+            self._stats.hits += 1
+        else:
+            self._stats.misses += 1
+
+    def is_loaded(self, ttl: float) -> bool:
+        """Check that all categories and tags were loaded less than ttl ago."""
+        loaded_at = self._loaded_at
+        if loaded_at is None and self._store:
+            loaded_at = self._store.get_loaded_at()
+        return loaded_at is not None and time.time() - loaded_at < ttl
+
+    def set_loaded(self) -> None:
+        self._loaded_at = time.time()
+        if self._store:
+            self._store.set_loaded_at(self._loaded_at)
 
     def add_category(self, name: str, category_id: str) -> None:
+        with self._lock:
+            self._add_category(name, category_id)
+        if self._store:
+            self._store.add_category(name, category_id)
+
+    def _add_category(self, name: str, category_id: str) -> None:
+        self._delete_category(self._category_name_to_id.get(name))
         self._category_name_to_id[name] = category_id
         self._category_id_to_name[category_id] = name
 
     def get_category_id(self, name: str) -> str | None:
-        return self._category_name_to_id.get(name)
+        with self._lock:
+            category_id = self._category_name_to_id.get(name)
+        if not category_id and self._store:
+            if category_id := self._store.get_category_id(name):
+                with self._lock:
+                    self._add_category(name, category_id)
+        with self._lock:
+            self._count(bool(category_id))
+        return category_id
 
     def get_category_name(self, category_id: str) -> str | None:
-        return self._category_id_to_name.get(category_id)
+        with self._lock:
+            name = self._category_id_to_name.get(category_id)
+        if not name and self._store:
+            if name := self._store.get_category_name(category_id):
+                with self._lock:
+                    self._add_category(name, category_id)
+        with self._lock:
+            self._count(bool(name))
+        return name
 
     def delete_not_existing_categories(self, ids: Collection[str]) -> None:
-        for id_ in self._category_id_to_name.keys() - ids:
-            self.delete_category(id_)
+        with self._lock:
+            for id_ in self._category_id_to_name.keys() - ids:
+                self._delete_category(id_)
+        if self._store:
+            self._store.delete_not_existing_categories(ids)
 
     def delete_category(self, id_: str) -> None:
+        with self._lock:
+            self._delete_category(id_)
+        if self._store:
+            self._store.delete_categories([id_])
+
+    def _delete_category(self, id_: str | None) -> None:
         try:
             name = self._category_id_to_name.pop(id_)
         except KeyError:
@@ -38,37 +137,88 @@ class TagsCache:
             del self._category_name_to_id[name]
 
     def add_tag(self, category_id: str, name: str, tag_id: str) -> None:
+        with self._lock:
+            self._add_tag(category_id, name, tag_id)
+        if self._store:
+            self._store.add_tag(category_id, name, tag_id)
+
+    def _add_tag(self, category_id: str, name: str, tag_id: str) -> None:
+        self._delete_tag(self._tag_name_to_id[category_id].get(name))
         self._tag_name_to_id[category_id][name] = tag_id
         self._tag_id_to_name[tag_id] = (name, category_id)
+        self._tag_id_to_name.move_to_end(tag_id)
+        while len(self._tag_id_to_name) > self.max_tags:
+            oldest_id = next(iter(self._tag_id_to_name))
+            self._delete_tag(oldest_id)
+            self._stats.evictions += 1
 
     def get_tag_id(self, category_id: str, name: str) -> str | None:
-        return self._tag_name_to_id[category_id].get(name)
+        with self._lock:
+            if tag_id := self._tag_name_to_id.get(category_id, {}).get(name):
+                self._tag_id_to_name.move_to_end(tag_id)
+        if not tag_id and self._store:
+            if tag_id := self._store.get_tag_id(category_id, name):
+                with self._lock:
+                    self._add_tag(category_id, name, tag_id)
+        with self._lock:
+            self._count(bool(tag_id))
+        return tag_id
 
     def get_tag_name(self, tag_id: str) -> str | None:
-        name, cid = self._tag_id_to_name.get(tag_id, (None, None))
+        name, cid = self.get_tag_name_and_category_id(tag_id) or (None, None)
         return name
 
     def get_tag_name_and_category_id(self, tag_id: str) -> tuple[str, str] | None:
-        return self._tag_id_to_name.get(tag_id)
+        with self._lock:
+            if tag := self._tag_id_to_name.get(tag_id):
+                self._tag_id_to_name.move_to_end(tag_id)
+        if not tag and self._store:
+            if tag := self._store.get_tag(tag_id):
+                name, category_id = tag
+                with self._lock:
+                    self._add_tag(category_id, name, tag_id)
+        with self._lock:
+            self._count(bool(tag))
+        return tag
 
     def delete_not_existing_tags(self, ids: Collection[str]) -> None:
-        for id_ in self._tag_id_to_name.keys() - ids:
-            self.delete_tag(id_)
+        with self._lock:
+            for id_ in self._tag_id_to_name.keys() - ids:
+                self._delete_tag(id_)
+        if self._store:
+            self._store.delete_not_existing_tags(ids)
 
     def delete_tag(self, id_: str) -> None:
+        with self._lock:
+            self._delete_tag(id_)
+        if self._store:
+            self._store.delete_tags([id_])
+
+    def _delete_tag(self, id_: str | None) -> None:
         try:
             name, cid = self._tag_id_to_name.pop(id_)
         except KeyError:
             pass
         else:
             del self._tag_name_to_id[cid][name]
+            if not self._tag_name_to_id[cid]:
+                del self._tag_name_to_id[cid]
 
 
+_tags_caches_lock = Lock()
 tags_caches: dict[tuple[str, str], TagsCache] = {}  # {(address, username): TagsCache}
 
 
-def get_tags_cache(address: str, user: str) -> TagsCache:
-    if not (tags_cache := tags_caches.get((address, user))):
-        tags_cache = TagsCache()
-        tags_caches[(address, user)] = tags_cache
+def get_tags_cache(address: str, user: str, store_path: str = "") -> TagsCache:
+    """Get the cache for the vCenter user.
+
+    If store_path is set the cache is shared with other processes via the file.
+    """
+    with _tags_caches_lock:
+        if not (tags_cache := tags_caches.get((address, user))):
+            store = None
+            if store_path:
+                store = TagsCacheStore(store_path, f"{user}@{address}")
+            tags_cache = TagsCache(store)
+            tags_caches[(address, user)] = tags_cache
     return tags_cache
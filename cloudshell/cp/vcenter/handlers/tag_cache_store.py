@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import logging
+import sqlite3
+from collections.abc import Callable, Collection, Generator
+from contextlib import contextmanager
+from functools import wraps
+from typing import TypeVar
+
+from attrs import define
+
+logger = logging.getLogger(__name__)
+
+# seconds to wait for a lock held by another driver process
+LOCK_TIMEOUT = 30
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS categories "
+    "(owner TEXT, id TEXT, name TEXT, PRIMARY KEY (owner, id))",
+    "CREATE TABLE IF NOT EXISTS tags "
+    "(owner TEXT, id TEXT, name TEXT, category_id TEXT, PRIMARY KEY (owner, id))",
+    "CREATE TABLE IF NOT EXISTS loads (owner TEXT PRIMARY KEY, loaded_at REAL)",
+)
+R = TypeVar("R")
+
+
+def _ignore_db_errors(fn: Callable[..., R]) -> Callable[..., R | None]:
+    """The store is only an optimization, errors shouldn't break the flow."""
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except sqlite3.Error:
+            logger.warning("Failed to access the tags cache store", exc_info=True)
+            return None
+
+    return wrapper
+
+
+@define
+class TagsCacheStore:
+    """SQLite file that shares tag categories and tags between driver processes.
+
+    Every call opens its own connection and runs in a transaction, SQLite locks
+    the file so concurrent processes see consistent data.
+    """
+
+    _path: str
+    _owner: str  # address and user the entries belong to
+
+    def __attrs_post_init__(self):
+        self._init_db()
+
+    @contextmanager
+    def _transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        conn = sqlite3.connect(self._path, timeout=LOCK_TIMEOUT)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @_ignore_db_errors
+    def _init_db(self) -> None:
+        with self._transaction() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    @_ignore_db_errors
+    def load(self) -> tuple[dict[str, str], dict[str, tuple[str, str]]]:
+        """Get all categories {id: name} and tags {id: (name, category_id)}."""
+        with self._transaction() as conn:
+            categories = conn.execute(
+                "SELECT id, name FROM categories WHERE owner = ?", (self._owner,)
+            )
+            categories = dict(categories.fetchall())
+            tags = conn.execute(
+                "SELECT id, name, category_id FROM tags WHERE owner = ?",
+                (self._owner,),
+            )
+            tags = {id_: (name, cid) for id_, name, cid in tags}
+        return categories, tags
+
+    @_ignore_db_errors
+    def get_loaded_at(self) -> float | None:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT loaded_at FROM loads WHERE owner = ?", (self._owner,)
+            ).fetchone()
+        return row[0] if row else None
+
+    @_ignore_db_errors
+    def set_loaded_at(self, loaded_at: float) -> None:
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO loads VALUES (?, ?)", (self._owner, loaded_at)
+            )
+
+    @_ignore_db_errors
+    def add_category(self, name: str, category_id: str) -> None:
+        with self._transaction() as conn:
+            # category name is unique
+            conn.execute(
+                "DELETE FROM categories WHERE owner = ? AND name = ?",
+                (self._owner, name),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO categories VALUES (?, ?, ?)",
+                (self._owner, category_id, name),
+            )
+
+    @_ignore_db_errors
+    def get_category_id(self, name: str) -> str | None:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM categories WHERE owner = ? AND name = ?",
+                (self._owner, name),
+            ).fetchone()
+        return row[0] if row else None
+
+    @_ignore_db_errors
+    def get_category_name(self, category_id: str) -> str | None:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT name FROM categories WHERE owner = ? AND id = ?",
+                (self._owner, category_id),
+            ).fetchone()
+        return row[0] if row else None
+
+    @_ignore_db_errors
+    def delete_categories(self, ids: Collection[str]) -> None:
+        with self._transaction() as conn:
+            conn.executemany(
+                "DELETE FROM categories WHERE owner = ? AND id = ?",
+                [(self._owner, id_) for id_ in ids],
+            )
+
+    @_ignore_db_errors
+    def delete_not_existing_categories(self, ids: Collection[str]) -> None:
+        with self._transaction() as conn:
+            stored = conn.execute(
+                "SELECT id FROM categories WHERE owner = ?", (self._owner,)
+            )
+            to_delete = {id_ for id_, in stored} - set(ids)
+            conn.executemany(
+                "DELETE FROM categories WHERE owner = ? AND id = ?",
+                [(self._owner, id_) for id_ in to_delete],
+            )
+
+    @_ignore_db_errors
+    def add_tag(self, category_id: str, name: str, tag_id: str) -> None:
+        with self._transaction() as conn:
+            # tag name is unique in the category
+            conn.execute(
+                "DELETE FROM tags WHERE owner = ? AND category_id = ? AND name = ?",
+                (self._owner, category_id, name),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO tags VALUES (?, ?, ?, ?)",
+                (self._owner, tag_id, name, category_id),
+            )
+
+    @_ignore_db_errors
+    def get_tag_id(self, category_id: str, name: str) -> str | None:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT id FROM tags WHERE owner = ? AND category_id = ? AND name = ?",
+                (self._owner, category_id, name),
+            ).fetchone()
+        return row[0] if row else None
+
+    @_ignore_db_errors
+    def get_tag(self, tag_id: str) -> tuple[str, str] | None:
+        """Get tag name and category ID."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT name, category_id FROM tags WHERE owner = ? AND id = ?",
+                (self._owner, tag_id),
+            ).fetchone()
+        return tuple(row) if row else None
+
+    @_ignore_db_errors
+    def delete_tags(self, ids: Collection[str]) -> None:
+        with self._transaction() as conn:
+            conn.executemany(
+                "DELETE FROM tags WHERE owner = ? AND id = ?",
+                [(self._owner, id_) for id_ in ids],
+            )
+
+    @_ignore_db_errors
+    def delete_not_existing_tags(self, ids: Collection[str]) -> None:
+        with self._transaction() as conn:
+            stored = conn.execute("SELECT id FROM tags WHERE owner = ?", (self._owner,))
+            to_delete = {id_ for id_, in stored} - set(ids)
+            conn.executemany(
+                "DELETE FROM tags WHERE owner = ? AND id = ?",
+                [(self._owner, id_) for id_ in to_delete],
+            )
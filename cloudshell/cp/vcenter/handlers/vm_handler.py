@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from collections import Counter
 from contextlib import suppress
 from datetime import datetime
 from enum import Enum
@@ -25,6 +26,7 @@ from cloudshell.cp.vcenter.handlers.managed_entity_handler import (
 from cloudshell.cp.vcenter.handlers.network_handler import (
     DVPortGroupHandler,
     NetworkHandler,
+    elastic_dv_port_group_keys,
     get_network_handler,
 )
 from cloudshell.cp.vcenter.handlers.resource_pool import ResourcePoolHandler
@@ -54,6 +56,9 @@ from cloudshell.cp.vcenter.utils.units_converter import BASE_10
 
 logger = logging.getLogger(__name__)
 
+# extra config option of the VM that is customized on the next power on
+CUSTOMIZATION_PENDING_KEY = "qs.customizationPending"
+
 
 if TYPE_CHECKING:
     from cloudshell.cp.vcenter.handlers.cluster_handler import HostHandler
@@ -178,6 +183,10 @@ class VmHandler(ManagedEntityHandler):
 
         return HostHandler(self._vc_obj.runtime.host, self.si)
 
+    @property
+    def datastores(self) -> list[DatastoreHandler]:
+        return [DatastoreHandler(ds, self.si) for ds in self._vc_obj.datastore]
+
     @property
     def disks_size(self) -> int:
         return sum(d.capacity_in_bytes for d in self.disks)
@@ -227,6 +236,32 @@ class VmHandler(ManagedEntityHandler):
     def power_state(self) -> PowerState:
         return PowerState(self._vc_obj.summary.runtime.powerState)
 
+    @property
+    def is_template(self) -> bool:
+        return bool(self._vc_obj.config.template)
+
+    @property
+    def change_version(self) -> str:
+        return self._vc_obj.config.changeVersion
+
+    @property
+    def created_at(self) -> datetime | None:
+        return self._vc_obj.config.createDate
+
+    @property
+    def modified_at(self) -> datetime:
+        """Last time the VM configuration was changed."""
+        return self._vc_obj.config.modified
+
+    @property
+    def extra_config(self) -> dict[str, str]:
+        return {opt.key: opt.value for opt in self._vc_obj.config.extraConfig}
+
+    @property
+    def customization_pending(self) -> bool:
+        """The customization spec was passed to the clone task."""
+        return bool(self.extra_config.get(CUSTOMIZATION_PENDING_KEY))
+
     @property
     def _class_name(self) -> str:
         return "VM"
@@ -327,6 +362,11 @@ class VmHandler(ManagedEntityHandler):
         task = Task(vc_task)
         task.wait()
 
+    def clear_customization_pending(self) -> None:
+        # empty value removes the option
+        option = vim.option.OptionValue(key=CUSTOMIZATION_PENDING_KEY, value="")
+        self._reconfigure(vim.vm.ConfigSpec(extraConfig=[option]))
+
     def wait_for_customization_ready(self, begin_time: datetime) -> None:
         logger.info(f"Checking for the {self} OS customization events")
         em = EventManager()
@@ -343,11 +383,33 @@ class VmHandler(ManagedEntityHandler):
         self,
         config_spec: ConfigSpecHandler,
         on_task_progress: ON_TASK_PROGRESS_TYPE | None = None,
+        change_version: str | None = None,
+        extra_config: dict[str, str] | None = None,
     ) -> None:
+        """Reconfigure the VM.
+
+        If the change version is set the task fails when the VM was changed
+        after the version was read.
+        """
         logger.debug(f"Reconfiguring the {self} with {config_spec}")
         spec = config_spec.get_spec_for_vm(self)
+        if change_version:
+            spec.changeVersion = change_version
+        if extra_config:
+            spec.extraConfig = [
+                vim.option.OptionValue(key=key, value=value)
+                for key, value in extra_config.items()
+            ]
         self._reconfigure(spec, on_task_progress)
 
+    def rename(
+        self, name: str, on_task_progress: ON_TASK_PROGRESS_TYPE | None = None
+    ) -> None:
+        logger.info(f"Renaming the {self} to '{name}'")
+        vc_task = self._vc_obj.Rename_Task(name)
+        task = Task(vc_task)
+        task.wait(on_progress=on_task_progress)
+
     def create_snapshot(
         self,
         snapshot_name: str,
@@ -425,19 +487,32 @@ class VmHandler(ManagedEntityHandler):
         snapshot: SnapshotHandler | None = None,
         config_spec: ConfigSpecHandler | None = None,
         on_task_progress: ON_TASK_PROGRESS_TYPE | None = None,
+        vm_host: HostHandler | None = None,
+        customization: CustomSpecHandler | None = None,
     ) -> VmHandler:
+        """Clone the VM.
+
+        The customization spec is applied by vCenter on the first power on.
+        """
         logger.info(f"Cloning the {self} to the new VM '{vm_name}'")
-        clone_spec = vim.vm.CloneSpec(powerOn=False)
-        placement = vim.vm.RelocateSpec()
-        placement.datastore = vm_storage.get_vc_obj()
-        if vm_resource_pool:
-            placement.pool = vm_resource_pool.get_vc_obj()
-        if snapshot:
-            clone_spec.snapshot = snapshot.get_vc_obj()
-            clone_spec.template = False
-            placement.diskMoveType = "createNewChildDiskBacking"
-        clone_spec.location = placement
+        clone_spec = self._get_clone_spec(
+            vm_storage, vm_resource_pool, snapshot, vm_host
+        )
+        vnic_networks = {}
+        if config_spec and config_spec.can_be_applied_on_clone(self, bool(snapshot)):
+            # the clone task reconfigures the VM, no need in the second task
+            logger.debug(f"Cloning the {self} with {config_spec}")
+            clone_spec.config = config_spec.get_spec_for_vm(self)
+            vnic_networks = config_spec.vnic_networks
+            config_spec = None
+        if customization:
+            clone_spec.customization = customization.spec.spec
+            clone_spec.config = clone_spec.config or vim.vm.ConfigSpec()
+            clone_spec.config.extraConfig.append(
+                vim.option.OptionValue(key=CUSTOMIZATION_PENDING_KEY, value="true")
+            )
 
+        self._ensure_dv_ports_for_clone(vnic_networks)
         new_vc_vm = self._clone_vm(vm_name, vm_folder, clone_spec, on_task_progress)
         new_vm = VmHandler(new_vc_vm, self.si)
         logger.debug(f"{new_vm} cloned successfully")
@@ -450,8 +525,117 @@ class VmHandler(ManagedEntityHandler):
                 raise
         return new_vm
 
+    def clone_vm_in_bg(
+        self,
+        vm_name: str,
+        vm_storage: DatastoreHandler,
+        vm_folder: FolderHandler,
+        vm_resource_pool: ResourcePoolHandler | None = None,
+        snapshot: SnapshotHandler | None = None,
+    ) -> Task:
+        """Start cloning the VM without waiting, vCenter completes the task."""
+        logger.info(f"Start cloning the {self} to the new VM '{vm_name}'")
+        clone_spec = self._get_clone_spec(vm_storage, vm_resource_pool, snapshot)
+        self._ensure_dv_ports_for_clone()
+        vc_task = self._vc_obj.Clone(
+            folder=vm_folder.get_vc_obj(), name=vm_name, spec=clone_spec
+        )
+        return Task(vc_task)
+
+    @staticmethod
+    def _get_clone_spec(
+        vm_storage: DatastoreHandler,
+        vm_resource_pool: ResourcePoolHandler | None = None,
+        snapshot: SnapshotHandler | None = None,
+        vm_host: HostHandler | None = None,
+    ) -> vim.vm.CloneSpec:
+        clone_spec = vim.vm.CloneSpec(powerOn=False)
+        placement = vim.vm.RelocateSpec()
+        placement.datastore = vm_storage.get_vc_obj()
+        if vm_resource_pool:
+            placement.pool = vm_resource_pool.get_vc_obj()
+        if vm_host:
+            placement.host = vm_host.get_vc_obj()
+        if snapshot:
+            clone_spec.snapshot = snapshot.get_vc_obj()
+            clone_spec.template = False
+            placement.diskMoveType = "createNewChildDiskBacking"
+        clone_spec.location = placement
+        return clone_spec
+
+    def instant_clone(
+        self,
+        vm_name: str,
+        vm_storage: DatastoreHandler,
+        vm_folder: FolderHandler,
+        vm_resource_pool: ResourcePoolHandler | None = None,
+        guest_info: dict[str, str] | None = None,
+        on_task_progress: ON_TASK_PROGRESS_TYPE | None = None,
+    ) -> VmHandler:
+        """Create running VM that shares memory and disks of this running VM."""
+        logger.info(f"Instant cloning the {self} to the new VM '{vm_name}'")
+        if self.power_state is not PowerState.ON:
+            raise VmIsNotPowered(self)
+
+        location = vim.vm.RelocateSpec()
+        location.folder = vm_folder.get_vc_obj()
+        location.datastore = vm_storage.get_vc_obj()
+        if vm_resource_pool:
+            location.pool = vm_resource_pool.get_vc_obj()
+        clone_spec = vim.vm.InstantCloneSpec(name=vm_name, location=location)
+        clone_spec.config = [
+            vim.option.OptionValue(key=key, value=value)
+            for key, value in (guest_info or {}).items()
+        ]
+
+        self._ensure_dv_ports_for_clone()
+        vc_task = self._vc_obj.InstantClone_Task(spec=clone_spec)
+        task = Task(vc_task)
+        new_vm = VmHandler(task.wait(on_progress=on_task_progress), self.si)
+        logger.debug(f"{new_vm} instant cloned successfully")
+        return new_vm
+
+    def _ensure_dv_ports_for_clone(
+        self,
+        vnic_networks: dict[str, NetworkHandler | DVPortGroupHandler] | None = None,
+    ) -> None:
+        """Grow DV port groups of the vNICs so the clone can get its ports.
+
+        vNIC networks are the ones that vNICs of the clone are connected to on
+        clone, such vNICs don't take ports of the source port groups.
+        Port groups known to be elastic are skipped without loading them.
+        """
+        vnic_networks = vnic_networks or {}
+        dvs_backing = (
+            vim.vm.device.VirtualEthernetCard.DistributedVirtualPortBackingInfo
+        )
+        vc_uuid = self.si.instance_uuid
+        pg_keys = Counter()
+        for vnic in self.vnics:
+            if any(is_correct_vnic(name, vnic) for name in vnic_networks):
+                continue  # the clone's vNIC is reconnected to another network
+            backing = vnic.get_vc_obj().backing
+            if isinstance(backing, dvs_backing):
+                pg_key = backing.port.portgroupKey
+                if (vc_uuid, pg_key) not in elastic_dv_port_group_keys:
+                    pg_keys[pg_key] += 1
+        if pg_keys:
+            for pg in self.dv_port_groups:
+                if count := pg_keys.get(pg.key):
+                    pg.ensure_free_ports(count)
+
+        target_pgs = {}
+        target_pg_keys = Counter()
+        for network in vnic_networks.values():
+            if isinstance(network, DVPortGroupHandler):
+                target_pgs[network.key] = network
+                target_pg_keys[network.key] += 1
+        for key, count in target_pg_keys.items():
+            target_pgs[key].ensure_free_ports(count)
+
     @staticmethod
     def _rerun_clone_vm(e: Exception) -> bool:
+        # ports of the port group can be taken by another clone in the meantime
         return isinstance(e, TaskFailed) and "cannot create dvport " in str(e)
 
     @retrying.retry(
@@ -104,10 +104,7 @@ class Vnic(VirtualDevice):
         return ipv6
 
     def connect(self, network: NetworkHandler | DVPortGroupHandler) -> None:
-        if isinstance(network, NetworkHandler):
-            nic_spec = self._create_spec_for_connecting_network(network)
-        else:
-            nic_spec = self._create_spec_for_connecting_dv_port_group(network)
+        nic_spec = self.get_connect_spec(network)
         config_spec = vim.vm.ConfigSpec(deviceChange=[nic_spec])
         self.vm._reconfigure(config_spec)
 
@@ -116,6 +113,14 @@ class Vnic(VirtualDevice):
             assert vnic.network == network
             self._vc_obj = vnic.get_vc_obj()
 
+    def get_connect_spec(
+        self, network: NetworkHandler | DVPortGroupHandler
+    ) -> vim.vm.device.VirtualDeviceSpec:
+        """Device spec that connects the vNIC to the network."""
+        if isinstance(network, NetworkHandler):
+            return self._create_spec_for_connecting_network(network)
+        return self._create_spec_for_connecting_dv_port_group(network)
+
     def is_connected_to_network(self, network: AbstractNetwork) -> bool:
         result = False
         if isinstance(network, NetworkHandler):
@@ -114,6 +114,17 @@ class NotEnoughPrivilegesAttachTagsToObject(NotEnoughPrivileges):
         )
 
 
+class NotEnoughPrivilegesAttachTagToObjects(NotEnoughPrivileges):
+    def __init__(self, tag_id: str, objects: list[tuple[str, str]]):
+        self.tag_id = tag_id
+        self.objects = objects
+        objects_str = ", ".join(f"'{type_}' '{id_}'" for id_, type_ in objects)
+        super().__init__(
+            f"Cannot attach the tag '{tag_id}' to the objects {objects_str}. "
+            f"Not enough privileges."
+        )
+
+
 class EntityDoesntExists(TagApiException):
     """The entity doesn't exist."""
 
@@ -349,11 +360,15 @@ class VSphereAutomationAPI(BaseAPIClient):
         }
         return self._do_get(path=f"tagging/tag/id:{tag_id}", http_error_map=error_map)
 
+    @Decorators.get_data
     def attach_multiple_tags_to_object(
         self, obj_id: str, obj_type: str, tag_ids: list[str]
-    ) -> None:
+    ):
         """Attaches the given tags to the input object.
 
+        Returns the batch result, it isn't successful if any tag wasn't attached,
+        e.g. it doesn't exist.
+
         Note: you need the read privilege on the object and
               the attach tag privilege on each tag.
         """
@@ -365,12 +380,39 @@ class VSphereAutomationAPI(BaseAPIClient):
             401: UserCannotBeAuthenticated,
             403: NotEnoughPrivilegesAttachTagsToObject(obj_id, obj_type),
         }
-        self._do_post(
+        return self._do_post(
             path="tagging/tag-association?~action=attach-multiple-tags-to-object",
             json=create_association,
             http_error_map=error_map,
         )
 
+    def attach_tag_to_multiple_objects(
+        self, tag_id: str, objects: list[tuple[str, str]]
+    ) -> None:
+        """Attaches the given tag to the input objects [(obj_id, obj_type)].
+
+        Note: you need the read privilege on the objects and
+              the attach tag privilege on the tag.
+        """
+        create_association = {
+            "object_ids": [
+                {"id": obj_id, "type": obj_type} for obj_id, obj_type in objects
+            ],
+        }
+        error_map = {
+            401: UserCannotBeAuthenticated,
+            403: NotEnoughPrivilegesAttachTagToObjects(tag_id, objects),
+            404: TagIdDoesntExists(tag_id),
+        }
+        self._do_post(
+            path=(
+                f"tagging/tag-association/id:{tag_id}"
+                "?~action=attach-tag-to-multiple-objects"
+            ),
+            json=create_association,
+            http_error_map=error_map,
+        )
+
     @Decorators.get_data
     @retry(
         wait_random_min=2 * 1000,
@@ -397,6 +439,28 @@ class VSphereAutomationAPI(BaseAPIClient):
             http_error_map=error_map,
         )
 
+    @Decorators.get_data
+    def list_attached_tags_on_objects(self, objects: list[tuple[str, str]]):
+        """Get the list of tags attached to every given object [(obj_id, obj_type)].
+
+        Note: objects that don't exist or you cannot read are omitted.
+              The lists will only contain those tags
+              for which you have the read privileges.
+        """
+        error_map = {
+            401: UserCannotBeAuthenticated,
+        }
+        get_associations = {
+            "object_ids": [
+                {"id": obj_id, "type": obj_type} for obj_id, obj_type in objects
+            ],
+        }
+        return self._do_post(
+            path="tagging/tag-association?~action=list-attached-tags-on-objects",
+            json=get_associations,
+            http_error_map=error_map,
+        )
+
     @Decorators.get_data
     @retry(
         wait_random_min=2 * 1000,
@@ -420,6 +484,29 @@ class VSphereAutomationAPI(BaseAPIClient):
             http_error_map=error_map,
         )
 
+    @Decorators.get_data
+    @retry(
+        wait_random_min=2 * 1000,
+        wait_random_max=8 * 1000,
+        stop_max_delay=60 * 1000,
+        retry_on_exception=lambda e: isinstance(e, NotEnoughPrivilegesReadTag),
+    )
+    def list_attached_objects_on_tags(self, tag_ids: list[str]):
+        """Get the list of attached objects for every given tag.
+
+        Note: you need the read privilege on the input tags.
+              Tags that don't exist or you cannot read are omitted.
+        """
+        error_map = {
+            401: UserCannotBeAuthenticated,
+            403: NotEnoughPrivilegesReadTag,
+        }
+        return self._do_post(
+            path="tagging/tag-association?~action=list-attached-objects-on-tags",
+            json={"tag_ids": tag_ids},
+            http_error_map=error_map,
+        )
+
     def delete_tag(self, tag_id: str) -> None:
         """Deletes an existing tag.
 
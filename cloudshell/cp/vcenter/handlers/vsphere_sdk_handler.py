@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import logging
 import time
-from collections.abc import Collection
-from typing import Union
+from collections.abc import Callable, Collection, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar, Union
 
 from attrs import define, field
 from packaging import version
@@ -36,12 +37,29 @@ from cloudshell.cp.vcenter.resource_config import VCenterResourceConfig
 logger = logging.getLogger(__name__)
 
 OBJECTS_WITH_TAGS = Union[VmHandler, FolderHandler, NetworkHandler, DVPortGroupHandler]
+T = TypeVar("T")
+R = TypeVar("R")
+# number of concurrent requests when loading tags info
+MAX_LOAD_WORKERS = 10
+# number of background tagging tasks, tags are attached after they're created
+MAX_TAGGING_WORKERS = 4
+# all categories and tags are reloaded to the cache after this time
+TAGS_CACHE_TTL = 60 * 60
+# max number of tags in one request
+TAGS_BATCH_SIZE = 100
+# seconds between checks of the used tags before deleting them
+DELETE_TAGS_MIN_DELAY = 0.5
+DELETE_TAGS_MAX_DELAY = 4
+
+# background tagging is shared by handlers of all commands in the process
+_tagging_executor = ThreadPoolExecutor(MAX_TAGGING_WORKERS, "tagging")
 
 
 @define
 class VSphereSDKHandler:
     _vsphere_client: VSphereAutomationAPI
     _tags_manager: VCenterTagsManager | None
+    _tags_cache_path: str = ""
     _cache: TagsCache = field(init=False)
 
     # From this version vCenter has vSphere Automation API that allows to work with tags
@@ -58,7 +76,9 @@ class VSphereSDKHandler:
 
     def __attrs_post_init__(self):
         self._cache = get_tags_cache(
-            self._vsphere_client.address, self._vsphere_client.username
+            self._vsphere_client.address,
+            self._vsphere_client.username,
+            self._tags_cache_path,
         )
 
     @classmethod
@@ -85,7 +105,7 @@ class VSphereSDKHandler:
                 )
             else:
                 tags_manager = None
-            return cls(vsphere_client, tags_manager)
+            return cls(vsphere_client, tags_manager, resource_config.tags_cache_path)
         else:
             logger.warning(f"Tags available only from vCenter {cls.VCENTER_VERSION}")
             return None
@@ -100,16 +120,35 @@ class VSphereSDKHandler:
         vsphere_client.connect()
         return cls(vsphere_client, None)
 
+    def preload_cache(self, force: bool = False) -> None:
+        """Load all categories and tags to the cache with concurrent requests.
+
+        Runs once per process or when the cache is older than TAGS_CACHE_TTL.
+        """
+        with self._cache.load_lock:
+            if not force and self._cache.is_loaded(TAGS_CACHE_TTL):
+                return
+
+            logger.info("Loading all tag categories and tags to the cache")
+            tag_ids = set()
+            categories = self._get_all_categories()
+            tags_per_category = _map_concurrently(
+                self._vsphere_client.get_all_category_tags, categories.values()
+            )
+            for category_tag_ids in tags_per_category:
+                tag_ids.update(category_tag_ids)
+            _map_concurrently(self.get_tag_name, tag_ids)
+            self._cache.delete_not_existing_tags(tag_ids)
+            self._cache.set_loaded()
+            logger.info(f"Tags cache is loaded, {self._cache.stats}")
+
     def _get_all_categories(self) -> dict[str:str]:
         """Get all existing categories."""
         logger.debug("List of all existing categories user has access to...")
-        result: dict[str, str] = {}  # {name: id}
         categories = self._vsphere_client.get_category_list()
-        for category_id in categories:
-            if name := self.get_category_name(category_id):
-                logger.debug(f"CategoryName: {name}, CategoryID: {category_id}")
-                result[name] = category_id
-        else:
+        names = _map_concurrently(self.get_category_name, categories)
+        result = {name: id_ for id_, name in zip(categories, names) if name}
+        if not result:
             logger.info("No Tag Category Found...")
         self._cache.delete_not_existing_categories(result.values())
         return result
@@ -131,6 +170,7 @@ class VSphereSDKHandler:
                 category_info = self._vsphere_client.get_category_info(id_)
             except CategoryIdDoesntExists:
                 name = None
+                self._cache.delete_category(id_)
             else:
                 name = category_info["name"]
                 self._cache.add_category(name, id_)
@@ -141,6 +181,9 @@ class VSphereSDKHandler:
 
         Note: User who invokes this needs create category privilege
         """
+        if category_id := self._cache.get_category_id(name):
+            return category_id
+
         try:
             category_id = self._vsphere_client.create_category(name)
         except CategoryAlreadyExists:
@@ -165,15 +208,11 @@ class VSphereSDKHandler:
     def _get_all_tags(self, category_id: str) -> dict[str:str]:
         """Get all existing tags for the given category."""
         logger.debug("List of all existing tags user has access to...")
-        result: dict[str, str] = {}  # {name: id}
         tags = self._vsphere_client.get_all_category_tags(category_id=category_id)
-        for tag_id in tags:
-            if name := self.get_tag_name(tag_id):
-                logger.debug(f"TagName: {name}, TagID: {tag_id}")
-                result[name] = tag_id
-        else:
+        names = _map_concurrently(self.get_tag_name, tags)
+        result = {name: id_ for id_, name in zip(tags, names) if name}
+        if not result:
             logger.info("No Tag Found...")
-        self._cache.delete_not_existing_tags(result.values())
         return result
 
     def _get_tag_id(self, name: str, category_id: str) -> str:
@@ -191,6 +230,7 @@ class VSphereSDKHandler:
                 tag_info = self._vsphere_client.get_tag_info(id_)
             except TagIdDoesntExists:
                 name = None  # tag already removed
+                self._cache.delete_tag(id_)
             else:
                 name = tag_info["name"]
                 self._cache.add_tag(tag_info["category_id"], name, id_)
@@ -200,8 +240,13 @@ class VSphereSDKHandler:
         stop_max_attempt_number=5,
         retry_on_exception=lambda e: isinstance(e, TagNameDoesntExists),
     )  # there is small chance that tag can be deleted while we're finding it by name
-    def _get_or_create_tag(self, name: str, category_id: str) -> str:
-        """Create a Tag."""
+    def _get_or_create_tag(
+        self, name: str, category_id: str, created: set[str] | None = None
+    ) -> str:
+        """Create a Tag or return an existing one, created tags are collected."""
+        if tag_id := self._cache.get_tag_id(category_id, name):
+            return tag_id
+
         try:
             tag_id = self._vsphere_client.create_tag(name=name, category_id=category_id)
             if tag_id is None:
@@ -211,32 +256,118 @@ class VSphereSDKHandler:
             tag_id = self._get_tag_id(name, category_id=category_id)
         else:
             self._cache.add_tag(category_id, name, tag_id)
+            if created is not None:
+                created.add(tag_id)
         return tag_id
 
     def _create_multiple_tag_association(
         self, obj: OBJECTS_WITH_TAGS, tag_ids: list[str]
     ) -> None:
-        """Attach tags."""
+        """Attach tags.
+
+        The batch fails if any cached tag was removed, the tags are attached
+        one by one then, so removed tags are recreated.
+        """
         object_id, object_type = self._get_object_id_and_type(obj)
-        self._vsphere_client.attach_multiple_tags_to_object(
+        result = self._vsphere_client.attach_multiple_tags_to_object(
             tag_ids=tag_ids, obj_id=object_id, obj_type=object_type
         )
+        if not result["success"]:
+            logger.info(
+                f"Failed to attach tags to the object {object_id}, attaching them "
+                f"one by one. Errors: {result['error_messages']}"
+            )
+            for tag_id in tag_ids:
+                self._create_multiple_object_association([obj], tag_id)
 
-    def assign_tags(
-        self, obj: OBJECTS_WITH_TAGS, tags: dict[str:str] | None = None
+    def _create_multiple_object_association(
+        self, objs: list[OBJECTS_WITH_TAGS], tag_id: str
     ) -> None:
-        """Get/Create tags and assign to provided vCenter object."""
+        """Attach the tag to all objects, the removed tag is recreated once."""
+        objects = [self._get_object_id_and_type(obj) for obj in objs]
+        try:
+            self._vsphere_client.attach_tag_to_multiple_objects(
+                tag_id=tag_id, objects=objects
+            )
+        except TagIdDoesntExists:
+            tag_id = self._recreate_tag(tag_id)
+            self._vsphere_client.attach_tag_to_multiple_objects(
+                tag_id=tag_id, objects=objects
+            )
+
+    def _recreate_tag(self, tag_id: str) -> str:
+        """The cached tag was removed, e.g. by another process, create it again."""
+        name_and_category_id = self._cache.get_tag_name_and_category_id(tag_id)
+        self._cache.delete_tag(tag_id)
+        if not name_and_category_id:
+            raise TagIdDoesntExists(tag_id)
+
+        name, category_id = name_and_category_id
+        if not (category_name := self.get_category_name(category_id)):
+            raise TagIdDoesntExists(tag_id)
+        logger.info(f"Tag {name} was removed, creating it again")
+        return self.get_or_create_tag_ids({category_name: name})[0]
+
+    def get_or_create_tag_ids(
+        self, tags: dict[str:str] | None = None, created: set[str] | None = None
+    ) -> list[str]:
+        """Get/Create tags, default tags are used if tags are not provided.
+
+        IDs of the tags created by this call are added to created.
+        """
         if not tags:
             tags = self._tags_manager.get_default_tags()
         tags = _normalize_tags(tags)
+        self.preload_cache()
 
         tag_ids = []
         for category_name, tag in tags.items():
             category_id = self._get_or_create_tag_category(name=category_name)
-            tag_id = self._get_or_create_tag(name=tag, category_id=category_id)
+            try:
+                tag_id = self._get_or_create_tag(tag, category_id, created)
+            except CategoryIdDoesntExists:
+                # category was removed, the ID is stale in the cache
+                self._cache.delete_category(category_id)
+                category_id = self._get_or_create_tag_category(name=category_name)
+                tag_id = self._get_or_create_tag(tag, category_id, created)
             tag_ids.append(tag_id)
+        return tag_ids
+
+    def assign_tags(
+        self, obj: OBJECTS_WITH_TAGS, tags: dict[str:str] | None = None
+    ) -> None:
+        """Get/Create tags and assign to provided vCenter object."""
+        self.assign_tags_to_objects([obj], tags)
+
+    def assign_tags_to_objects(
+        self, objs: list[OBJECTS_WITH_TAGS], tags: dict[str:str] | None = None
+    ) -> None:
+        """Get/Create tags and assign them to all provided vCenter objects.
 
-        self._create_multiple_tag_association(obj=obj, tag_ids=tag_ids)
+        Uses one request per object or one request per tag, whichever is less.
+        """
+        self.attach_tags(objs, self.get_or_create_tag_ids(tags))
+
+    def get_or_create_tag_ids_in_bg(
+        self, tags: dict[str:str] | None = None, created: set[str] | None = None
+    ) -> Future[list[str]]:
+        return _tagging_executor.submit(self.get_or_create_tag_ids, tags, created)
+
+    def attach_tags_in_bg(
+        self, objs: list[OBJECTS_WITH_TAGS], tag_ids: Future[list[str]]
+    ) -> Future[None]:
+        """Attach tags when they are created, the future fails if tagging failed."""
+        return _tagging_executor.submit(
+            lambda: self.attach_tags(objs, tag_ids.result())
+        )
+
+    def attach_tags(self, objs: list[OBJECTS_WITH_TAGS], tag_ids: list[str]) -> None:
+        if len(objs) <= len(tag_ids):
+            for obj in objs:
+                self._create_multiple_tag_association(obj=obj, tag_ids=tag_ids)
+        else:
+            for tag_id in tag_ids:
+                self._create_multiple_object_association(objs=objs, tag_id=tag_id)
 
     def get_attached_tags(self, obj: OBJECTS_WITH_TAGS) -> list[str]:
         """Determine all tags attached to vCenter object."""
@@ -246,22 +377,51 @@ class VSphereSDKHandler:
         )
         return tag_ids
 
+    def get_attached_tags_on_objects(self, objs: list[OBJECTS_WITH_TAGS]) -> set[str]:
+        """Determine all tags attached to any of vCenter objects."""
+        objects = [self._get_object_id_and_type(obj) for obj in objs]
+        tag_ids = set()
+        for i in range(0, len(objects), TAGS_BATCH_SIZE):
+            batch = objects[i : i + TAGS_BATCH_SIZE]
+            associations = self._vsphere_client.list_attached_tags_on_objects(batch)
+            for association in associations:
+                tag_ids.update(association["tag_ids"])
+        return tag_ids
+
     def delete_unused_tags(self, tags: Collection[str], wait: float = 15) -> list[str]:
-        """Remove tags that are not used in any vCenter object."""
-        remained_tags = list(tags)
+        """Remove tags that are not used in any vCenter object.
+
+        Attachments of all tags are checked in batches, free tags are deleted
+        concurrently, used tags are re-checked with exponential backoff.
+        Tags that vCenter omits from the attachments, e.g. ones the user can't
+        read, are not deleted.
+        Returns tags that are still used or not checked, in the given order.
+        """
+        remained_tags = list(dict.fromkeys(tags))
         exit_time = time.time() + wait
-        time_remains = True
-        while remained_tags and time_remains:
-            for tag in remained_tags[:]:
-                try:
-                    if not self._vsphere_client.list_attached_objects(tag):
-                        self._delete_tag(tag)
-                        remained_tags.remove(tag)
-                except TagIdDoesntExists:
-                    remained_tags.remove(tag)
-            time_remains = time.time() < exit_time
+        delay = DELETE_TAGS_MIN_DELAY
+        while remained_tags:
+            unused_tags = self._get_unused_tags(remained_tags)
+            _map_concurrently(self._delete_tag, unused_tags)
+            remained_tags = [tag for tag in remained_tags if tag not in unused_tags]
+
+            if not remained_tags or time.time() + delay > exit_time:
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, DELETE_TAGS_MAX_DELAY)
         return remained_tags
 
+    def _get_unused_tags(self, tags: list[str]) -> set[str]:
+        """Tags that are returned without attached objects."""
+        unused_tags = set()
+        for i in range(0, len(tags), TAGS_BATCH_SIZE):
+            batch = tags[i : i + TAGS_BATCH_SIZE]
+            attachments = self._vsphere_client.list_attached_objects_on_tags(batch)
+            for attachment in attachments:
+                if not attachment["object_ids"]:
+                    unused_tags.add(attachment["tag_id"])
+        return unused_tags
+
     def _delete_tag(self, tag_id: str) -> None:
         """Delete an existing tag.
 
@@ -286,3 +446,11 @@ def _normalize_tags(tags: dict[str, str]) -> dict[str, str]:
     vCenter automatically removes whitespaces from tag names.
     """
     return {key: value.strip() for key, value in tags.items()}
+
+
+def _map_concurrently(fn: Callable[[T], R], items: Iterable[T]) -> list[R]:
+    items = list(items)
+    if len(items) <= 1:
+        return list(map(fn, items))
+    with ThreadPoolExecutor(min(len(items), MAX_LOAD_WORKERS)) as executor:
+        return list(executor.map(fn, items))
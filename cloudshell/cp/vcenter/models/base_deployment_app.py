@@ -29,6 +29,7 @@ class VCenterDeploymentAppAttributeNames:
     hdd_specs = "HDD"
     autogenerated_name = "Autogenerated Name"
     copy_source_uuid = "Copy source UUID"
+    vnic_networks = "vNIC Networks"
 
 
 class StaticVCenterDeploymentAppAttributeNames:
@@ -44,6 +45,7 @@ class VCenterVMFromTemplateDeploymentAppAttributeNames(
     VCenterDeploymentAppAttributeNames
 ):
     vcenter_template = "vCenter Template"
+    linked_clone = "Linked Clone"
 
 
 class VCenterVMFromCloneDeployAppAttributeNames(
@@ -52,6 +54,12 @@ class VCenterVMFromCloneDeployAppAttributeNames(
     vcenter_vm_snapshot = "vCenter VM Snapshot"
 
 
+class VCenterVMFromInstantCloneDeployAppAttributeNames(
+    VCenterVMFromVMDeploymentAppAttributeNames
+):
+    guest_info = "Guest Info"
+
+
 class VCenterVMFromImageDeploymentAppAttributeNames(VCenterDeploymentAppAttributeNames):
     vcenter_image = "vCenter Image"
     vcenter_image_arguments = "vCenter Image Arguments"
@@ -111,6 +119,23 @@ class IncorrectHddSpecFormat(BaseVCenterException):
         )
 
 
+class IncorrectGuestInfoFormat(BaseVCenterException):
+    def __init__(self, text: str):
+        self.text = text
+        super().__init__(
+            f"'{text}' is not a valid Guest Info format. Should be Key=Value"
+        )
+
+
+class IncorrectVnicNetworkFormat(BaseVCenterException):
+    def __init__(self, text: str):
+        self.text = text
+        super().__init__(
+            f"'{text}' is not a valid vNIC Network format. Should be "
+            f"vNIC Label: Network Name"
+        )
+
+
 class ResourceIntAttrRODeploymentPath(ResourceAttrRODeploymentPath):
     def __get__(self, instance, owner) -> int:
         val = super().__get__(instance, owner)
@@ -135,6 +160,44 @@ class HddSpecsAttrRO(ResourceListAttrRODeploymentPath):
         return val
 
 
+class GuestInfoAttrRO(ResourceListAttrRODeploymentPath):
+    """Guest info variables, keys are prefixed with 'guestinfo.' if needed."""
+
+    PREFIX = "guestinfo."
+
+    def __get__(self, instance, owner) -> dict[str, str]:
+        val = super().__get__(instance, owner)
+        if isinstance(val, list):
+            val = dict(map(self._parse, val))
+        return val
+
+    def _parse(self, text: str) -> tuple[str, str]:
+        key, sep, value = text.partition("=")
+        key = key.strip()
+        if not sep or not key:
+            raise IncorrectGuestInfoFormat(text)
+        if not key.startswith(self.PREFIX):
+            key = f"{self.PREFIX}{key}"
+        return key, value.strip()
+
+
+class VnicNetworksAttrRO(ResourceListAttrRODeploymentPath):
+    """Networks that vNICs are connected to on deploy, {vNIC: network name}."""
+
+    def __get__(self, instance, owner) -> dict[str, str]:
+        val = super().__get__(instance, owner)
+        if isinstance(val, list):
+            val = dict(map(self._parse, val))
+        return val
+
+    @staticmethod
+    def _parse(text: str) -> tuple[str, str]:
+        vnic, sep, network = map(str.strip, text.partition(":"))
+        if not sep or not vnic or not network:
+            raise IncorrectVnicNetworkFormat(text)
+        return vnic, network
+
+
 @define
 class HddSpec:
     num: int
@@ -255,8 +255,10 @@ def is_not_empty(val) -> bool:
 
 def get_custom_spec_params_class(
     vm: VmHandler,
+    guest_id: str | None = None,
 ) -> type[WindowsCustomizationSpecParams | LinuxCustomizationSpecParams]:
-    spec_type = SpecType.from_os_name(vm.guest_id)
+    """Get params class by the VM OS, guest_id is used if it's already known."""
+    spec_type = SpecType.from_os_name(guest_id or vm.guest_id)
     if spec_type is spec_type.WINDOWS:
         return WindowsCustomizationSpecParams
     else:
@@ -266,10 +268,11 @@ def get_custom_spec_params_class(
 def get_custom_spec_params(
     deploy_app: BaseVCenterDeployApp,
     vm: VmHandler,
+    guest_id: str | None = None,
 ) -> WindowsCustomizationSpecParams | LinuxCustomizationSpecParams | None:
     custom_spec = None
     if deploy_app.hostname or deploy_app.private_ip:
-        class_ = get_custom_spec_params_class(vm)
+        class_ = get_custom_spec_params_class(vm, guest_id)
         custom_spec = class_.from_deploy_app_model(deploy_app)
     return custom_spec
 
@@ -5,6 +5,7 @@ from cloudshell.cp.core.request_actions.models import DeployApp
 
 from cloudshell.cp.vcenter import constants
 from cloudshell.cp.vcenter.models.base_deployment_app import (
+    GuestInfoAttrRO,
     HddSpecsAttrRO,
     ResourceAttrRODeploymentPath,
     ResourceBoolAttrRODeploymentPath,
@@ -14,8 +15,10 @@ from cloudshell.cp.vcenter.models.base_deployment_app import (
     VCenterDeploymentAppAttributeNames,
     VCenterVMFromCloneDeployAppAttributeNames,
     VCenterVMFromImageDeploymentAppAttributeNames,
+    VCenterVMFromInstantCloneDeployAppAttributeNames,
     VCenterVMFromTemplateDeploymentAppAttributeNames,
     VCenterVMFromVMDeploymentAppAttributeNames,
+    VnicNetworksAttrRO,
 )
 
 
@@ -43,6 +46,7 @@ class BaseVCenterDeployApp(DeployApp):
     hdd_specs = HddSpecsAttrRO(ATTR_NAMES.hdd_specs)
     autogenerated_name = ResourceBoolAttrRODeploymentPath(ATTR_NAMES.autogenerated_name)
     copy_source_uuid = ResourceBoolAttrRODeploymentPath(ATTR_NAMES.copy_source_uuid)
+    vnic_networks = VnicNetworksAttrRO(ATTR_NAMES.vnic_networks)
 
 
 class VMFromTemplateDeployApp(BaseVCenterDeployApp):
@@ -50,6 +54,7 @@ class VMFromTemplateDeployApp(BaseVCenterDeployApp):
 
     DEPLOYMENT_PATH = constants.VM_FROM_TEMPLATE_DEPLOYMENT_PATH
     vcenter_template = ResourceAttrRODeploymentPath(ATTR_NAMES.vcenter_template)
+    linked_clone = ResourceBoolAttrRODeploymentPath(ATTR_NAMES.linked_clone, False)
 
 
 class VMFromImageDeployApp(BaseVCenterDeployApp):
@@ -76,5 +81,12 @@ class VMFromLinkedCloneDeployApp(VMFromVMDeployApp):
     vcenter_vm_snapshot = ResourceAttrRODeploymentPath(ATTR_NAMES.vcenter_vm_snapshot)
 
 
+class VMFromInstantCloneDeployApp(VMFromVMDeployApp):
+    ATTR_NAMES = VCenterVMFromInstantCloneDeployAppAttributeNames
+
+    DEPLOYMENT_PATH = constants.VM_FROM_INSTANT_CLONE_DEPLOYMENT_PATH
+    guest_info = GuestInfoAttrRO(ATTR_NAMES.guest_info)
+
+
 class VCenterDeployVMRequestActions(DeployVMRequestActions):
     deploy_app: BaseVCenterDeployApp
@@ -6,6 +6,7 @@ from cloudshell.cp.core.request_actions.models import DeployedApp
 
 from cloudshell.cp.vcenter import constants
 from cloudshell.cp.vcenter.models.base_deployment_app import (
+    GuestInfoAttrRO,
     HddSpecsAttrRO,
     ResourceAttrRODeploymentPath,
     ResourceBoolAttrRODeploymentPath,
@@ -16,6 +17,7 @@ from cloudshell.cp.vcenter.models.base_deployment_app import (
     VCenterDeploymentAppAttributeNames,
     VCenterVMFromCloneDeployAppAttributeNames,
     VCenterVMFromImageDeploymentAppAttributeNames,
+    VCenterVMFromInstantCloneDeployAppAttributeNames,
     VCenterVMFromTemplateDeploymentAppAttributeNames,
     VCenterVMFromVMDeploymentAppAttributeNames,
 )
@@ -89,6 +91,13 @@ class VMFromLinkedCloneDeployedApp(VMFromVMDeployedApp):
     vcenter_vm_snapshot = ResourceAttrRODeploymentPath(ATTR_NAMES.vcenter_vm_snapshot)
 
 
+class VMFromInstantCloneDeployedApp(VMFromVMDeployedApp):
+    ATTR_NAMES = VCenterVMFromInstantCloneDeployAppAttributeNames
+
+    DEPLOYMENT_PATH = constants.VM_FROM_INSTANT_CLONE_DEPLOYMENT_PATH
+    guest_info = GuestInfoAttrRO(ATTR_NAMES.guest_info)
+
+
 class StaticVCenterDeployedApp(DeployedApp):
     ATTR_NAMES = StaticVCenterDeploymentAppAttributeNames
 
@@ -44,6 +44,16 @@ class VCenterAttributeNames:
     forged_transmits = "Forged Transmits"
     mac_changes = "MAC Address Changes"
     enable_tags = "Enable Tags"
+    port_group_pool_size = "Port Group Pool Size"
+    tags_cache_path = "Tags Cache Path"
+    max_clones_per_source_datastore = "Max Clones Per Source Datastore"
+    max_clones_per_target_datastore = "Max Clones Per Target Datastore"
+    max_clones_per_host = "Max Clones Per Host"
+    load_aware_host_placement = "Load Aware Host Placement"
+    vm_pool_size = "VM Pool Size"
+    customize_on_clone = "Customize On Clone"
+    template_replicas = "Template Replicas"
+    max_deploy_workers = "Max Deploy Workers"
 
 
 @define(slots=False, str=False)
@@ -63,12 +73,39 @@ class VCenterResourceConfig(BaseConfig):
     behavior_during_save: str = attr(ATTR_NAMES.behavior_during_save)
     vm_location: str = attr(ATTR_NAMES.vm_location)
     shutdown_method: ShutdownMethod = attr(ATTR_NAMES.shutdown_method)
+    # not used, images are imported by the driver itself
     ovf_tool_path: str = attr(ATTR_NAMES.ovf_tool_path)
     reserved_networks: list[str] = attr(ATTR_NAMES.reserved_networks)
     promiscuous_mode: bool = attr(ATTR_NAMES.promiscuous_mode)
     forged_transmits: bool = attr(ATTR_NAMES.forged_transmits)
     mac_changes: bool = attr(ATTR_NAMES.mac_changes)
     enable_tags: bool = attr(ATTR_NAMES.enable_tags)
+    # optional, number of pre-created port groups for every DvSwitch
+    port_group_pool_size: int = attr(ATTR_NAMES.port_group_pool_size, default=0)
+    # optional, file shared by driver processes to cache tag categories and tags
+    tags_cache_path: str = attr(ATTR_NAMES.tags_cache_path, default="")
+    # optional, max concurrent clones per resource, 0 - unlimited
+    max_clones_per_source_datastore: int = attr(
+        ATTR_NAMES.max_clones_per_source_datastore, default=0
+    )
+    max_clones_per_target_datastore: int = attr(
+        ATTR_NAMES.max_clones_per_target_datastore, default=0
+    )
+    max_clones_per_host: int = attr(ATTR_NAMES.max_clones_per_host, default=0)
+    # optional, pick the least loaded host of the cluster for new VMs
+    load_aware_host_placement: bool = attr(
+        ATTR_NAMES.load_aware_host_placement, default=False
+    )
+    # optional, number of pre-cloned VMs for every source and placement
+    vm_pool_size: int = attr(ATTR_NAMES.vm_pool_size, default=0)
+    # optional, pass the customization spec to the clone task instead of saving it
+    # to the spec manager, it's applied on the first power on anyway
+    customize_on_clone: bool = attr(ATTR_NAMES.customize_on_clone, default=False)
+    # optional, number of the most used target datastores that keep a replica of
+    # the template, so the VM is cloned within the datastore
+    template_replicas: int = attr(ATTR_NAMES.template_replicas, default=0)
+    # optional, max number of VMs deployed at the same time by the batch deploy
+    max_deploy_workers: int = attr(ATTR_NAMES.max_deploy_workers, default=10)
 
     @classmethod
     def from_cs_resource_details(
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+
+from attrs import define, field
+
+from cloudshell.cp.core.exceptions import CancellationContextException
+
+logger = logging.getLogger(__name__)
+
+SOURCE_DATASTORE = "source datastore"
+TARGET_DATASTORE = "target datastore"
+HOST = "host"
+# seconds between cancellation checks of a waiting clone
+WAIT_TICK = 1
+# the limit goes down when clones are this times slower than the fastest ones
+SLOWDOWN_FACTOR = 2
+# weight of the last clone duration in the average
+DURATION_WEIGHT = 0.3
+
+ResourceKey = tuple[str, str]  # (resource type, name)
+
+
+@define(frozen=True)
+class CloneLimits:
+    """Max concurrent clones per resource, 0 means unlimited."""
+
+    source_datastore: int = 0
+    target_datastore: int = 0
+    host: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return any((self.source_datastore, self.target_datastore, self.host))
+
+
+@define
+class CloneQueueStats:
+    limit: int
+    active: int
+    waiting: int
+    average_duration: float | None
+
+
+@define
+class _ResourceSlots:
+    """Concurrent clones of one resource.
+
+    The limit goes down by one when clones get slower than the fastest average
+    seen by SLOWDOWN_FACTOR and goes back up to the max limit when they are fast.
+    """
+
+    max_limit: int
+    limit: int
+    active: int = 0
+    waiting: int = 0
+    average_duration: float | None = None
+    best_duration: float | None = None
+
+    @property
+    def is_free(self) -> bool:
+        return self.active < self.limit
+
+    def set_max_limit(self, max_limit: int) -> None:
+        self.max_limit = max_limit
+        self.limit = min(self.limit, max_limit)
+
+    def record(self, duration: float) -> None:
+        if self.average_duration is None:
+            self.average_duration = duration
+        else:
+            self.average_duration += (duration - self.average_duration) * (
+                DURATION_WEIGHT
+            )
+        if self.best_duration is None or self.average_duration < self.best_duration:
+            self.best_duration = self.average_duration
+
+        if self.average_duration > self.best_duration * SLOWDOWN_FACTOR:
+            self.limit = max(self.limit - 1, 1)
+        elif self.limit < self.max_limit:
+            self.limit += 1
+
+
+@define(eq=False)
+class _Ticket:
+    keys: frozenset[ResourceKey]
+
+
+@define
+class CloneGovernor:
+    """Limits concurrent clones per source datastore, target datastore and host.
+
+    Clones waiting for the same resource start in FIFO order, so deployments of
+    different reservations are served in the order they came.
+    """
+
+    _slots: dict[ResourceKey, _ResourceSlots] = field(init=False, factory=dict)
+    _queue: deque[_Ticket] = field(init=False, factory=deque)
+    _cond: threading.Condition = field(init=False, factory=threading.Condition)
+
+    @contextmanager
+    def clone_slot(
+        self,
+        limits: dict[ResourceKey, int],
+        is_cancelled: Callable[[], bool] = lambda: False,
+    ) -> Generator[None, None, None]:
+        """Wait for free slots of all resources and hold them during the clone.
+
+        Limits are {(resource type, name): max concurrent clones}, 0 - unlimited.
+        """
+        limits = {key: limit for key, limit in limits.items() if limit > 0}
+        if not limits:
+            yield
+            return
+
+        ticket = _Ticket(frozenset(limits))
+        self._wait(ticket, limits, is_cancelled)
+        start = time.monotonic()
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            duration = time.monotonic() - start
+            with self._cond:
+                for key in ticket.keys:
+                    slots = self._slots[key]
+                    slots.active -= 1
+                    if succeeded:
+                        slots.record(duration)
+                self._cond.notify_all()
+
+    def _wait(
+        self,
+        ticket: _Ticket,
+        limits: dict[ResourceKey, int],
+        is_cancelled: Callable[[], bool],
+    ) -> None:
+        with self._cond:
+            for key, limit in limits.items():
+                slots = self._get_slots(key, limit)
+                slots.waiting += 1
+            self._queue.append(ticket)
+
+            try:
+                if not self._can_start(ticket):
+                    logger.info(f"Clone is queued, {self._format_stats(ticket)}")
+                while not self._cond.wait_for(
+                    lambda: self._can_start(ticket), timeout=WAIT_TICK
+                ):
+                    if is_cancelled():
+                        raise CancellationContextException(
+                            "Command was cancelled from the portal"
+                        )
+            finally:
+                self._queue.remove(ticket)
+                for key in ticket.keys:
+                    self._slots[key].waiting -= 1
+                # clones queued after this one may go now
+                self._cond.notify_all()
+
+            for key in ticket.keys:
+                self._slots[key].active += 1
+
+    def _get_slots(self, key: ResourceKey, limit: int) -> _ResourceSlots:
+        if not (slots := self._slots.get(key)):
+            slots = _ResourceSlots(max_limit=limit, limit=limit)
+            self._slots[key] = slots
+        elif slots.max_limit != limit:
+            slots.set_max_limit(limit)
+        return slots
+
+    def _can_start(self, ticket: _Ticket) -> bool:
+        for queued in self._queue:
+            if queued is ticket:
+                break
+            if queued.keys & ticket.keys:
+                return False  # an earlier clone waits for the same resource
+        return all(self._slots[key].is_free for key in ticket.keys)
+
+    def _format_stats(self, ticket: _Ticket) -> str:
+        stats = []
+        for type_, name in sorted(ticket.keys):
+            s = self._slots[(type_, name)]
+            stats.append(
+                f"{type_} {name}: active {s.active}/{s.limit}, waiting {s.waiting}"
+            )
+        return ", ".join(stats)
+
+    @property
+    def stats(self) -> dict[ResourceKey, CloneQueueStats]:
+        with self._cond:
+            return {
+                key: CloneQueueStats(s.limit, s.active, s.waiting, s.average_duration)
+                for key, s in self._slots.items()
+            }
+
+
+clone_governor = CloneGovernor()  # shared by all deployments of the process
@@ -3,6 +3,7 @@ from __future__ import annotations
 import logging
 import re
 from typing import TYPE_CHECKING
+from uuid import uuid4
 
 from attrs import define
 
@@ -38,6 +39,8 @@ MAX_DVSWITCH_LENGTH = 60
 MAX_DVSWITCH_LENGTH_V2 = 50
 QS_NAME_PREFIX = "QS"
 PORT_GROUP_NAME_PATTERN = re.compile(rf"{QS_NAME_PREFIX}_.+_VLAN")
+POOL_NAME_PART = "POOL"
+POOL_PORT_GROUP_NAME_PATTERN = re.compile(rf"^{QS_NAME_PREFIX}_.+_{POOL_NAME_PART}_")
 
 
 class DvSwitchNameEmpty(BaseVCenterException):
@@ -86,6 +89,23 @@ def is_network_generated_name(net_name: str):
     return bool(PORT_GROUP_NAME_PATTERN.search(net_name))
 
 
+def is_shell_port_group_name(net_name: str) -> bool:
+    """The port group is created by the Shell, VLAN network or pooled one."""
+    return is_network_generated_name(net_name) or bool(
+        POOL_PORT_GROUP_NAME_PATTERN.search(net_name)
+    )
+
+
+def generate_pool_port_group_name(dv_switch_name: str) -> str:
+    """Name of the pre-created port group, it's not a generated VLAN network."""
+    return f"{get_pool_port_group_prefix(dv_switch_name)}{uuid4().hex[:8]}"
+
+
+def get_pool_port_group_prefix(dv_switch_name: str) -> str:
+    dvs_name = dv_switch_name[:MAX_DVSWITCH_LENGTH]
+    return f"{QS_NAME_PREFIX}_{dvs_name}_{POOL_NAME_PART}_"
+
+
 def is_correct_vnic(expected_vnic: str, vnic: Vnic) -> bool:
     """Check that expected vNIC name or number is equal to vNIC.
 
@@ -194,8 +214,10 @@ def check_pg_can_be_removed(name: str, existed: bool) -> None:
         raise PgCanNotBeRemoved(name)
 
 
-@define
+@define(frozen=True)
 class NetworkSettings:
+    """Parsed connectivity action, immutable so threads can share it."""
+
     name: str
     old_name: str
     existed: bool
@@ -24,10 +24,18 @@ def prepare_custom_spec(
     vm_template: VmHandler,
     vm_name: str,
     si: SiHandler,
+    num_of_nics: int | None = None,
+    save: bool = True,
 ) -> CustomSpecHandler | None:
+    """Prepare the VM customization spec.
+
+    The spec is saved to the spec manager with the VM name unless save is False.
+    """
     spec = None
 
-    if custom_spec_name:
+    if custom_spec_name and not save:
+        spec = si.get_customization_spec(custom_spec_name)
+    elif custom_spec_name:
         if custom_spec_name != vm_name:
             si.duplicate_customization_spec(custom_spec_name, vm_name)
         spec = si.get_customization_spec(vm_name)
@@ -35,10 +43,12 @@ def prepare_custom_spec(
         spec = create_custom_spec_from_spec_params(custom_spec_params, vm_name)
 
     if spec:
-        num_of_nics = len(vm_template.vnics)
+        if num_of_nics is None:
+            num_of_nics = len(vm_template.vnics)
         if custom_spec_params:
             spec.set_custom_spec_params(custom_spec_params, num_of_nics)
 
+    if spec and save:
         if custom_spec_name:
             si.overwrite_customization_spec(spec)
         else:
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from collections.abc import Generator
+from contextlib import contextmanager
+
+from attrs import define, field
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.handlers.datastore_handler import DatastoreHandler
+from cloudshell.cp.vcenter.handlers.storage_pod_handler import (
+    StoragePodHandler,
+    StoragePodIsEmpty,
+)
+from cloudshell.cp.vcenter.utils.units_converter import format_bytes
+
+logger = logging.getLogger(__name__)
+
+# datastores with projected free space this close to the best one are treated
+# as equal and the one with fewer in-flight clones is picked
+SPREAD_RATIO = 0.1
+
+
+@define
+class DatastoreReservation:
+    datastore: DatastoreHandler
+    size: int
+
+
+@define
+class DatastoreLedger:
+    """Space reserved on datastores by in-flight clones of the process.
+
+    vCenter updates free space of a datastore only when a clone is finished,
+    so concurrent deployments to a storage pod would all pick the same
+    datastore. Datastores are picked by free space minus reserved space.
+    """
+
+    _reserved: Counter[vim.Datastore] = field(init=False, factory=Counter)
+    _clones: Counter[vim.Datastore] = field(init=False, factory=Counter)
+    _lock: threading.Lock = field(init=False, factory=threading.Lock)
+
+    def get_projected_free_space(self, datastore: DatastoreHandler) -> int:
+        with self._lock:
+            return datastore.free_space - self._reserved[datastore.get_vc_obj()]
+
+    def reserve(
+        self, storage: DatastoreHandler | StoragePodHandler, size: int
+    ) -> DatastoreReservation:
+        """Pick the datastore and reserve the space on it until released."""
+        if isinstance(storage, StoragePodHandler):
+            candidates = storage.datastores
+            if not candidates:
+                raise StoragePodIsEmpty(storage)
+        else:
+            candidates = [storage]
+        free_spaces = [(ds, ds.free_space) for ds in candidates]
+
+        with self._lock:
+            projected = [
+                (ds, free_space - self._reserved[ds.get_vc_obj()])
+                for ds, free_space in free_spaces
+            ]
+            best = max(free_space for _, free_space in projected)
+            threshold = best - abs(best) * SPREAD_RATIO
+            datastore, free_space = min(
+                ((ds, fs) for ds, fs in projected if fs >= threshold),
+                key=lambda x: (self._clones[x[0].get_vc_obj()], -x[1]),
+            )
+            self._reserved[datastore.get_vc_obj()] += size
+            self._clones[datastore.get_vc_obj()] += 1
+
+        logger.info(
+            f"Reserved {format_bytes(size)} on {datastore}, projected free space "
+            f"{format_bytes(free_space - size)}"
+        )
+        return DatastoreReservation(datastore, size)
+
+    def release(self, reservation: DatastoreReservation) -> None:
+        vc_ds = reservation.datastore.get_vc_obj()
+        with self._lock:
+            self._reserved[vc_ds] -= reservation.size
+            self._clones[vc_ds] -= 1
+            if self._clones[vc_ds] <= 0:
+                del self._reserved[vc_ds]
+                del self._clones[vc_ds]
+        logger.debug(f"Released {format_bytes(reservation.size)} on {vc_ds}")
+
+    @contextmanager
+    def reserved(
+        self, storage: DatastoreHandler | StoragePodHandler, size: int
+    ) -> Generator[DatastoreHandler, None, None]:
+        """Reserve the space while the VM is created, even if creation fails."""
+        reservation = self.reserve(storage, size)
+        try:
+            yield reservation.datastore
+        finally:
+            self.release(reservation)
+
+
+datastore_ledger = DatastoreLedger()  # shared by all deployments of the process
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter
+from collections.abc import Generator
+from contextlib import AbstractContextManager, contextmanager
+from typing import TYPE_CHECKING
+
+from attrs import define, field
+from pyVmomi import vim, vmodl
+
+from cloudshell.cp.vcenter.handlers.cluster_handler import HostHandler
+from cloudshell.cp.vcenter.utils.property_watcher import (
+    acquire_watcher,
+    create_property_collector,
+    release_watcher,
+    shared_watcher,
+)
+from cloudshell.cp.vcenter.utils.units_converter import BASE_10
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from cloudshell.cp.vcenter.handlers.cluster_handler import ClusterHandler
+    from cloudshell.cp.vcenter.handlers.datastore_handler import DatastoreHandler
+    from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
+
+
+logger = logging.getLogger(__name__)
+
+# host quick stats are updated by vCenter every 20 seconds
+REFRESH_INTERVAL = 20
+CPU_USAGE = "summary.quickStats.overallCpuUsage"
+MEMORY_USAGE = "summary.quickStats.overallMemoryUsage"
+CPU_MHZ = "summary.hardware.cpuMhz"
+CPU_CORES = "summary.hardware.numCpuCores"
+MEMORY_SIZE = "summary.hardware.memorySize"
+CONNECTION_STATE = "runtime.connectionState"
+MAINTENANCE_MODE = "runtime.inMaintenanceMode"
+DATASTORES = "datastore"
+WATCHED_PROPS = [
+    CPU_USAGE,
+    MEMORY_USAGE,
+    CPU_MHZ,
+    CPU_CORES,
+    MEMORY_SIZE,
+    CONNECTION_STATE,
+    MAINTENANCE_MODE,
+    DATASTORES,
+]
+
+
+@define
+class HostLoad:
+    cpu_usage: int = 0  # MHz
+    cpu_mhz: int = 0
+    cpu_cores: int = 0
+    memory_usage: int = 0  # MB
+    memory_size: int = 0  # bytes
+    connection_state: str = ""
+    in_maintenance_mode: bool = False
+    datastores: list[vim.Datastore] = field(factory=list)
+
+    @property
+    def available(self) -> bool:
+        return (
+            self.connection_state == "connected"
+            and not self.in_maintenance_mode
+            and self.cpu_mhz * self.cpu_cores > 0
+            and self.memory_size > 0
+        )
+
+    def get_load(self, reserved_memory: int) -> float:
+        """Max of CPU and memory usage ratios including reserved memory."""
+        cpu = self.cpu_usage / (self.cpu_mhz * self.cpu_cores)
+        memory_usage = self.memory_usage * BASE_10 * BASE_10 + reserved_memory
+        return max(cpu, memory_usage / self.memory_size)
+
+
+@define
+class HostLoadWatcher:
+    """Snapshot of hosts load kept up-to-date by Property Collector.
+
+    The snapshot is refreshed in the background when it's older than
+    REFRESH_INTERVAL, so picking a host doesn't wait for vCenter. Memory of VMs
+    that are being deployed is reserved on the picked host until released.
+    """
+
+    _si: SiHandler
+    _container: ClusterHandler
+    _hosts: dict[vim.HostSystem, HostLoad] = field(init=False, factory=dict)
+    _reserved_memory: Counter[vim.HostSystem] = field(init=False, factory=Counter)
+    _collector: vmodl.query.PropertyCollector = field(init=False)
+    _version: str = field(init=False, default="")
+    _updated_at: float = field(init=False, default=0.0)
+    _populated: threading.Event = field(init=False, factory=threading.Event)
+    _update_lock: threading.Lock = field(init=False, factory=threading.Lock)
+    _lock: threading.Lock = field(init=False, factory=threading.Lock)
+    _refs: int = field(init=False, default=0)
+
+    def __attrs_post_init__(self):
+        logger.info("Creating Property Collector of Host Load Watcher")
+        self._collector = create_property_collector(
+            self._si, self._container, {vim.HostSystem: WATCHED_PROPS}
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.destroy()
+
+    @property
+    def in_use(self) -> bool:
+        return self._refs > 0
+
+    def populate_in_bg(self) -> None:
+        th = threading.Thread(target=self.update_hosts, daemon=True)
+        th.start()
+
+    def destroy(self) -> None:
+        logger.info("Destroying Property Collector of Host Load Watcher")
+        self._collector.Destroy()
+
+    def pick_host(
+        self, memory: int, datastore: DatastoreHandler | None = None
+    ) -> HostHandler | None:
+        """Pick the least loaded host and reserve the memory on it.
+
+        Returns None if there is no available host with access to the datastore.
+        """
+        self._refresh()
+        vc_ds = datastore.get_vc_obj() if datastore else None
+        with self._lock:
+            loads = {
+                vc_host: load.get_load(self._reserved_memory[vc_host])
+                for vc_host, load in self._hosts.items()
+                if load.available and (vc_ds is None or vc_ds in load.datastores)
+            }
+            if not loads:
+                return None
+            vc_host = min(loads, key=loads.get)
+            self._reserved_memory[vc_host] += memory
+
+        host = HostHandler(vc_host, self._si)
+        logger.info(f"Picked {host} with load {loads[vc_host]:.0%}")
+        return host
+
+    def release_host(self, host: HostHandler, memory: int) -> None:
+        vc_host = host.get_vc_obj()
+        with self._lock:
+            self._reserved_memory[vc_host] -= memory
+            if self._reserved_memory[vc_host] <= 0:
+                del self._reserved_memory[vc_host]
+
+    @contextmanager
+    def reserved_host(
+        self, memory: int, datastore: DatastoreHandler | None = None
+    ) -> Generator[HostHandler | None, None, None]:
+        host = self.pick_host(memory, datastore)
+        try:
+            yield host
+        finally:
+            if host:
+                self.release_host(host, memory)
+
+    def _refresh(self) -> None:
+        if not self._populated.is_set():
+            self.update_hosts()
+        elif time.monotonic() - self._updated_at > REFRESH_INTERVAL:
+            with self._lock:
+                if time.monotonic() - self._updated_at <= REFRESH_INTERVAL:
+                    return  # another thread started the refresh
+                self._updated_at = time.monotonic()
+            self.populate_in_bg()
+
+    def update_hosts(self) -> None:
+        with self._update_lock:
+            try:
+                self._update_hosts()
+            except Exception:
+                logger.warning("Failed to update hosts load", exc_info=True)
+            finally:
+                self._updated_at = time.monotonic()
+                self._populated.set()
+
+    def _update_hosts(self) -> None:
+        options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=0)
+        wait_fn = self._collector.WaitForUpdatesEx
+        while update_set := wait_fn(version=self._version, options=options):
+            self._version = update_set.version
+
+            with self._lock:
+                for obj_set in update_set.filterSet[0].objectSet:
+                    if obj_set.kind == "leave":
+                        self._hosts.pop(obj_set.obj, None)
+                    else:
+                        load = self._hosts.setdefault(obj_set.obj, HostLoad())
+                        self._set_load(load, obj_set.changeSet)
+
+    @staticmethod
+    def _set_load(load: HostLoad, changes) -> None:
+        for change in changes:
+            if change.name == CPU_USAGE:
+                load.cpu_usage = change.val or 0
+            elif change.name == MEMORY_USAGE:
+                load.memory_usage = change.val or 0
+            elif change.name == CPU_MHZ:
+                load.cpu_mhz = change.val or 0
+            elif change.name == CPU_CORES:
+                load.cpu_cores = change.val or 0
+            elif change.name == MEMORY_SIZE:
+                load.memory_size = change.val or 0
+            elif change.name == CONNECTION_STATE:
+                load.connection_state = change.val or ""
+            elif change.name == MAINTENANCE_MODE:
+                load.in_maintenance_mode = bool(change.val)
+            elif change.name == DATASTORES:
+                load.datastores = list(change.val or [])
+
+
+def acquire_host_load_watcher(
+    si: SiHandler, cluster: ClusterHandler
+) -> HostLoadWatcher:
+    return acquire_watcher(HostLoadWatcher, si, cluster)
+
+
+def release_host_load_watcher(watcher: HostLoadWatcher) -> None:
+    release_watcher(watcher)
+
+
+def shared_host_load_watcher(
+    si: SiHandler, cluster: ClusterHandler
+) -> AbstractContextManager[HostLoadWatcher]:
+    return shared_watcher(HostLoadWatcher, si, cluster)
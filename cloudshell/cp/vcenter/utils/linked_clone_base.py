@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.exceptions import BaseVCenterException
+from cloudshell.cp.vcenter.handlers.config_spec_handler import ConfigSpecHandler
+from cloudshell.cp.vcenter.handlers.snapshot_handler import SnapshotHandler
+from cloudshell.cp.vcenter.handlers.task import TaskFailed
+from cloudshell.cp.vcenter.handlers.vm_handler import SnapshotNotFoundByPath, VmHandler
+from cloudshell.cp.vcenter.utils.threading import LockHandler
+
+if TYPE_CHECKING:
+    from cloudshell.cp.vcenter.handlers.folder_handler import FolderHandler
+    from cloudshell.cp.vcenter.handlers.resource_pool import ResourcePoolHandler
+    from cloudshell.cp.vcenter.handlers.task import ON_TASK_PROGRESS_TYPE
+
+
+logger = logging.getLogger(__name__)
+
+LINKED_CLONE_BASE_FOLDER = "QS_LINKED_CLONE_BASE"
+BASE_NAME_PREFIX = "QS_BASE"
+BASE_SNAPSHOT_NAME = "QS_LINKED_CLONE_BASE"
+MAX_TEMPLATE_NAME_LENGTH = 40
+# the base created by another process is expected to be ready in this time
+BASE_WAIT_TIMEOUT = 60 * 60
+BASE_WAIT_INTERVAL = 10
+# old bases of the template are checked for linked clones once in this time
+CLEANUP_INTERVAL = 60 * 60
+
+# deployments of the process create every base once
+_base_locks = LockHandler()
+_cleanup_lock = threading.Lock()
+# {template_id: time old bases were checked}  noqa: E800
+_last_cleanup: dict[str, float] = {}
+
+
+class LinkedCloneBaseNotReady(BaseVCenterException):
+    def __init__(self, vm: VmHandler):
+        self.vm = vm
+        super().__init__(f"{vm} doesn't have the snapshot {BASE_SNAPSHOT_NAME}")
+
+
+def _digest(key: str) -> str:
+    return hashlib.sha1(key.encode()).hexdigest()[:8]
+
+
+def _get_base_prefix(vm_template: VmHandler) -> str:
+    """Prefix of bases of every template version."""
+    template_name = vm_template.name[:MAX_TEMPLATE_NAME_LENGTH]
+    template_id = vm_template.get_vc_obj()._moId
+    return f"{BASE_NAME_PREFIX}_{template_name}_{_digest(template_id)}_"
+
+
+def get_base_vm_name(vm_template: VmHandler) -> str:
+    """Name of the base VM of the current template version."""
+    return f"{_get_base_prefix(vm_template)}{_digest(vm_template.change_version)}"
+
+
+def get_linked_clone_base(
+    vm_template: VmHandler,
+    base_folder: FolderHandler,
+    vm_resource_pool: ResourcePoolHandler,
+    on_task_progress: ON_TASK_PROGRESS_TYPE | None = None,
+) -> tuple[VmHandler, SnapshotHandler]:
+    """Get the base VM and the snapshot to link clones of the template to.
+
+    vCenter templates cannot have snapshots, so the base is a full clone of the
+    template with the managed snapshot. It's named by the template version and
+    shared by deployments of every driver process, the changed template gets
+    a new base. Old bases are kept while their disks are used by linked clones.
+    """
+    name = get_base_vm_name(vm_template)
+    base = None
+    with _base_locks.lock(name):
+        vm = _find_base(base_folder, name)
+        if vm is None:
+            try:
+                base = _create_base(
+                    vm_template, name, base_folder, vm_resource_pool, on_task_progress
+                )
+            except TaskFailed as e:
+                # the base with the same name is created by another process
+                if not (vm := _find_base(base_folder, name)):
+                    raise
+                logger.info(f"{vm} is created by another process. {e}")
+    if base is None:
+        # waiting for another process doesn't hold the lock
+        base = vm, _wait_base_snapshot(vm)
+    remove_unused_bases(vm_template, base_folder)
+    return base
+
+
+def remove_unused_bases(vm_template: VmHandler, base_folder: FolderHandler) -> None:
+    """Remove bases of previous template versions without linked clones."""
+    template_id = vm_template.get_vc_obj()._moId
+    with _cleanup_lock:
+        now = time.monotonic()
+        last_cleanup = _last_cleanup.get(template_id)
+        if last_cleanup is not None and now - last_cleanup < CLEANUP_INTERVAL:
+            return
+        _last_cleanup[template_id] = now
+
+    current_name = get_base_vm_name(vm_template)
+    prefix = _get_base_prefix(vm_template)
+    try:
+        vc_vms = base_folder.find_items(vim.VirtualMachine)
+    except Exception:
+        logger.warning(f"Failed to get old bases of the {vm_template}", exc_info=True)
+        return
+
+    for vc_vm in vc_vms:
+        try:
+            if not vc_vm.name.startswith(prefix) or vc_vm.name == current_name:
+                continue
+            vm = VmHandler(vc_vm, base_folder.si)
+            if _has_linked_clones(vc_vm):
+                logger.debug(f"Keeping the old {vm}, it has linked clones")
+            else:
+                logger.info(f"Removing the old {vm} without linked clones")
+                vm.delete()
+        except Exception:
+            # removed by someone else or the new clone locks its disks
+            logger.warning(f"Failed to remove the old base {vc_vm}", exc_info=True)
+
+
+def _has_linked_clones(vc_vm: vim.VirtualMachine) -> bool:
+    """Other VMs on the base datastores have disks backed by the base disks."""
+    base_dir = vc_vm.config.files.vmPathName.rsplit("/", 1)[0] + "/"
+    for vc_datastore in vc_vm.datastore:
+        for other_vm in vc_datastore.vm:
+            if other_vm == vc_vm or not other_vm.config:
+                continue
+            for device in other_vm.config.hardware.device:
+                if not isinstance(device, vim.vm.device.VirtualDisk):
+                    continue
+                backing = device.backing.parent
+                while backing:
+                    if backing.fileName.startswith(base_dir):
+                        return True
+                    backing = backing.parent
+    return False
+
+
+def _find_base(base_folder: FolderHandler, name: str) -> VmHandler | None:
+    vc_vm = base_folder.find_child(name)
+    return VmHandler(vc_vm, base_folder.si) if vc_vm else None
+
+
+def _create_base(
+    vm_template: VmHandler,
+    name: str,
+    base_folder: FolderHandler,
+    vm_resource_pool: ResourcePoolHandler,
+    on_task_progress: ON_TASK_PROGRESS_TYPE | None,
+) -> tuple[VmHandler, SnapshotHandler]:
+    logger.info(f"Creating the linked clone base of the {vm_template}")
+    # clones keep the template BIOS UUID for "Copy source UUID"
+    config_spec = ConfigSpecHandler(None, None, [], vm_template.bios_uuid)
+    vm = vm_template.clone_vm(
+        name,
+        vm_template.datastores[0],
+        base_folder,
+        vm_resource_pool,
+        config_spec=config_spec,
+        on_task_progress=on_task_progress,
+    )
+    try:
+        snapshot_path = vm.create_snapshot(
+            BASE_SNAPSHOT_NAME, dump_memory=False, on_task_progress=on_task_progress
+        )
+        return vm, vm.get_snapshot_by_path(snapshot_path)
+    except Exception:
+        vm.delete()
+        raise
+
+
+def _wait_base_snapshot(vm: VmHandler) -> SnapshotHandler:
+    end_time = time.monotonic() + BASE_WAIT_TIMEOUT
+    while True:
+        try:
+            return vm.get_snapshot_by_path(BASE_SNAPSHOT_NAME)
+        except SnapshotNotFoundByPath:
+            if time.monotonic() > end_time:
+                raise LinkedCloneBaseNotReady(vm)
+            logger.debug(f"Waiting for the snapshot of the {vm}")
+            time.sleep(BASE_WAIT_INTERVAL)
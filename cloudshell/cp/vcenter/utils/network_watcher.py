@@ -4,6 +4,7 @@ import logging
 import threading
 import time
 from collections.abc import Callable, Generator
+from contextlib import AbstractContextManager
 from typing import TYPE_CHECKING
 
 from attrs import define, field
@@ -15,6 +16,12 @@ from cloudshell.cp.vcenter.handlers.network_handler import (
     NetworkNotFound,
     get_network_handler,
 )
+from cloudshell.cp.vcenter.utils.property_watcher import (
+    acquire_watcher,
+    create_property_collector,
+    release_watcher,
+    shared_watcher,
+)
 
 if TYPE_CHECKING:
     from typing_extensions import Self
@@ -38,41 +45,14 @@ class NetworkWatcher:
     _collector: vmodl.query.PropertyCollector = field(init=False)
     _version: str = field(init=False, default="")
     _lock: threading.Lock = field(init=False, factory=threading.Lock)
+    _refs: int = field(init=False, default=0)
 
     def __attrs_post_init__(self):
         logger.info("Creating Property Collector of Networking Watcher")
-        vc_si = self._si.get_vc_obj()
-        vc_container = self._container.get_vc_obj()
-        view_ref = vc_si.content.viewManager.CreateContainerView(
-            container=vc_container, type=[vim.Network], recursive=self._recursive
+        # DVPortGroup is a subclass of Network
+        self._collector = create_property_collector(
+            self._si, self._container, {vim.Network: ["name"]}, self._recursive
         )
-        # noinspection PyUnresolvedReferences
-        traversal_spec = vmodl.query.PropertyCollector.TraversalSpec()
-        traversal_spec.name = "traverseEntries"
-        traversal_spec.path = "view"
-        traversal_spec.skip = False
-        traversal_spec.type = type(view_ref)
-        traversal_spec.selectSet = []
-
-        # noinspection PyUnresolvedReferences
-        obj_spec = vmodl.query.PropertyCollector.ObjectSpec()
-        obj_spec.obj = view_ref
-        obj_spec.skip = True
-        obj_spec.selectSet = [traversal_spec]
-
-        # noinspection PyUnresolvedReferences
-        prop_spec = vmodl.query.PropertyCollector.PropertySpec()
-        prop_spec.type = vim.Network  # DVPortGroup is a subclass of Network
-        prop_spec.pathSet = ["name"]
-
-        # noinspection PyUnresolvedReferences
-        filter_spec = vmodl.query.PropertyCollector.FilterSpec()
-        filter_spec.objectSet = [obj_spec]
-        filter_spec.propSet = [prop_spec]
-
-        collector = vc_si.content.propertyCollector.CreatePropertyCollector()
-        collector.CreateFilter(filter_spec, partialUpdates=True)
-        self._collector = collector
 
     def __enter__(self) -> Self:
         return self
@@ -80,6 +60,10 @@ class NetworkWatcher:
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.destroy()
 
+    @property
+    def in_use(self) -> bool:
+        return self._refs > 0
+
     def populate_in_bg(self) -> None:
         th = threading.Thread(target=self.update_networks, kwargs={"wait": 0})
         th.start()
@@ -136,8 +120,30 @@ class NetworkWatcher:
                 if obj_set.kind == "enter":
                     self._networks[params["name"]] = obj_set.obj
                     self._network_to_name[obj_set.obj] = params["name"]
+                elif obj_set.kind == "modify" and "name" in params:
+                    # the network was renamed
+                    if name := self._network_to_name.get(obj_set.obj):
+                        del self._networks[name]
+                    self._networks[params["name"]] = obj_set.obj
+                    self._network_to_name[obj_set.obj] = params["name"]
                 elif obj_set.kind == "leave":
                     name = self._network_to_name.get(obj_set.obj)
                     if name:
                         del self._networks[name]
                         del self._network_to_name[obj_set.obj]
+
+
+def acquire_network_watcher(
+    si: SiHandler, container: ManagedEntityHandler
+) -> NetworkWatcher:
+    return acquire_watcher(NetworkWatcher, si, container)
+
+
+def release_network_watcher(watcher: NetworkWatcher) -> None:
+    release_watcher(watcher)
+
+
+def shared_network_watcher(
+    si: SiHandler, container: ManagedEntityHandler
+) -> AbstractContextManager[NetworkWatcher]:
+    return shared_watcher(NetworkWatcher, si, container)
@@ -0,0 +1,540 @@
+from __future__ import annotations
+
+import logging
+import os
+import tarfile
+import threading
+import time
+import warnings
+from abc import ABC, abstractmethod
+from collections.abc import Generator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, contextmanager
+from typing import IO, TYPE_CHECKING
+from urllib.parse import urljoin, urlparse
+from urllib.request import url2pathname, urlopen
+
+import requests
+import urllib3
+from attrs import define, field
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.exceptions import BaseVCenterException
+from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+
+if TYPE_CHECKING:
+    from cloudshell.cp.core.cancellation_manager import CancellationContextManager
+
+    from cloudshell.cp.vcenter.handlers.datastore_handler import DatastoreHandler
+    from cloudshell.cp.vcenter.handlers.folder_handler import FolderHandler
+    from cloudshell.cp.vcenter.handlers.network_handler import (
+        DVPortGroupHandler,
+        NetworkHandler,
+    )
+    from cloudshell.cp.vcenter.handlers.resource_pool import ResourcePoolHandler
+    from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
+
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_THREADS = 4
+CHUNK_SIZE = 1024 * 1024
+# the lease expires if its progress is not updated for 5 minutes
+PROGRESS_INTERVAL = 10
+LEASE_READY_TIMEOUT = 5 * 60
+LEASE_READY_INTERVAL = 1
+HTTP_SCHEMES = ("http", "https")
+# like the ovftool, images are read from these URLs too
+URL_SCHEMES = (*HTTP_SCHEMES, "ftp")
+# ovftool arguments that are supported by the importer
+DISK_MODE_ARG = "--diskMode="
+NETWORK_ARG = "--net:"
+PROPERTY_ARG = "--prop:"
+
+
+class OvfImportException(BaseVCenterException):
+    """Failed to import the OVF/OVA image."""
+
+
+class OvfImportCancelled(OvfImportException):
+    def __init__(self):
+        super().__init__("Import of the image is cancelled")
+
+
+@define
+class ImageArguments:
+    """Import parameters parsed from ovftool arguments of the Deploy App.
+
+    --diskMode, --net and --prop are supported, other arguments are ignored.
+    """
+
+    disk_provisioning: str = ""
+    # {OVF network name: target network name}  noqa: E800
+    networks: dict[str, str] = field(factory=dict)
+    properties: dict[str, str] = field(factory=dict)
+
+    @classmethod
+    def from_list(cls, args: list[str]) -> ImageArguments:
+        image_args = cls()
+        for arg in args:
+            if arg.startswith(DISK_MODE_ARG):
+                image_args.disk_provisioning = arg.removeprefix(DISK_MODE_ARG)
+            elif arg.startswith(NETWORK_ARG) and "=" in arg:
+                name, network = arg.removeprefix(NETWORK_ARG).split("=", 1)
+                image_args.networks[name] = network
+            elif arg.startswith(PROPERTY_ARG) and "=" in arg:
+                key, value = arg.removeprefix(PROPERTY_ARG).split("=", 1)
+                image_args.properties[key] = value
+            else:
+                logger.warning(f"Image argument '{arg}' is not supported, ignoring")
+        return image_args
+
+
+def _is_url(location: str) -> bool:
+    return urlparse(location).scheme in URL_SCHEMES
+
+
+def _get_local_path(image: str) -> str:
+    """Path of the local image, file URLs are converted to paths."""
+    url = urlparse(image)
+    if url.scheme == "file":
+        return url2pathname(url.path)
+    # one letter is a Windows drive
+    if len(url.scheme) > 1:
+        raise OvfImportException(
+            f"Image location {image} is not supported, use a local path or "
+            f"{', '.join(URL_SCHEMES)} or file URL"
+        )
+    return image
+
+
+@contextmanager
+def _upload_session() -> Generator[requests.Session, None, None]:
+    """HTTP session of the import, certificates are not verified like by the API.
+
+    Warnings about unverified requests are suppressed only while it's open.
+    """
+    with warnings.catch_warnings(), requests.Session() as session:
+        warnings.simplefilter("ignore", urllib3.exceptions.InsecureRequestWarning)
+        session.verify = False
+        yield session
+
+
+def _open(location: str, session: requests.Session) -> tuple[IO[bytes], int | None]:
+    """Open the local file or the URL for reading, returns the stream and size."""
+    if not _is_url(location):
+        return open(location, "rb"), os.path.getsize(location)
+
+    if urlparse(location).scheme in HTTP_SCHEMES:
+        response = session.get(location, stream=True)
+        response.raise_for_status()
+        response.raw.decode_content = True
+        size = response.headers.get("Content-Length")
+        return response.raw, int(size) if size else None
+
+    response = urlopen(location)
+    size = response.headers.get("Content-Length")
+    return response, int(size) if size else None
+
+
+def _exists(location: str, session: requests.Session) -> bool:
+    if not _is_url(location):
+        return os.path.isfile(location)
+    if urlparse(location).scheme in HTTP_SCHEMES:
+        return session.head(location, allow_redirects=True).ok
+    try:
+        urlopen(location).close()
+    except OSError:
+        return False
+    return True
+
+
+class _ImageReader(ABC):
+    """Reads the descriptor and files referenced by it."""
+
+    # files can be read at the same time
+    parallel = True
+
+    @abstractmethod
+    def read_descriptor(self) -> str:
+        pass
+
+    @abstractmethod
+    def get_missing_files(self, paths: set[str]) -> set[str]:
+        """Files that are referenced by the descriptor but not found."""
+
+    @abstractmethod
+    def iter_files(
+        self, paths: set[str]
+    ) -> Iterator[tuple[str, IO[bytes], int | None]]:
+        """Open the files, the stream should be closed by the caller."""
+
+
+@define
+class _OvfReader(_ImageReader):
+    """OVF descriptor, disk files are next to it."""
+
+    _location: str
+    _session: requests.Session
+
+    def read_descriptor(self) -> str:
+        stream, _ = _open(self._location, self._session)
+        with closing(stream):
+            return stream.read().decode()
+
+    def get_missing_files(self, paths: set[str]) -> set[str]:
+        return {
+            path
+            for path in paths
+            if not _exists(self._get_file_location(path), self._session)
+        }
+
+    def iter_files(
+        self, paths: set[str]
+    ) -> Iterator[tuple[str, IO[bytes], int | None]]:
+        for path in paths:
+            yield path, *_open(self._get_file_location(path), self._session)
+
+    def _get_file_location(self, path: str) -> str:
+        if _is_url(self._location):
+            return urljoin(self._location, path)
+        return os.path.join(os.path.dirname(self._location), path)
+
+
+@define
+class _OvaReader(_ImageReader):
+    """Local OVA, files are read from their offsets inside the archive."""
+
+    _location: str
+    _members: dict[str, tarfile.TarInfo] = field(init=False, factory=dict)
+
+    def __attrs_post_init__(self):
+        # reads only headers of the members
+        with tarfile.open(self._location) as tar:
+            self._members = {member.name: member for member in tar.getmembers()}
+
+    def read_descriptor(self) -> str:
+        for name in self._members:
+            if name.lower().endswith(".ovf"):
+                with closing(self._open_member(name)) as stream:
+                    return stream.read().decode()
+        raise OvfImportException(f"OVF descriptor not found in {self._location}")
+
+    def get_missing_files(self, paths: set[str]) -> set[str]:
+        return paths - self._members.keys()
+
+    def iter_files(
+        self, paths: set[str]
+    ) -> Iterator[tuple[str, IO[bytes], int | None]]:
+        for path in paths:
+            yield path, self._open_member(path), self._members[path].size
+
+    def _open_member(self, name: str) -> IO[bytes]:
+        member = self._members[name]
+        stream = open(self._location, "rb")
+        stream.seek(member.offset_data)
+        return _LimitedReader(stream, member.size)
+
+
+@define
+class _OvaStreamReader(_ImageReader):
+    """Remote OVA, the archive is read once from the beginning to the end."""
+
+    parallel = False
+    _location: str
+    _session: requests.Session
+    _stream: IO[bytes] = field(init=False)
+    _tar: tarfile.TarFile = field(init=False)
+
+    def __attrs_post_init__(self):
+        self._stream, _ = _open(self._location, self._session)
+        self._tar = tarfile.open(fileobj=self._stream, mode="r|")
+
+    def read_descriptor(self) -> str:
+        # the descriptor is the first file of the OVA
+        member = self._tar.next()
+        if not member or not member.name.lower().endswith(".ovf"):
+            raise OvfImportException(f"OVF descriptor not found in {self._location}")
+        return self._tar.extractfile(member).read().decode()
+
+    def get_missing_files(self, paths: set[str]) -> set[str]:
+        # the archive can't be read twice, files are checked while uploaded
+        return set()
+
+    def iter_files(
+        self, paths: set[str]
+    ) -> Iterator[tuple[str, IO[bytes], int | None]]:
+        found = set()
+        with closing(self._stream), self._tar:
+            for member in self._tar:
+                if member.name in paths:
+                    found.add(member.name)
+                    yield member.name, self._tar.extractfile(member), member.size
+        if missing := paths - found:
+            raise _missing_files_error(self._location, missing)
+
+
+@define
+class _LimitedReader:
+    _stream: IO[bytes]
+    _size: int
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self._size:
+            size = self._size
+        data = self._stream.read(size)
+        self._size -= len(data)
+        return data
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+def _missing_files_error(image: str, paths: set[str]) -> OvfImportException:
+    return OvfImportException(
+        f"Files {', '.join(sorted(paths))} referenced by the OVF descriptor are "
+        f"not found in {image}"
+    )
+
+
+def _get_image_reader(image: str, session: requests.Session) -> _ImageReader:
+    if not _is_url(image):
+        image = _get_local_path(image)
+    if not urlparse(image).path.lower().endswith(".ova"):
+        return _OvfReader(image, session)
+    if _is_url(image):
+        return _OvaStreamReader(image, session)
+    return _OvaReader(image)
+
+
+@define
+class _UploadBody:
+    """File-like request body that counts uploaded bytes and checks cancellation."""
+
+    _stream: IO[bytes]
+    _size: int
+    _importer: OvfImporter
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        # empty body is still sent, requests skips falsy ones
+        return True
+
+    def read(self, size: int = CHUNK_SIZE) -> bytes:
+        if self._importer.is_cancelled:
+            raise OvfImportCancelled
+        data = self._stream.read(min(size, CHUNK_SIZE))
+        self._importer.add_uploaded(len(data))
+        return data
+
+
+@define
+class OvfImporter:
+    """Import the OVF/OVA image in the process instead of the ovftool.
+
+    The descriptor is parsed by the vCenter OVF Manager, disks are streamed to
+    the device URLs of the import lease, several of them at the same time.
+    The OVA is read directly from the archive without unpacking it.
+    """
+
+    _si: SiHandler
+    _cancellation_manager: CancellationContextManager
+    _vcenter_host: str
+    _uploaded: int = field(init=False, default=0)
+    _lock: threading.Lock = field(init=False, factory=threading.Lock)
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancellation_manager.cancellation_context.is_cancelled
+
+    def add_uploaded(self, size: int) -> None:
+        with self._lock:
+            self._uploaded += size
+
+    def import_vm(
+        self,
+        image: str,
+        vm_name: str,
+        vm_resource_pool: ResourcePoolHandler,
+        vm_storage: DatastoreHandler,
+        vm_folder: FolderHandler,
+        image_args: ImageArguments,
+        networks: dict[str, NetworkHandler | DVPortGroupHandler],
+    ) -> VmHandler:
+        """Import the VM, networks are targets of the OVF networks."""
+        logger.info(f"Importing the image {image} to the new VM '{vm_name}'")
+        with _upload_session() as session:
+            vc_vm = self._import(
+                session,
+                image,
+                vm_name,
+                vm_resource_pool,
+                vm_storage,
+                vm_folder,
+                image_args,
+                networks,
+            )
+        vm = VmHandler(vc_vm, self._si)
+        logger.info(f"{vm} imported successfully")
+        return vm
+
+    def _import(
+        self,
+        session: requests.Session,
+        image: str,
+        vm_name: str,
+        vm_resource_pool: ResourcePoolHandler,
+        vm_storage: DatastoreHandler,
+        vm_folder: FolderHandler,
+        image_args: ImageArguments,
+        networks: dict[str, NetworkHandler | DVPortGroupHandler],
+    ) -> vim.VirtualMachine:
+        reader = _get_image_reader(image, session)
+        spec = self._create_import_spec(
+            reader.read_descriptor(),
+            vm_name,
+            vm_resource_pool,
+            vm_storage,
+            image_args,
+            networks,
+        )
+        # the lease creates the VM, it should have all its disks
+        if missing := reader.get_missing_files({item.path for item in spec.fileItem}):
+            raise _missing_files_error(image, missing)
+
+        vc_lease = vm_resource_pool.get_vc_obj().ImportVApp(
+            spec.importSpec, folder=vm_folder.get_vc_obj()
+        )
+        self._wait_lease_ready(vc_lease)
+        try:
+            self._upload_files(session, vc_lease, reader, spec.fileItem)
+            # the lease info is available only while the lease is ready
+            vc_vm = vc_lease.info.entity
+        except Exception as e:
+            logger.warning(f"Failed to upload the image {image}. {e}")
+            vc_lease.HttpNfcLeaseAbort()
+            raise
+        vc_lease.HttpNfcLeaseComplete()
+        return vc_vm
+
+    def _create_import_spec(
+        self,
+        descriptor: str,
+        vm_name: str,
+        vm_resource_pool: ResourcePoolHandler,
+        vm_storage: DatastoreHandler,
+        image_args: ImageArguments,
+        networks: dict[str, NetworkHandler | DVPortGroupHandler],
+    ) -> vim.OvfManager.CreateImportSpecResult:
+        params = vim.OvfManager.CreateImportSpecParams(
+            entityName=vm_name,
+            networkMapping=[
+                vim.OvfManager.NetworkMapping(name=name, network=network.get_vc_obj())
+                for name, network in networks.items()
+            ],
+            propertyMapping=[
+                vim.KeyValue(key=key, value=value)
+                for key, value in image_args.properties.items()
+            ],
+        )
+        if image_args.disk_provisioning:
+            # vCenter rejects the empty value, the default is used without it
+            params.diskProvisioning = image_args.disk_provisioning
+        ovf_manager = self._si.get_vc_obj().content.ovfManager
+        spec = ovf_manager.CreateImportSpec(
+            descriptor,
+            vm_resource_pool.get_vc_obj(),
+            vm_storage.get_vc_obj(),
+            params,
+        )
+        for warning in spec.warning:
+            logger.warning(f"OVF import warning: {warning.msg}")
+        if spec.error:
+            errors = "; ".join(error.msg for error in spec.error)
+            raise OvfImportException(f"Invalid OVF descriptor. {errors}")
+        if not isinstance(spec.importSpec, vim.VirtualMachineImportSpec):
+            raise OvfImportException("Only images with a single VM are supported")
+        return spec
+
+    def _wait_lease_ready(self, vc_lease: vim.HttpNfcLease) -> None:
+        end_time = time.monotonic() + LEASE_READY_TIMEOUT
+        while vc_lease.state == vim.HttpNfcLease.State.initializing:
+            if time.monotonic() > end_time:
+                vc_lease.HttpNfcLeaseAbort()
+                raise OvfImportException("Import lease is not ready in time")
+            time.sleep(LEASE_READY_INTERVAL)
+        if vc_lease.state == vim.HttpNfcLease.State.error:
+            raise OvfImportException(f"Import lease failed. {vc_lease.error.msg}")
+
+    def _upload_files(
+        self,
+        session: requests.Session,
+        vc_lease: vim.HttpNfcLease,
+        reader: _ImageReader,
+        file_items: list[vim.OvfManager.FileItem],
+    ) -> None:
+        urls = {
+            device_url.importKey: device_url.url.replace("*", self._vcenter_host)
+            for device_url in vc_lease.info.deviceUrl
+        }
+        items = {item.path: item for item in file_items}
+        total = sum(item.size or 0 for item in file_items)
+        self._uploaded = 0
+
+        stop = threading.Event()
+        progress = threading.Thread(
+            target=self._update_progress, args=(vc_lease, total, stop), daemon=True
+        )
+        progress.start()
+        workers = UPLOAD_THREADS if reader.parallel else 1
+        try:
+            with ThreadPoolExecutor(workers, "ovf-upload") as executor:
+                futures = []
+                for path, stream, size in reader.iter_files(set(items)):
+                    item = items[path]
+                    url = urls[item.deviceId]
+                    args = (session, url, item, stream, size or item.size)
+                    if reader.parallel:
+                        futures.append(executor.submit(self._upload_file, *args))
+                    else:
+                        self._upload_file(*args)
+                for future in futures:
+                    future.result()
+        finally:
+            stop.set()
+            progress.join()
+
+    def _upload_file(
+        self,
+        session: requests.Session,
+        url: str,
+        item: vim.OvfManager.FileItem,
+        stream: IO[bytes],
+        size: int,
+    ) -> None:
+        logger.info(f"Uploading {item.path} to {url}")
+        method = "PUT" if item.create else "POST"
+        headers = {
+            "Content-Type": "application/x-vnd.vmware-streamVmdk",
+            "Cookie": self._si.session_cookie,
+        }
+        with closing(stream):
+            response = session.request(
+                method, url, data=_UploadBody(stream, size, self), headers=headers
+            )
+        if not response.ok:
+            raise OvfImportException(
+                f"Failed to upload {item.path}. {response.status_code} {response.text}"
+            )
+
+    def _update_progress(
+        self, vc_lease: vim.HttpNfcLease, total: int, stop: threading.Event
+    ) -> None:
+        while not stop.wait(PROGRESS_INTERVAL):
+            percent = min(99, self._uploaded * 100 // total) if total else 0
+            try:
+                vc_lease.HttpNfcLeaseProgress(percent)
+            except Exception:
+                logger.warning("Failed to update the import progress", exc_info=True)
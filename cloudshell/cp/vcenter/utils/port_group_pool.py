@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import logging
+import threading
+from typing import TYPE_CHECKING
+
+from attrs import define, field
+
+from cloudshell.shell.flows.connectivity.models.connectivity_model import (
+    ConnectionModeEnum,
+)
+
+from cloudshell.cp.vcenter.handlers.network_handler import (
+    DVPortGroupHandler,
+    NetworkNotFound,
+)
+from cloudshell.cp.vcenter.handlers.switch_handler import (
+    DvSwitchHandler,
+    PortGroupExists,
+)
+from cloudshell.cp.vcenter.handlers.task import TaskFailed
+from cloudshell.cp.vcenter.utils.connectivity_helpers import (
+    generate_pool_port_group_name,
+    get_pool_port_group_prefix,
+)
+
+if TYPE_CHECKING:
+    from cloudshell.cp.vcenter.utils.connectivity_helpers import NetworkSettings
+    from cloudshell.cp.vcenter.utils.network_watcher import NetworkWatcher
+
+
+logger = logging.getLogger(__name__)
+
+POOL_VLAN_ID = "0"  # untagged
+
+
+@define
+class PortGroupPool:
+    """Pool of pre-created untagged DV port groups.
+
+    Claiming a port group reconfigures its name and VLAN in one task instead of
+    creating a new port group and waiting for it. Claimed port groups are never
+    returned to the pool, they are removed like other networks when unused.
+    Port groups that failed to be claimed stay in the pool.
+    """
+
+    _switch: DvSwitchHandler
+    _networks_watcher: NetworkWatcher
+    _size: int
+    # port groups are renamed on claim, names are kept until the watcher sees it
+    _claimed: set[str] = field(init=False, factory=set)
+    _lock: threading.Lock = field(init=False, factory=threading.Lock)
+    _refill_thread: threading.Thread | None = field(init=False, default=None)
+
+    @property
+    def _prefix(self) -> str:
+        return get_pool_port_group_prefix(self._switch.name)
+
+    def _is_free(self, name: str) -> bool:
+        return name.startswith(self._prefix) and name not in self._claimed
+
+    def claim(self, net_settings: NetworkSettings) -> DVPortGroupHandler | None:
+        """Turn a pooled port group into the network, None if the pool is empty.
+
+        Raises PortGroupExists if the network was created by someone else.
+        """
+        for name in self._networks_watcher.find_network_names(key=self._is_free):
+            with self._lock:
+                if name in self._claimed:
+                    continue
+                self._claimed.add(name)
+            pg = None
+            try:
+                pg = self._claim(name, net_settings)
+            finally:
+                if pg is None:
+                    with self._lock:
+                        self._claimed.discard(name)
+            if pg:
+                return pg
+        logger.info(f"Port group pool of the {self._switch} is empty")
+        return None
+
+    def _claim(
+        self, name: str, net_settings: NetworkSettings
+    ) -> DVPortGroupHandler | None:
+        try:
+            pg = self._networks_watcher.get_network(name)
+        except NetworkNotFound:
+            return None  # removed by someone else
+        if not isinstance(pg, DVPortGroupHandler):
+            return None
+
+        try:
+            self._switch.reconfigure_port_group(
+                pg,
+                net_settings.name,
+                net_settings.vlan_id,
+                net_settings.port_mode,
+                net_settings.promiscuous_mode,
+                net_settings.forged_transmits,
+                net_settings.mac_changes,
+            )
+        except TaskFailed as e:
+            # claimed by another process or the network already exists
+            logger.info(f"Cannot claim {pg} from the pool. {e}")
+            if self._networks_watcher.exists(net_settings.name):
+                raise PortGroupExists(net_settings.name)
+            return None
+        logger.info(f"{pg} is claimed from the pool as {net_settings.name}")
+        return pg
+
+    def refill_in_bg(self) -> None:
+        with self._lock:
+            if self._refill_thread and self._refill_thread.is_alive():
+                return
+            self._refill_thread = threading.Thread(target=self.refill)
+            self._refill_thread.start()
+
+    def wait_refilled(self) -> None:
+        if self._refill_thread:
+            self._refill_thread.join()
+
+    def refill(self) -> None:
+        free = len(list(self._networks_watcher.find_network_names(self._is_free)))
+        for _ in range(self._size - free):
+            name = generate_pool_port_group_name(self._switch.name)
+            try:
+                self._switch.create_port_group(
+                    name,
+                    POOL_VLAN_ID,
+                    ConnectionModeEnum.ACCESS,
+                    promiscuous_mode=False,
+                    forged_transmits=False,
+                    mac_changes=False,
+                )
+            except TaskFailed:
+                logger.warning(
+                    f"Failed to refill the port group pool of {self._switch}",
+                    exc_info=True,
+                )
+                break
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import Generator
+from contextlib import contextmanager
+from functools import partial
+from typing import TYPE_CHECKING, Any, Protocol, TypeVar
+
+from pyVmomi import vmodl
+
+if TYPE_CHECKING:
+    from cloudshell.cp.vcenter.handlers.managed_entity_handler import (
+        ManagedEntityHandler,
+    )
+    from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
+
+
+logger = logging.getLogger(__name__)
+
+
+class SharedWatcher(Protocol):
+    _refs: int
+
+    def __init__(self, si: SiHandler, container: ManagedEntityHandler):
+        ...
+
+    @property
+    def in_use(self) -> bool:
+        ...
+
+    def populate_in_bg(self) -> None:
+        ...
+
+    def destroy(self) -> None:
+        ...
+
+
+WATCHER_TYPE = TypeVar("WATCHER_TYPE", bound=SharedWatcher)
+
+
+def create_property_collector(
+    si: SiHandler,
+    container: ManagedEntityHandler,
+    path_sets: dict[type, list[str]],
+    recursive: bool = True,
+) -> vmodl.query.PropertyCollector:
+    """Create Property Collector that watches properties of the container items."""
+    vc_si = si.get_vc_obj()
+    vc_container = container.get_vc_obj()
+    view_ref = vc_si.content.viewManager.CreateContainerView(
+        container=vc_container, type=list(path_sets), recursive=recursive
+    )
+    # noinspection PyUnresolvedReferences
+    traversal_spec = vmodl.query.PropertyCollector.TraversalSpec()
+    traversal_spec.name = "traverseEntries"
+    traversal_spec.path = "view"
+    traversal_spec.skip = False
+    traversal_spec.type = type(view_ref)
+    traversal_spec.selectSet = []
+
+    # noinspection PyUnresolvedReferences
+    obj_spec = vmodl.query.PropertyCollector.ObjectSpec()
+    obj_spec.obj = view_ref
+    obj_spec.skip = True
+    obj_spec.selectSet = [traversal_spec]
+
+    prop_specs = []
+    for vc_type, path_set in path_sets.items():
+        # noinspection PyUnresolvedReferences
+        prop_spec = vmodl.query.PropertyCollector.PropertySpec()
+        prop_spec.type = vc_type
+        prop_spec.pathSet = path_set
+        prop_specs.append(prop_spec)
+
+    # noinspection PyUnresolvedReferences
+    filter_spec = vmodl.query.PropertyCollector.FilterSpec()
+    filter_spec.objectSet = [obj_spec]
+    filter_spec.propSet = prop_specs
+
+    collector = vc_si.content.propertyCollector.CreatePropertyCollector()
+    collector.CreateFilter(filter_spec, partialUpdates=True)
+    return collector
+
+
+# released watchers are kept warm for next flows of the session, but not longer
+# than this, a session that isn't disconnected by the SiHandler is never reused
+IDLE_TIMEOUT = 10 * 60
+
+_watchers_lock = threading.Lock()
+# {(watcher_class, session_key, vc_container): watcher}  noqa: E800
+shared_watchers: dict[tuple[type, Any, Any], SharedWatcher] = {}
+# {key of the watcher: monotonic time it's released by the last user}  noqa: E800
+_idle_since: dict[tuple[type, Any, Any], float] = {}
+
+
+def acquire_watcher(
+    watcher_class: type[WATCHER_TYPE], si: SiHandler, container: ManagedEntityHandler
+) -> WATCHER_TYPE:
+    """Get the shared watcher for the session and container.
+
+    The watcher is created and populated in background on the first call and kept
+    warm after release, so next flows in the session start with up-to-date data.
+    It's destroyed when the session disconnects or after it's unused for
+    IDLE_TIMEOUT.
+    """
+    _destroy_idle_watchers()
+    session_key = si.session_key
+    key = (watcher_class, session_key, container.get_vc_obj())
+    with _watchers_lock:
+        if watcher := shared_watchers.get(key):
+            watcher._refs += 1
+            _idle_since.pop(key, None)
+            return watcher
+
+    # creating Property Collector is a SOAP call, it doesn't block other watchers
+    new_watcher = watcher_class(si, container)
+    with _watchers_lock:
+        if not (watcher := shared_watchers.get(key)):
+            watcher = new_watcher
+            if not any(k[1] == session_key for k in shared_watchers):
+                si.add_on_disconnect(partial(destroy_watchers, session_key))
+            shared_watchers[key] = watcher
+        watcher._refs += 1
+        _idle_since.pop(key, None)
+
+    if watcher is new_watcher:
+        watcher.populate_in_bg()
+    else:
+        new_watcher.destroy()  # created by another thread in the meantime
+    return watcher
+
+
+def release_watcher(watcher: SharedWatcher) -> None:
+    with _watchers_lock:
+        watcher._refs = max(watcher._refs - 1, 0)
+        if not watcher._refs:
+            for key, shared in shared_watchers.items():
+                if shared is watcher:
+                    _idle_since[key] = time.monotonic()
+    _destroy_idle_watchers()
+
+
+@contextmanager
+def shared_watcher(
+    watcher_class: type[WATCHER_TYPE], si: SiHandler, container: ManagedEntityHandler
+) -> Generator[WATCHER_TYPE, None, None]:
+    watcher = acquire_watcher(watcher_class, si, container)
+    try:
+        yield watcher
+    finally:
+        release_watcher(watcher)
+
+
+def destroy_watchers(session_key: Any) -> None:
+    with _watchers_lock:
+        keys = [key for key in shared_watchers if key[1] == session_key]
+        watchers = [_pop_watcher(key) for key in keys]
+
+    for watcher in watchers:
+        if watcher.in_use:
+            logger.warning(f"Destroying {watcher} that is still in use")
+        watcher.destroy()
+
+
+def _destroy_idle_watchers() -> None:
+    end_time = time.monotonic() - IDLE_TIMEOUT
+    with _watchers_lock:
+        keys = [key for key, since in _idle_since.items() if since < end_time]
+        watchers = [_pop_watcher(key) for key in keys]
+
+    for watcher in watchers:
+        try:
+            watcher.destroy()
+        except Exception:
+            # the session can be already closed
+            logger.warning(f"Failed to destroy idle {watcher}", exc_info=True)
+
+
+def _pop_watcher(key: tuple[type, Any, Any]) -> SharedWatcher:
+    _idle_since.pop(key, None)
+    return shared_watchers.pop(key)
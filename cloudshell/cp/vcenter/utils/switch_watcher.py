@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import logging
+import threading
+from contextlib import AbstractContextManager
+from typing import TYPE_CHECKING
+
+from attrs import define, field
+from pyVmomi import vim, vmodl
+
+from cloudshell.cp.vcenter.handlers.cluster_handler import HostHandler
+from cloudshell.cp.vcenter.handlers.switch_handler import (
+    AbstractSwitchHandler,
+    DvSwitchHandler,
+    DvSwitchNotFound,
+    VSwitchHandler,
+    VSwitchNotFound,
+)
+from cloudshell.cp.vcenter.handlers.vcenter_path import VcenterPath
+from cloudshell.cp.vcenter.utils.property_watcher import (
+    acquire_watcher,
+    create_property_collector,
+    release_watcher,
+    shared_watcher,
+)
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from cloudshell.cp.vcenter.handlers.managed_entity_handler import (
+        ManagedEntityHandler,
+    )
+    from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
+
+
+logger = logging.getLogger(__name__)
+
+DVS_NAME = "name"
+HOST_V_SWITCHES = "config.network.vswitch"
+
+
+@define
+class SwitchWatcher:
+    """Registry of the switches that is kept up-to-date by Property Collector.
+
+    Maps DvSwitch names to DvSwitch objects and vSwitch names to the hosts that
+    carry them, so resolving a switch doesn't need SOAP calls. DvSwitches with
+    the same name in different folders are resolved by the folder path.
+    """
+
+    _si: SiHandler
+    _container: ManagedEntityHandler
+    _recursive: bool = True
+    # {dvs_name: [dvs]}  noqa: E800
+    _dv_switches: dict[str, list[vim.DistributedVirtualSwitch]] = field(
+        init=False, factory=dict
+    )
+    _dv_switch_to_name: dict[vim.DistributedVirtualSwitch, str] = field(
+        init=False, factory=dict
+    )
+    # {host: {v_switch_name: v_switch}}  noqa: E800
+    _host_v_switches: dict[vim.HostSystem, dict[str, vim.host.VirtualSwitch]] = field(
+        init=False, factory=dict
+    )
+    _collector: vmodl.query.PropertyCollector = field(init=False)
+    _version: str = field(init=False, default="")
+    _lock: threading.Lock = field(init=False, factory=threading.Lock)
+    _refs: int = field(init=False, default=0)
+
+    def __attrs_post_init__(self):
+        logger.info("Creating Property Collector of Switch Watcher")
+        self._collector = create_property_collector(
+            self._si,
+            self._container,
+            {
+                vim.dvs.VmwareDistributedVirtualSwitch: [DVS_NAME],
+                vim.HostSystem: [HOST_V_SWITCHES],
+            },
+            self._recursive,
+        )
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.destroy()
+
+    @property
+    def in_use(self) -> bool:
+        return self._refs > 0
+
+    def populate_in_bg(self) -> None:
+        th = threading.Thread(target=self.update_switches, kwargs={"wait": 0})
+        th.start()
+
+    def destroy(self) -> None:
+        logger.info("Destroying Property Collector of Switch Watcher")
+        self._collector.Destroy()
+
+    def get_dv_switch(self, path: VcenterPath | str) -> DvSwitchHandler:
+        """Get DvSwitch by the path in the network folder of the datacenter.
+
+        The name without folders matches the only DvSwitch with this name in
+        any folder, otherwise the one in the network folder.
+        """
+        if not isinstance(path, VcenterPath):
+            path = VcenterPath(path)
+        name = path.pop()
+        folders = list(path)
+        self.update_switches(wait=0)
+        candidates = self._dv_switches.get(name, []).copy()
+        if folders or len(candidates) > 1:
+            # checking folders needs SOAP calls, done for ambiguous names only
+            candidates = [c for c in candidates if _get_folder_names(c) == folders]
+        if not candidates:
+            raise DvSwitchNotFound(self._container, name)
+        return DvSwitchHandler(candidates[0], self._si)
+
+    def get_v_switch(self, name: str, host: HostHandler) -> VSwitchHandler:
+        self.update_switches(wait=0)
+        v_switches = self._host_v_switches.get(host.get_vc_obj(), {})
+        if not (v_switch := v_switches.get(name)):
+            raise VSwitchNotFound(host, name)
+        return VSwitchHandler(v_switch, host)
+
+    def get_switch(self, name: str, host: HostHandler) -> AbstractSwitchHandler:
+        """Get DvSwitch or host's vSwitch if there is no DvSwitch with the name."""
+        try:
+            switch = self.get_dv_switch(name)
+        except DvSwitchNotFound:
+            switch = self.get_v_switch(name, host)
+        return switch
+
+    def get_hosts_with_v_switch(self, name: str) -> list[HostHandler]:
+        self.update_switches(wait=0)
+        return [
+            HostHandler(vc_host, self._si)
+            for vc_host, v_switches in self._host_v_switches.copy().items()
+            if name in v_switches
+        ]
+
+    def update_switches(self, wait: int) -> None:
+        with self._lock:
+            self._update_switches(wait)
+
+    def _update_switches(self, wait: int) -> None:
+        options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=wait)
+        wait_fn = self._collector.WaitForUpdatesEx
+        while update_set := wait_fn(version=self._version, options=options):
+            self._version = update_set.version
+
+            for obj_set in update_set.filterSet[0].objectSet:
+                params = {c.name: c.val for c in obj_set.changeSet}
+                if obj_set.kind == "leave":
+                    self._remove_obj(obj_set.obj)
+                elif DVS_NAME in params:
+                    self._remove_obj(obj_set.obj)  # DvSwitch could be renamed
+                    dvs_list = self._dv_switches.setdefault(params[DVS_NAME], [])
+                    dvs_list.append(obj_set.obj)
+                    self._dv_switch_to_name[obj_set.obj] = params[DVS_NAME]
+                elif HOST_V_SWITCHES in params:
+                    self._set_host_v_switches(obj_set.obj, params[HOST_V_SWITCHES])
+                elif any(n.startswith(HOST_V_SWITCHES) for n in params):
+                    # partial update of the vSwitch list, re-read it from the host
+                    vc_host = obj_set.obj
+                    self._set_host_v_switches(vc_host, vc_host.config.network.vswitch)
+
+    def _set_host_v_switches(
+        self, vc_host: vim.HostSystem, v_switches: list[vim.host.VirtualSwitch] | None
+    ) -> None:
+        self._host_v_switches[vc_host] = {
+            v_switch.name: v_switch for v_switch in v_switches or []
+        }
+
+    def _remove_obj(self, vc_obj) -> None:
+        if name := self._dv_switch_to_name.pop(vc_obj, None):
+            self._dv_switches[name].remove(vc_obj)
+            if not self._dv_switches[name]:
+                del self._dv_switches[name]
+        self._host_v_switches.pop(vc_obj, None)
+
+
+def _get_folder_names(vc_dvs: vim.DistributedVirtualSwitch) -> list[str]:
+    """Folders between the network folder of the datacenter and the DvSwitch."""
+    names = []
+    vc_folder = vc_dvs.parent
+    # the network folder is the child of the datacenter
+    while isinstance(vc_folder, vim.Folder) and isinstance(
+        vc_folder.parent, vim.Folder
+    ):
+        names.append(vc_folder.name)
+        vc_folder = vc_folder.parent
+    return names[::-1]
+
+
+def acquire_switch_watcher(
+    si: SiHandler, container: ManagedEntityHandler
+) -> SwitchWatcher:
+    return acquire_watcher(SwitchWatcher, si, container)
+
+
+def release_switch_watcher(watcher: SwitchWatcher) -> None:
+    release_watcher(watcher)
+
+
+def shared_switch_watcher(
+    si: SiHandler, container: ManagedEntityHandler
+) -> AbstractContextManager[SwitchWatcher]:
+    return shared_watcher(SwitchWatcher, si, container)
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+from attrs import define
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.handlers.managed_entity_handler import (
+    ManagedEntityNotFound,
+)
+from cloudshell.cp.vcenter.handlers.task import Task, TaskState
+from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+
+if TYPE_CHECKING:
+    from cloudshell.cp.vcenter.handlers.datastore_handler import DatastoreHandler
+    from cloudshell.cp.vcenter.handlers.folder_handler import FolderHandler
+    from cloudshell.cp.vcenter.handlers.resource_pool import ResourcePoolHandler
+
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_REPLICA_FOLDER = "QS_TEMPLATE_REPLICA"
+REPLICA_NAME_PREFIX = "QS_REPLICA"
+RETIRED_PREFIX = "retired_"
+MAX_TEMPLATE_NAME_LENGTH = 40
+# cloning the replica is expected to be finished in this time
+PENDING_TIMEOUT = 60 * 60
+# deployments started before the replica was retired can still clone from it
+RETIRE_GRACE_PERIOD = PENDING_TIMEOUT
+
+# process-wide catalog shared by deployments of all templates
+_lock = threading.Lock()
+# {template_id: {datastore_id: number of deployments}}  noqa: E800
+_usage: defaultdict[str, Counter[str]] = defaultdict(Counter)
+# {replica_name: (time the clone task was started, clone task)}  noqa: E800
+_pending: dict[str, tuple[float, Task | None]] = {}
+# {replica_name: time the replica was found outdated}  noqa: E800
+_retiring: dict[str, float] = {}
+# {replica_name: destroy task}  noqa: E800
+_removing: dict[str, Task | None] = {}
+
+
+def _digest(key: str) -> str:
+    return hashlib.sha1(key.encode()).hexdigest()[:8]
+
+
+@define
+class TemplateReplicas:
+    """Replicas of the template on the most used target datastores.
+
+    A clone within the datastore can be offloaded to the storage array, a clone
+    to another datastore copies the data over the network. Replicas are full
+    clones of the template in the replica folder, they are named by the template
+    version and the datastore, so the folder is the catalog shared by every
+    driver process. Replicas of the changed template are replaced.
+
+    Replicas are never removed right away, deployments may still clone from them.
+    The less used replica is renamed, so no process picks it up anymore, and
+    outdated replicas are destroyed after the grace period.
+    """
+
+    _vm_template: VmHandler
+    _replica_folder: FolderHandler
+    _vm_resource_pool: ResourcePoolHandler
+    _max_replicas: int
+
+    @property
+    def _template_id(self) -> str:
+        return self._vm_template.get_vc_obj()._moId
+
+    @property
+    def _prefix(self) -> str:
+        """Prefix of replicas of every template version."""
+        template_name = self._vm_template.name[:MAX_TEMPLATE_NAME_LENGTH]
+        return f"{REPLICA_NAME_PREFIX}_{template_name}_{_digest(self._template_id)}_"
+
+    @property
+    def _version_prefix(self) -> str:
+        return f"{self._prefix}{_digest(self._vm_template.change_version)}_"
+
+    def get_replica(self, vm_storage: DatastoreHandler) -> VmHandler | None:
+        """Get the ready replica on the datastore, None if there is no one."""
+        ds_id = vm_storage.get_vc_obj()._moId
+        with _lock:
+            _usage[self._template_id][ds_id] += 1
+
+        replica = self._get_replicas().get(ds_id)
+        if replica:
+            logger.info(f"Cloning from the {replica} of the {self._vm_template}")
+        return replica
+
+    def refresh(self, vm_storage: DatastoreHandler) -> None:
+        """Remove outdated replicas and start cloning the missing one.
+
+        Clone and destroy tasks are completed by vCenter, so the refresh doesn't
+        wait for them, their results are checked on the next refresh.
+        """
+        try:
+            self._refresh(vm_storage)
+        except Exception:
+            logger.warning(
+                f"Failed to refresh replicas of the {self._vm_template}", exc_info=True
+            )
+
+    def _refresh(self, vm_storage: DatastoreHandler) -> None:
+        ds_id = vm_storage.get_vc_obj()._moId
+        replicas, outdated = {}, {}
+        for vm in self._get_members():
+            if vm.name.startswith(self._version_prefix):
+                replicas[vm.name.removeprefix(self._version_prefix)] = vm
+            else:
+                outdated[vm.name] = vm
+        self._remove_outdated(outdated)
+
+        name = f"{self._version_prefix}{ds_id}"
+        finished = self._get_finished_tasks()
+        with _lock:
+            usage = _usage[self._template_id]
+            most_used = [ds for ds, _ in usage.most_common(self._max_replicas)]
+            pending = self._get_pending(replicas, finished)
+            if ds_id not in most_used or ds_id in replicas or name in pending:
+                return
+            _pending[name] = (time.monotonic(), None)
+            # the least used replica gives place to the more used datastore
+            extra = sorted(replicas, key=lambda ds: usage[ds])
+            extra = extra[: len(replicas) + len(pending) + 1 - self._max_replicas]
+
+        try:
+            for extra_ds_id in extra:
+                replica = replicas[extra_ds_id]
+                logger.info(f"Retiring less used replica {replica}")
+                retired_name = f"{int(time.time())}_{extra_ds_id}"
+                replica.rename(f"{self._prefix}{RETIRED_PREFIX}{retired_name}")
+            logger.info(f"Creating replica of the {self._vm_template} on {vm_storage}")
+            task = self._vm_template.clone_vm_in_bg(
+                name, vm_storage, self._replica_folder, self._vm_resource_pool
+            )
+        except Exception:
+            with _lock:
+                _pending.pop(name, None)
+            raise
+        with _lock:
+            _pending[name] = (_pending[name][0], task)
+
+    def _remove_outdated(self, outdated: dict[str, VmHandler]) -> None:
+        """Destroy outdated replicas that nobody has cloned from in a while."""
+        now = time.monotonic()
+        with _lock:
+            for name in list(_retiring):
+                if name.startswith(self._prefix) and name not in outdated:
+                    del _retiring[name]  # removed
+            to_remove = []
+            for name, vm in outdated.items():
+                retired = _retiring.setdefault(name, now)
+                if now - retired > RETIRE_GRACE_PERIOD and name not in _removing:
+                    to_remove.append(vm)
+                    _removing[name] = None
+
+        for vm in to_remove:
+            logger.info(f"Removing outdated replica {vm}")
+            try:
+                task = Task(vm.get_vc_obj().Destroy_Task())  # do not wait
+            except Exception:
+                logger.warning(f"Failed to remove replica {vm}", exc_info=True)
+                task = None
+            with _lock:
+                if task:
+                    _removing[vm.name] = task
+                else:
+                    del _removing[vm.name]
+
+    @staticmethod
+    def _get_finished_tasks() -> set[str]:
+        """Names of replicas whose clone or destroy task has finished.
+
+        Failed tasks are logged, destroying the replica is repeated on the next
+        refresh and cloning is repeated when the datastore is used again.
+        """
+        with _lock:
+            tasks = {name: task for name, (_, task) in _pending.items() if task}
+            removing = {name: task for name, task in _removing.items() if task}
+
+        finished = set()
+        for name, task in [*tasks.items(), *removing.items()]:
+            try:
+                state = task.state
+            except Exception:
+                logger.warning(f"Failed to check {task} of {name}", exc_info=True)
+                state = TaskState.error
+            else:
+                if state is TaskState.error:
+                    logger.warning(f"{task} of {name} failed. {task.error_msg}")
+            if state in (TaskState.success, TaskState.error):
+                finished.add(name)
+
+        with _lock:
+            for name in finished:
+                if _removing.get(name) is removing.get(name, False):
+                    del _removing[name]
+        return finished
+
+    def _get_replicas(self) -> dict[str, VmHandler]:
+        """Replicas of the current template version by datastore id."""
+        with _lock:
+            pending = set(_pending)
+        return {
+            vm.name.removeprefix(self._version_prefix): vm
+            for vm in self._get_members()
+            if vm.name.startswith(self._version_prefix) and vm.name not in pending
+        }
+
+    def _get_pending(
+        self, replicas: dict[str, VmHandler], finished: set[str]
+    ) -> list[str]:
+        """Names of replicas that are being cloned, should be called with lock."""
+        now = time.monotonic()
+        existing = {f"{self._version_prefix}{ds_id}" for ds_id in replicas}
+        for name, (started, task) in list(_pending.items()):
+            if (
+                name in existing
+                or (task and name in finished)
+                or now - started > PENDING_TIMEOUT
+            ):
+                del _pending[name]
+        return [name for name in _pending if name.startswith(self._version_prefix)]
+
+    def _get_members(self) -> Iterator[VmHandler]:
+        for vc_vm in self._replica_folder.find_items(vim.VirtualMachine):
+            try:
+                if vc_vm.name.startswith(self._prefix):
+                    yield VmHandler(vc_vm, self._replica_folder.si)
+            except ManagedEntityNotFound:
+                continue  # removed by someone else
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from contextlib import AbstractContextManager
+from typing import TYPE_CHECKING
+
+from attrs import define, field
+from pyVmomi import vim, vmodl
+
+from cloudshell.cp.vcenter.handlers.snapshot_handler import SnapshotHandler
+from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+from cloudshell.cp.vcenter.utils.property_watcher import (
+    acquire_watcher,
+    release_watcher,
+    shared_watcher,
+)
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
+
+    from cloudshell.cp.vcenter.handlers.dc_handler import DcHandler
+    from cloudshell.cp.vcenter.handlers.si_handler import SiHandler
+
+
+logger = logging.getLogger(__name__)
+
+# any change of the VM config or its snapshots invalidates resolved sources
+WATCHED_PROPS = ["config.changeVersion", "snapshot"]
+
+
+@define(frozen=True)
+class VmSource:
+    """Resolved VM or template to clone from."""
+
+    vm: VmHandler
+    snapshot: SnapshotHandler | None
+    num_vnics: int
+    guest_id: str | None
+
+
+@define
+class TemplateWatcher:
+    """Cache of resolved clone sources kept up-to-date by Property Collector.
+
+    Sources are cached by VM and snapshot paths. Every cached VM is watched and
+    its sources are dropped when its config or snapshots change. Sources are
+    resolved without the lock, the lock protects the cache and the collector.
+    """
+
+    _si: SiHandler
+    _container: DcHandler
+    # {(vm_path, snapshot_path): VmSource}  noqa: E800
+    _sources: dict[tuple[str, str], VmSource] = field(init=False, factory=dict)
+    _watched_vms: set[vim.VirtualMachine] = field(init=False, factory=set)
+    # {vc_vm: number of changes}  noqa: E800
+    _changes: Counter[vim.VirtualMachine] = field(init=False, factory=Counter)
+    _collector: vmodl.query.PropertyCollector = field(init=False)
+    _version: str = field(init=False, default="")
+    _lock: threading.Lock = field(init=False, factory=threading.Lock)
+    _refs: int = field(init=False, default=0)
+
+    def __attrs_post_init__(self):
+        logger.info("Creating Property Collector of Template Watcher")
+        vc_si = self._si.get_vc_obj()
+        self._collector = vc_si.content.propertyCollector.CreatePropertyCollector()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.destroy()
+
+    @property
+    def in_use(self) -> bool:
+        return self._refs > 0
+
+    def populate_in_bg(self) -> None:
+        """Sources are resolved on demand, nothing to populate."""
+
+    def destroy(self) -> None:
+        logger.info("Destroying Property Collector of Template Watcher")
+        self._collector.Destroy()
+
+    def get_source(self, vm_path: str, snapshot_path: str = "") -> VmSource:
+        key = (str(vm_path), str(snapshot_path or ""))
+        with self._lock:
+            self._update_sources()
+            if source := self._sources.get(key):
+                logger.debug(f"Got resolved source {source.vm} from the cache")
+                return source
+
+        vm = self._container.get_vm_by_path(key[0])
+        vc_vm = vm.get_vc_obj()
+        with self._lock:
+            # start watching before reading the VM so changes are not missed
+            self._watch(vc_vm)
+            changes = self._changes[vc_vm]
+        source = self._read_source(vm, key[1])
+        with self._lock:
+            self._update_sources()
+            # the source read while the VM was changing is not cached
+            if self._changes[vc_vm] == changes:
+                self._sources[key] = source
+        return source
+
+    @staticmethod
+    def _read_source(vm: VmHandler, snapshot_path: str) -> VmSource:
+        snapshot = vm.get_snapshot_by_path(snapshot_path) if snapshot_path else None
+        return VmSource(vm, snapshot, len(vm.vnics), vm.guest_id)
+
+    def _watch(self, vc_vm: vim.VirtualMachine) -> None:
+        if vc_vm in self._watched_vms:
+            return
+
+        # noinspection PyUnresolvedReferences
+        obj_spec = vmodl.query.PropertyCollector.ObjectSpec()
+        obj_spec.obj = vc_vm
+        obj_spec.skip = False
+
+        # noinspection PyUnresolvedReferences
+        prop_spec = vmodl.query.PropertyCollector.PropertySpec()
+        prop_spec.type = vim.VirtualMachine
+        prop_spec.pathSet = WATCHED_PROPS
+
+        # noinspection PyUnresolvedReferences
+        filter_spec = vmodl.query.PropertyCollector.FilterSpec()
+        filter_spec.objectSet = [obj_spec]
+        filter_spec.propSet = [prop_spec]
+
+        self._collector.CreateFilter(filter_spec, partialUpdates=True)
+        self._watched_vms.add(vc_vm)
+        # consume initial values
+        self._update_sources()
+
+    def _update_sources(self) -> None:
+        options = vmodl.query.PropertyCollector.WaitOptions(maxWaitSeconds=0)
+        wait_fn = self._collector.WaitForUpdatesEx
+        while update_set := wait_fn(version=self._version, options=options):
+            self._version = update_set.version
+
+            for filter_set in update_set.filterSet:
+                for obj_set in filter_set.objectSet:
+                    if obj_set.kind == "enter":
+                        continue  # initial values of the new filter
+                    self._invalidate(obj_set.obj)
+
+    def _invalidate(self, vc_vm: vim.VirtualMachine) -> None:
+        self._changes[vc_vm] += 1
+        for key, source in list(self._sources.items()):
+            if source.vm.get_vc_obj() == vc_vm:
+                logger.info(f"{source.vm} is changed, drop resolved source")
+                del self._sources[key]
+
+
+def acquire_template_watcher(si: SiHandler, dc: DcHandler) -> TemplateWatcher:
+    return acquire_watcher(TemplateWatcher, si, dc)
+
+
+def release_template_watcher(watcher: TemplateWatcher) -> None:
+    release_watcher(watcher)
+
+
+def shared_template_watcher(
+    si: SiHandler, dc: DcHandler
+) -> AbstractContextManager[TemplateWatcher]:
+    return shared_watcher(TemplateWatcher, si, dc)
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from attrs import define
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.handlers.managed_entity_handler import (
+    ManagedEntityNotFound,
+)
+from cloudshell.cp.vcenter.handlers.task import TaskFailed
+from cloudshell.cp.vcenter.handlers.vm_handler import (
+    CUSTOMIZATION_PENDING_KEY,
+    PowerState,
+    VmHandler,
+)
+
+if TYPE_CHECKING:
+    from cloudshell.cp.vcenter.handlers.config_spec_handler import (
+        ConfigSpecHandler,
+    )
+    from cloudshell.cp.vcenter.handlers.custom_spec_handler import CustomSpecHandler
+    from cloudshell.cp.vcenter.handlers.datastore_handler import DatastoreHandler
+    from cloudshell.cp.vcenter.handlers.folder_handler import FolderHandler
+    from cloudshell.cp.vcenter.handlers.resource_pool import ResourcePoolHandler
+    from cloudshell.cp.vcenter.handlers.snapshot_handler import SnapshotHandler
+    from cloudshell.cp.vcenter.handlers.task import ON_TASK_PROGRESS_TYPE
+
+
+logger = logging.getLogger(__name__)
+
+VM_POOL_FOLDER = "QS_VM_POOL"
+POOL_NAME_PREFIX = "QS_POOL"
+MAX_TEMPLATE_NAME_LENGTH = 40
+# extra config option that marks the pool member as claimed by the deployment
+CLAIMED_KEY = "qs.vmPool.claimedAt"
+# member that is claimed but not moved from the pool for so long is orphaned
+CLAIM_TIMEOUT = 10 * 60
+# cloning the member is expected to be finished in this time
+PENDING_TIMEOUT = 60 * 60
+
+# process-wide state shared by pools of all deployments
+_lock = threading.Lock()
+# names of members that are being claimed by this process
+_claimed: set[str] = set()
+# {member_name: time the clone task was started}  noqa: E800
+_pending: dict[str, float] = {}
+
+
+def get_pool_vm_prefix(
+    vm_template: VmHandler,
+    vm_snapshot: SnapshotHandler | None,
+    vm_resource_pool: ResourcePoolHandler,
+    vm_storage: DatastoreHandler,
+) -> str:
+    """Prefix of pool members cloned from the source to the placement."""
+    objs = (vm_template, vm_snapshot, vm_resource_pool, vm_storage)
+    key = "/".join(obj.get_vc_obj()._moId for obj in objs if obj)
+    digest = hashlib.sha1(key.encode()).hexdigest()[:8]
+    template_name = vm_template.name[:MAX_TEMPLATE_NAME_LENGTH]
+    return f"{POOL_NAME_PREFIX}_{template_name}_{digest}_"
+
+
+@define
+class VmPool:
+    """Pool of pre-cloned powered off VMs of the source.
+
+    Members live in the pool folder and are named by the source and the placement,
+    so deployments of every driver process share them. Claiming a member moves
+    it into the VM folder, renames it and reconfigures it in one task instead of
+    cloning a new VM. The claim reconfiguration uses the member's change version,
+    so only one deployment can claim the member.
+    """
+
+    _vm_template: VmHandler
+    _vm_snapshot: SnapshotHandler | None
+    _vm_resource_pool: ResourcePoolHandler
+    _vm_storage: DatastoreHandler
+    _pool_folder: FolderHandler
+    _size: int
+
+    @property
+    def _prefix(self) -> str:
+        return get_pool_vm_prefix(
+            self._vm_template,
+            self._vm_snapshot,
+            self._vm_resource_pool,
+            self._vm_storage,
+        )
+
+    def claim(
+        self,
+        vm_name: str,
+        vm_folder: FolderHandler,
+        config_spec: ConfigSpecHandler,
+        on_task_progress: ON_TASK_PROGRESS_TYPE | None = None,
+        customization: CustomSpecHandler | None = None,
+    ) -> VmHandler | None:
+        """Turn a pool member into the VM, None if the pool is empty.
+
+        The customization spec is applied on the first power on like for clones.
+        """
+        for vm in self._get_members():
+            if self._is_stale(vm) or CLAIMED_KEY in vm.extra_config:
+                continue
+            with _lock:
+                if vm.name in _claimed:
+                    continue
+                _claimed.add(vm.name)
+            try:
+                claimed = self._claim_member(
+                    vm, config_spec, on_task_progress, bool(customization)
+                )
+            finally:
+                with _lock:
+                    _claimed.discard(vm.name)
+            if claimed:
+                break
+        else:
+            logger.info(f"VM pool {self._prefix} is empty")
+            return None
+
+        try:
+            if customization:
+                vm.add_customization_spec(customization)
+            vm_folder.put_inside(vm)
+            vm.rename(vm_name, on_task_progress)
+        except Exception:
+            vm.delete()
+            raise
+        logger.info(f"{vm} is claimed from the VM pool {self._prefix}")
+        return vm
+
+    def _claim_member(
+        self,
+        vm: VmHandler,
+        config_spec: ConfigSpecHandler,
+        on_task_progress: ON_TASK_PROGRESS_TYPE | None,
+        customize: bool,
+    ) -> bool:
+        extra_config = {CLAIMED_KEY: str(time.time())}
+        if customize:
+            extra_config[CUSTOMIZATION_PENDING_KEY] = "true"
+        try:
+            vm.reconfigure_vm(
+                config_spec,
+                on_task_progress,
+                change_version=vm.change_version,
+                extra_config=extra_config,
+            )
+        except (TaskFailed, ManagedEntityNotFound) as e:
+            # claimed or removed by another process
+            logger.info(f"Cannot claim {vm} from the VM pool. {e}")
+            return False
+        return True
+
+    def refill(self) -> None:
+        """Remove stale members and start cloning the missing ones.
+
+        Clone tasks are completed by vCenter, so the refill doesn't wait for them.
+        """
+        try:
+            self._refill()
+        except Exception:
+            logger.warning(
+                f"Failed to refill the VM pool {self._prefix}", exc_info=True
+            )
+
+    def _refill(self) -> None:
+        free = set()
+        for vm in self._get_members():
+            if self._is_orphaned(vm) or (
+                CLAIMED_KEY not in vm.extra_config and self._is_stale(vm)
+            ):
+                logger.info(f"Removing stale {vm} from the VM pool")
+                vm.get_vc_obj().Destroy_Task()  # do not wait
+            elif CLAIMED_KEY not in vm.extra_config:
+                free.add(vm.name)
+
+        with _lock:
+            pending = self._get_pending(free)
+            names = [
+                f"{self._prefix}{uuid4().hex[:8]}"
+                for _ in range(self._size - len(free) - len(pending))
+            ]
+            _pending.update(dict.fromkeys(names, time.monotonic()))
+
+        for name in names:
+            try:
+                self._vm_template.clone_vm_in_bg(
+                    name,
+                    self._vm_storage,
+                    self._pool_folder,
+                    self._vm_resource_pool,
+                    self._vm_snapshot,
+                )
+            except Exception:
+                with _lock:
+                    for failed_name in names[names.index(name) :]:
+                        _pending.pop(failed_name, None)
+                raise
+
+    def _get_pending(self, existing: set[str]) -> list[str]:
+        """Names of members that are being cloned, should be called with lock."""
+        now = time.monotonic()
+        for name, started in list(_pending.items()):
+            if name in existing or now - started > PENDING_TIMEOUT:
+                del _pending[name]
+        return [name for name in _pending if name.startswith(self._prefix)]
+
+    def _get_members(self) -> Iterator[VmHandler]:
+        for vc_vm in self._pool_folder.find_items(vim.VirtualMachine):
+            try:
+                if vc_vm.name.startswith(self._prefix):
+                    yield VmHandler(vc_vm, self._pool_folder.si)
+            except ManagedEntityNotFound:
+                continue  # removed by someone else
+
+    def _is_stale(self, vm: VmHandler) -> bool:
+        """The member is cloned before the source was changed."""
+        created_at = vm.created_at
+        return (
+            created_at is None
+            or created_at < self._vm_template.modified_at
+            or vm.power_state is not PowerState.OFF
+        )
+
+    @staticmethod
+    def _is_orphaned(vm: VmHandler) -> bool:
+        """The member is claimed but the deployment failed to move it."""
+        claimed_at = vm.extra_config.get(CLAIMED_KEY)
+        return claimed_at is not None and (
+            time.time() - float(claimed_at) > CLAIM_TIMEOUT
+        )
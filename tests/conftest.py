@@ -348,7 +348,7 @@ def property_collector(si):
     m = Mock()
     si.get_vc_obj().content.propertyCollector.CreatePropertyCollector.return_value = m
     # no updates
-    m.WaitForUpdatesEx.side_effect = [None]
+    m.WaitForUpdatesEx.return_value = None
     return m
 
 
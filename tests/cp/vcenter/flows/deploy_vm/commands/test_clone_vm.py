@@ -1,8 +1,14 @@
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import pytest
 
 from cloudshell.cp.vcenter.flows.deploy_vm.commands import CloneVMCommand
+from cloudshell.cp.vcenter.utils.clone_governor import (
+    HOST,
+    SOURCE_DATASTORE,
+    TARGET_DATASTORE,
+    CloneLimits,
+)
 
 
 @pytest.fixture
@@ -52,3 +58,80 @@ def test_rollback(command, vm_folder):
 
     cloned_vm.delete.assert_called_once()
     vm_folder.destroy.assert_called_once()
+
+
+def test_shared_folder_is_not_removed(vm_template, vm_folder, cancellation_manager):
+    vm_template.clone_vm.side_effect = Exception()
+    command = CloneVMCommand(
+        vm_template=vm_template,
+        rollback_manager=Mock(),
+        cancellation_manager=cancellation_manager,
+        vm_name="name",
+        vm_storage=Mock(),
+        vm_folder=vm_folder,
+        shared_folder=True,
+    )
+
+    with pytest.raises(Exception):
+        command.execute()
+    command._cloned_vm = Mock()
+    command.rollback()
+
+    vm_folder.destroy.assert_not_called()
+
+
+def test_clone_with_limits(vm_template, vm_folder, cancellation_manager):
+    vm_template.datastores = [Mock()]
+    vm_template.datastores[0].name = "src"
+    vm_template.host.name = "host"
+    vm_storage = Mock()
+    vm_storage.name = "dst"
+    command = CloneVMCommand(
+        vm_template=vm_template,
+        rollback_manager=Mock(),
+        cancellation_manager=cancellation_manager,
+        vm_name="name",
+        vm_storage=vm_storage,
+        vm_folder=vm_folder,
+        clone_limits=CloneLimits(source_datastore=1, target_datastore=2),
+    )
+
+    with patch(f"{CloneVMCommand.__module__}.clone_governor") as governor:
+        command.execute()
+
+    governor.clone_slot.assert_called_once_with(
+        {
+            (TARGET_DATASTORE, "dst"): 2,
+            (SOURCE_DATASTORE, "src"): 1,
+            (HOST, "host"): 0,
+        },
+        command._is_cancelled,
+    )
+    vm_template.clone_vm.assert_called_once()
+
+
+def test_clone_host_limit_on_pinned_host(vm_template, vm_folder, cancellation_manager):
+    vm_template.datastores = []
+    vm_template.host.name = "template host"
+    vm_host = Mock()
+    vm_host.name = "pinned host"
+    vm_storage = Mock()
+    vm_storage.name = "dst"
+    command = CloneVMCommand(
+        vm_template=vm_template,
+        rollback_manager=Mock(),
+        cancellation_manager=cancellation_manager,
+        vm_name="name",
+        vm_storage=vm_storage,
+        vm_folder=vm_folder,
+        clone_limits=CloneLimits(host=1),
+        vm_host=vm_host,
+    )
+
+    with patch(f"{CloneVMCommand.__module__}.clone_governor") as governor:
+        command.execute()
+
+    governor.clone_slot.assert_called_once_with(
+        {(TARGET_DATASTORE, "dst"): 0, (HOST, "pinned host"): 1},
+        command._is_cancelled,
+    )
@@ -0,0 +1,124 @@
+from concurrent.futures import Future
+from unittest.mock import Mock
+
+import pytest
+
+from cloudshell.cp.vcenter.flows.deploy_vm import base_flow
+from cloudshell.cp.vcenter.flows.deploy_vm.commands import (
+    CloneVMCommand,
+)
+from cloudshell.cp.vcenter.flows.deploy_vm.commands import (
+    create_custom_spec as custom_spec_module,
+)
+from cloudshell.cp.vcenter.flows.deploy_vm.from_template import (
+    VCenterDeployVMFromTemplateFlow,
+)
+from cloudshell.cp.vcenter.handlers.storage_pod_handler import StoragePodHandler
+from cloudshell.cp.vcenter.utils.template_watcher import VmSource
+
+
+def _future(result=None, error=None):
+    future = Future()
+    if error:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+class Flow(VCenterDeployVMFromTemplateFlow):
+    def _create_vm(
+        self, deploy_app, vm_name, vm_resource_pool, vm_storage, vm_folder, dc
+    ):
+        vm_source = VmSource(Mock(), None, 1, None)
+        self._create_vm_customization_spec(deploy_app, vm_source, vm_name)
+        return CloneVMCommand(
+            vm_template=vm_source.vm,
+            rollback_manager=self._rollback_manager,
+            cancellation_manager=self._cancellation_manager,
+            vm_name=vm_name,
+            vm_storage=vm_storage,
+            vm_folder=vm_folder,
+        ).execute()
+
+
+@pytest.fixture()
+def vsphere_client(monkeypatch):
+    client = Mock()
+    client.get_or_create_tag_ids_in_bg.return_value = _future(["tag-id"])
+    monkeypatch.setattr(
+        base_flow.VSphereSDKHandler, "from_config", Mock(return_value=client)
+    )
+    return client
+
+
+@pytest.fixture()
+def dc(monkeypatch):
+    dc = Mock()
+    dc.get_datastore_or_storage_pod.return_value = Mock(free_space=100)
+    monkeypatch.setattr(base_flow.DcHandler, "get_dc", Mock(return_value=dc))
+    return dc
+
+
+def test_failed_tagging_rolls_back_vm(
+    vsphere_client, dc, monkeypatch, cancellation_manager
+):
+    monkeypatch.setattr(custom_spec_module, "get_custom_spec_params", Mock())
+    monkeypatch.setattr(custom_spec_module, "prepare_custom_spec", Mock())
+    vsphere_client.attach_tags_in_bg.return_value = _future(error=ValueError())
+    si = Mock()
+    conf = Mock(customize_on_clone=False)
+    flow = Flow(si, conf, Mock(), Mock(), cancellation_manager)
+    flow._validate_deploy_app = Mock()
+    flow._prepare_vm_folder_path = Mock()
+    flow._prepare_deploy_app_result = Mock()
+    deploy_app = Mock(autogenerated_name=False, app_name="vm")
+
+    with pytest.raises(ValueError):
+        flow._deploy(Mock(deploy_app=deploy_app))
+
+    si.delete_customization_spec.assert_called_once_with("vm")
+    vm, folder = vsphere_client.attach_tags_in_bg.call_args.args[0]
+    vm.delete.assert_called_once()
+    folder.destroy.assert_called()
+
+
+@pytest.mark.parametrize("in_storage_pod", [False, True])
+def test_vm_size_for_storage_pod_only(
+    in_storage_pod, vsphere_client, monkeypatch, cancellation_manager
+):
+    datastore = Mock(free_space=100)
+    vm_storage = datastore
+    if in_storage_pod:
+        monkeypatch.setattr(StoragePodHandler, "datastores", [datastore])
+        vm_storage = StoragePodHandler(Mock(), Mock())
+    flow = VCenterDeployVMFromTemplateFlow(
+        Mock(), Mock(), Mock(), Mock(), cancellation_manager
+    )
+    flow._get_vm_source = Mock()
+    flow._get_vm_size = Mock(return_value=10)
+    flow._create_vm_from_source = Mock()
+
+    flow._create_vm(Mock(), "vm", Mock(), vm_storage, Mock(), Mock())
+
+    flow._get_vm_source.assert_called_once()
+    assert flow._get_vm_size.called is in_storage_pod
+    vm_source = flow._get_vm_source.return_value
+    flow._create_vm_from_source.assert_called_once()
+    assert flow._create_vm_from_source.call_args.args[3] is datastore
+    assert flow._create_vm_from_source.call_args.args[6] is vm_source
+
+
+def test_discard_only_created_tags(vsphere_client, cancellation_manager):
+    def get_or_create_tag_ids_in_bg(created):
+        created.add("created-tag")
+        return _future(["cached-tag", "created-tag"])
+
+    vsphere_client.get_or_create_tag_ids_in_bg.side_effect = get_or_create_tag_ids_in_bg
+    flow = VCenterDeployVMFromTemplateFlow(
+        Mock(), Mock(), Mock(), Mock(), cancellation_manager
+    )
+
+    flow._discard_tag_ids(flow._get_tag_ids_in_bg())
+
+    vsphere_client.delete_unused_tags.assert_called_once_with({"created-tag"}, wait=0)
@@ -0,0 +1,119 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from cloudshell.cp.vcenter.flows.deploy_vm import base_flow, batch_flow
+from cloudshell.cp.vcenter.flows.deploy_vm.batch_flow import VCenterBatchDeployFlow
+from cloudshell.cp.vcenter.flows.deploy_vm.from_template import (
+    VCenterDeployVMFromTemplateFlow,
+)
+from cloudshell.cp.vcenter.flows.deploy_vm.placement import DeployPlacement
+from cloudshell.cp.vcenter.handlers.folder_handler import FolderIsNotEmpty
+from cloudshell.cp.vcenter.handlers.vcenter_path import VcenterPath
+from cloudshell.cp.vcenter.utils.template_watcher import VmSource
+
+
+def test_placement_resolves_once():
+    placement = DeployPlacement()
+    resolve_dc = Mock(side_effect=lambda: time.sleep(0.05) or "dc")
+
+    with ThreadPoolExecutor(5) as executor:
+        futures = [
+            executor.submit(placement.resolve, ("dc", "DC1"), resolve_dc)
+            for _ in range(5)
+        ]
+    assert [f.result() for f in futures] == ["dc"] * 5
+    resolve_dc.assert_called_once()
+    assert placement.timings["dc"].count == 1
+
+
+def test_placement_doesnt_cache_errors():
+    placement = DeployPlacement()
+    resolve_dc = Mock(side_effect=[ValueError, "dc"])
+
+    with pytest.raises(ValueError):
+        placement.resolve(("dc", "DC1"), resolve_dc)
+    assert placement.resolve(("dc", "DC1"), resolve_dc) == "dc"
+
+
+def test_batch_deploy(monkeypatch):
+    folder = Mock(destroy=Mock(side_effect=FolderIsNotEmpty(Mock())))
+
+    class Flow:
+        def __init__(self, *args, placement):
+            self._placement = placement
+
+        def deploy(self, request_actions):
+            self._placement.resolve(("vm_folder", "path"), lambda: folder)
+            if request_actions.deploy_app.actionId == "failed":
+                raise ValueError("failed to deploy")
+            return f"result {request_actions.deploy_app.actionId}"
+
+    monkeypatch.setattr(batch_flow, "get_deploy_flow", lambda _: Flow)
+    requests = [Mock(deploy_app=Mock(actionId=str(i))) for i in range(5)]
+    requests.append(Mock(deploy_app=Mock(actionId="failed")))
+    resource_config = Mock(max_deploy_workers=3)
+    flow = VCenterBatchDeployFlow(Mock(), resource_config, Mock(), Mock(), Mock())
+
+    results = flow.deploy(requests)
+
+    assert [r.result for r in results[:5]] == [f"result {i}" for i in range(5)]
+    assert isinstance(results[5].error, ValueError)
+    folder.destroy.assert_called_once()  # failed app, folder could be empty
+
+
+def test_batch_deploy_failed_clone_keeps_shared_folder(
+    monkeypatch, cancellation_manager
+):
+    monkeypatch.setattr(
+        base_flow.VSphereSDKHandler, "from_config", Mock(return_value=None)
+    )
+    dc = Mock()
+    folder = dc.get_or_create_vm_folder.return_value
+
+    def clone_vm(vm_name, vm_folder, **kwargs):
+        assert not vm_folder.destroy.called, "the folder is removed"
+        if vm_name == "0":
+            raise ValueError("failed to clone")
+        return f"vm {vm_name}"
+
+    vm_source = VmSource(Mock(clone_vm=Mock(side_effect=clone_vm)), None, 1, None)
+
+    class Flow(VCenterDeployVMFromTemplateFlow):
+        def deploy(self, request_actions):
+            deploy_app = request_actions.deploy_app
+            vm_folder = self._get_or_create_vm_folder(VcenterPath("folder"), dc)
+            with self._rollback_manager:
+                return self._clone_vm(
+                    deploy_app,
+                    deploy_app.actionId,
+                    Mock(),
+                    Mock(),
+                    vm_folder,
+                    dc,
+                    vm_source,
+                    Mock(),
+                    None,
+                )
+
+    monkeypatch.setattr(batch_flow, "get_deploy_flow", lambda _: Flow)
+    requests = [Mock(deploy_app=Mock(actionId=str(i))) for i in range(3)]
+    resource_config = Mock(
+        max_deploy_workers=1,  # the first clone fails before others start
+        template_replicas=0,
+        load_aware_host_placement=False,
+        max_clones_per_source_datastore=0,
+        max_clones_per_target_datastore=0,
+        max_clones_per_host=0,
+    )
+    flow = VCenterBatchDeployFlow(
+        Mock(), resource_config, Mock(), Mock(), cancellation_manager
+    )
+
+    results = flow.deploy(requests)
+
+    assert isinstance(results[0].error, ValueError)
+    assert [r.result for r in results[1:]] == ["vm 1", "vm 2"]
+    folder.destroy.assert_called_once()  # by the batch, after all apps
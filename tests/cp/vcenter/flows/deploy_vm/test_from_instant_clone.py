@@ -0,0 +1,40 @@
+import pytest
+
+from cloudshell.cp.vcenter.constants import VM_FROM_INSTANT_CLONE_DEPLOYMENT_PATH
+from cloudshell.cp.vcenter.flows.deploy_vm.from_instant_clone import get_guest_info
+from cloudshell.cp.vcenter.models.base_deployment_app import (
+    GuestInfoAttrRO,
+    IncorrectGuestInfoFormat,
+)
+
+
+class DeployApp:
+    DEPLOYMENT_PATH = VM_FROM_INSTANT_CLONE_DEPLOYMENT_PATH
+    guest_info = GuestInfoAttrRO("Guest Info")
+
+    def __init__(self, guest_info="", hostname=None, private_ip=None):
+        self.attributes = {f"{self.DEPLOYMENT_PATH}.Guest Info": guest_info}
+        self.hostname = hostname
+        self.private_ip = private_ip
+
+
+def test_guest_info():
+    deploy_app = DeployApp("role=web; guestinfo.dns = 8.8.8.8;", private_ip="10.0.0.5")
+
+    assert get_guest_info(deploy_app, "vm-name") == {
+        "guestinfo.hostname": "vm-name",
+        "guestinfo.ipaddress": "10.0.0.5",
+        "guestinfo.role": "web",
+        "guestinfo.dns": "8.8.8.8",
+    }
+
+
+def test_guest_info_hostname():
+    deploy_app = DeployApp(hostname="host")
+
+    assert get_guest_info(deploy_app, "vm-name") == {"guestinfo.hostname": "host"}
+
+
+def test_incorrect_guest_info():
+    with pytest.raises(IncorrectGuestInfoFormat):
+        DeployApp("role").guest_info
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from unittest.mock import Mock
 
 import pytest
 
@@ -9,10 +10,14 @@ from cloudshell.shell.flows.connectivity.parse_request_service import (
 )
 
 from cloudshell.cp.vcenter.flows.connectivity_flow import VCenterConnectivityFlow
+from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
 from cloudshell.cp.vcenter.models.connectivity_action_model import (
     VcenterConnectivityActionModel,
 )
-from cloudshell.cp.vcenter.utils.connectivity_helpers import DvSwitchNameEmpty
+from cloudshell.cp.vcenter.utils.connectivity_helpers import (
+    DvSwitchNameEmpty,
+    NetworkSettings,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -118,3 +123,35 @@ def test_validate_actions_switch_is_empty_but_we_use_user_created_network(
     resource_conf.default_dv_switch = None
     set_action.connection_params.vlan_service_attrs.existing_network = "network"
     flow.validate_actions([set_action])
+
+
+def test_network_settings_parsed_once_per_action(flow, monkeypatch):
+    # 100 actions used by 5 phases of the flow
+    actions = []
+    for i in range(100):
+        action_dict = {**ACTION_DICT, "actionId": f"action-{i}"}
+        actions.append(VcenterConnectivityActionModel.model_validate(action_dict))
+    convert = Mock(wraps=NetworkSettings.convert)
+    monkeypatch.setattr(NetworkSettings, "convert", convert)
+
+    first_phase = [flow._get_network_settings(a) for a in actions]
+    assert convert.call_count == 100
+
+    for _ in range(4):
+        assert [flow._get_network_settings(a) for a in actions] == first_phase
+    assert convert.call_count == 100
+
+
+def test_set_vlan_to_connected_vnic(flow, set_action, monkeypatch):
+    net_settings = flow._get_network_settings(set_action)
+    network = Mock()
+    flow._networks[net_settings.name] = network
+    vm = Mock(spec=VmHandler)
+    vnic = vm.get_vnic.return_value
+    vnic.is_connected_to_network.return_value = True
+
+    mac = flow.set_vlan(set_action, vm)
+
+    vnic.is_connected_to_network.assert_called_once_with(network)
+    vnic.connect.assert_not_called()
+    assert mac == vnic.mac_address
@@ -180,6 +180,8 @@ def test_save(flow, vm, dc_handler, resource_conf):
                 cpu_num=None, ram_amount=None, hdd_specs=[], bios_uuid=None
             ),
             on_task_progress=flow._on_task_progress,
+            vm_host=None,
+            customization=None,
         ),
         call.power_on(on_task_progress=flow._on_task_progress),
     ]
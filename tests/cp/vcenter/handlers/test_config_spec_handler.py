@@ -1,6 +1,7 @@
 from unittest.mock import Mock
 
 import pytest
+from pyVmomi import vim
 
 from cloudshell.cp.vcenter.handlers.config_spec_handler import (
     CannotChangeLinkedDisk,
@@ -45,3 +46,33 @@ def test_validate_spec_for_vm_linked_disk():
 
     with pytest.raises(CannotChangeLinkedDisk):
         spec._validate_hdd_spec(vm)
+
+
+@pytest.mark.parametrize(
+    ("hdd_specs", "linked", "has_parent", "expected"),
+    (
+        ([], True, True, True),
+        ([HddSpec(1, 10)], False, False, True),
+        ([HddSpec(1, 10)], True, False, False),
+        ([HddSpec(1, 10)], False, True, False),
+    ),
+)
+def test_can_be_applied_on_clone(hdd_specs, linked, has_parent, expected):
+    vm = Mock(disks=[Mock(index=1, has_parent=has_parent)])
+    spec = ConfigSpecHandler(2, None, hdd_specs)
+
+    assert spec.can_be_applied_on_clone(vm, linked) is expected
+
+
+def test_spec_connects_vnics():
+    vnic_spec = vim.vm.device.VirtualDeviceSpec()
+    vm = Mock(disks=[])
+    vm.get_vnic.return_value.get_connect_spec.return_value = vnic_spec
+    network = Mock()
+    spec = ConfigSpecHandler(None, None, [], vnic_networks={"2": network})
+
+    config_spec = spec.get_spec_for_vm(vm)
+
+    vm.get_vnic.assert_called_once_with("2")
+    vm.get_vnic.return_value.get_connect_spec.assert_called_once_with(network)
+    assert list(config_spec.deviceChange) == [vnic_spec]
@@ -0,0 +1,88 @@
+from unittest.mock import Mock
+
+import pytest
+
+from cloudshell.cp.vcenter.handlers import network_handler
+from cloudshell.cp.vcenter.handlers.network_handler import DVPortGroupHandler
+
+
+@pytest.fixture(autouse=True)
+def elastic_keys(monkeypatch):
+    monkeypatch.setattr(network_handler, "elastic_dv_port_group_keys", set())
+
+
+@pytest.fixture
+def vc_pg():
+    pg = Mock(key="pg-key")
+    pg.name = "QS_dvs_VLAN_10_Access"
+    pg.config.numPorts = 8
+    pg.config.autoExpand = False
+    pg.config.type = "earlyBinding"
+    pg.config.configVersion = "1"
+    pg.config.distributedVirtualSwitch.FetchDVPorts.return_value = [Mock()] * 6
+    pg.ReconfigureDVPortgroup_Task.return_value.info.state = "success"
+    return pg
+
+
+@pytest.fixture
+def dv_port_group(vc_pg, si):
+    return DVPortGroupHandler(vc_pg, si)
+
+
+def test_ensure_free_ports_enough(dv_port_group, vc_pg):
+    dv_port_group.ensure_free_ports(2)
+
+    vc_pg.ReconfigureDVPortgroup_Task.assert_not_called()
+
+
+def test_ensure_free_ports_elastic(dv_port_group, vc_pg):
+    vc_pg.config.autoExpand = True
+
+    dv_port_group.ensure_free_ports(20)
+
+    vc_pg.config.distributedVirtualSwitch.FetchDVPorts.assert_not_called()
+    vc_pg.ReconfigureDVPortgroup_Task.assert_not_called()
+    vc_pg.config.autoExpand = False
+    dv_port_group.ensure_free_ports(20)  # known to be elastic
+    vc_pg.config.distributedVirtualSwitch.FetchDVPorts.assert_not_called()
+
+
+def test_ensure_free_ports_elastic_in_another_vcenter(dv_port_group, vc_pg):
+    vc_pg.config.autoExpand = True
+    dv_port_group.ensure_free_ports(20)
+    vc_pg.config.autoExpand = False
+    other_si = Mock(instance_uuid="other-vcenter")
+
+    DVPortGroupHandler(vc_pg, other_si).ensure_free_ports(2)
+
+    vc_pg.config.distributedVirtualSwitch.FetchDVPorts.assert_called_once()
+
+
+def test_ensure_free_ports_ephemeral(dv_port_group, vc_pg):
+    vc_pg.name = "customer network"
+    vc_pg.config.type = "ephemeral"
+    vc_pg.config.numPorts = 0
+
+    dv_port_group.ensure_free_ports(3)
+
+    vc_pg.config.distributedVirtualSwitch.FetchDVPorts.assert_not_called()
+    vc_pg.ReconfigureDVPortgroup_Task.assert_not_called()
+
+
+def test_ensure_free_ports_not_shell_port_group(dv_port_group, vc_pg, caplog):
+    vc_pg.name = "customer network"
+
+    dv_port_group.ensure_free_ports(3)
+
+    assert "2 free ports but 3" in caplog.text
+    vc_pg.ReconfigureDVPortgroup_Task.assert_not_called()
+
+
+def test_ensure_free_ports_expands(dv_port_group, vc_pg, monkeypatch):
+    monkeypatch.setattr("cloudshell.cp.vcenter.handlers.network_handler.Task", Mock())
+
+    dv_port_group.ensure_free_ports(3)
+
+    spec = vc_pg.ReconfigureDVPortgroup_Task.call_args.args[0]
+    assert spec.numPorts == 9
+    assert spec.autoExpand is True
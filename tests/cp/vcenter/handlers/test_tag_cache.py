@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from cloudshell.cp.vcenter.handlers.tag_cache import TagsCache, TagsCacheStats
+from cloudshell.cp.vcenter.handlers.tag_cache_store import TagsCacheStore
+
+
+def test_tags_cache_shared_via_store(tmp_path):
+    path = str(tmp_path / "tags.db")
+    cache1 = TagsCache(TagsCacheStore(path, "user@vc"))
+    cache1.add_category("category", "cid")
+    cache1.add_tag("cid", "tag", "tid")
+    cache1.set_loaded()
+
+    # another process
+    cache2 = TagsCache(TagsCacheStore(path, "user@vc"))
+    assert cache2.get_category_id("category") == "cid"
+    assert cache2.get_tag_id("cid", "tag") == "tid"
+    assert cache2.is_loaded(ttl=60)
+
+    # added after the cache was loaded
+    cache1.add_tag("cid", "tag2", "tid2")
+    assert cache2.get_tag_name("tid2") == "tag2"
+
+    cache1.delete_tag("tid")
+    cache1.delete_not_existing_categories([])
+    cache3 = TagsCache(TagsCacheStore(path, "user@vc"))
+    assert cache3.get_tag_id("cid", "tag") is None
+    assert cache3.get_category_name("cid") is None
+    assert cache3.get_tag_name("tid2") == "tag2"
+
+    # other vCenter user doesn't see these entries
+    other = TagsCache(TagsCacheStore(path, "other@vc"))
+    assert other.get_tag_name("tid2") is None
+    assert not other.is_loaded(ttl=60)
+
+
+def test_tags_cache_works_if_store_is_broken(tmp_path):
+    cache = TagsCache(TagsCacheStore(str(tmp_path), "user@vc"))  # it's a dir
+
+    cache.add_category("category", "cid")
+
+    assert cache.get_category_id("category") == "cid"
+    assert cache.get_category_id("unknown") is None
+
+
+def test_tags_cache_evicts_least_recently_used_tags():
+    cache = TagsCache(max_tags=2)
+    cache.add_category("category", "cid")
+    cache.add_tag("cid", "tag1", "tid1")
+    cache.add_tag("cid", "tag2", "tid2")
+    assert cache.get_tag_id("cid", "tag1") == "tid1"  # tag2 is the oldest now
+
+    cache.add_tag("cid", "tag3", "tid3")
+
+    assert cache.get_tag_name("tid2") is None
+    assert cache.get_tag_name("tid1") == "tag1"
+    assert cache.get_tag_name("tid3") == "tag3"
+    assert cache.get_category_id("category") == "cid"
+    assert cache.stats == TagsCacheStats(
+        hits=4, misses=1, evictions=1, categories=1, tags=2
+    )
+
+
+def test_tags_cache_is_thread_safe():
+    cache = TagsCache(max_tags=50)
+
+    def add_and_get(i):
+        for j in range(100):
+            cache.add_tag(f"cid{i}", f"tag{j}", f"tid{i}-{j}")
+            cache.get_tag_id(f"cid{i}", f"tag{j}")
+            cache.delete_tag(f"tid{i}-{j - 10}")
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(add_and_get, range(8)))
+
+    assert cache.stats.tags <= 50
@@ -3,7 +3,13 @@ from unittest.mock import Mock
 import pytest
 from pyVmomi import vim
 
-from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+from cloudshell.cp.vcenter.handlers.config_spec_handler import ConfigSpecHandler
+from cloudshell.cp.vcenter.handlers.network_handler import DVPortGroupHandler
+from cloudshell.cp.vcenter.handlers.vm_handler import (
+    CUSTOMIZATION_PENDING_KEY,
+    VmHandler,
+    VmIsNotPowered,
+)
 from cloudshell.cp.vcenter.handlers.vnic_handler import Vnic, VnicNotFound
 
 
@@ -72,3 +78,92 @@ def test_uuid_and_bios_uuid(vm):
     # check that VM Handler returns correct UUIDs
     assert vm.uuid == vc_vm.config.instanceUuid
     assert vm.bios_uuid == vc_vm.config.uuid
+
+
+def test_instant_clone(vm, vc_vm, monkeypatch):
+    vc_vm.summary.runtime.powerState = "poweredOn"
+    new_vc_vm = Mock()
+    monkeypatch.setattr(
+        "cloudshell.cp.vcenter.handlers.vm_handler.Task",
+        Mock(return_value=Mock(wait=Mock(return_value=new_vc_vm))),
+    )
+    monkeypatch.setattr(VmHandler, "_ensure_dv_ports_for_clone", Mock())
+
+    datastore = Mock(get_vc_obj=Mock(return_value=Mock(spec=vim.Datastore)))
+    folder = Mock(get_vc_obj=Mock(return_value=Mock(spec=vim.Folder)))
+
+    new_vm = vm.instant_clone(
+        "new-vm", datastore, folder, guest_info={"guestinfo.hostname": "new-vm"}
+    )
+
+    assert new_vm.get_vc_obj() is new_vc_vm
+    spec = vc_vm.InstantClone_Task.call_args.kwargs["spec"]
+    assert spec.name == "new-vm"
+    assert [(o.key, o.value) for o in spec.config] == [("guestinfo.hostname", "new-vm")]
+
+
+def test_instant_clone_of_powered_off_vm(vm, vc_vm):
+    vc_vm.summary.runtime.powerState = "poweredOff"
+
+    with pytest.raises(VmIsNotPowered):
+        vm.instant_clone("new-vm", Mock(), Mock())
+
+    vc_vm.InstantClone_Task.assert_not_called()
+
+
+def test_clone_vm_with_config_spec(vm, vc_vm, monkeypatch):
+    new_vc_vm = Mock()
+    monkeypatch.setattr(
+        "cloudshell.cp.vcenter.handlers.vm_handler.Task",
+        Mock(return_value=Mock(wait=Mock(return_value=new_vc_vm))),
+    )
+    monkeypatch.setattr(VmHandler, "_ensure_dv_ports_for_clone", Mock())
+    reconfigure_vm = Mock()
+    monkeypatch.setattr(VmHandler, "reconfigure_vm", reconfigure_vm)
+    datastore = Mock(get_vc_obj=Mock(return_value=Mock(spec=vim.Datastore)))
+    folder = Mock(get_vc_obj=Mock(return_value=Mock(spec=vim.Folder)))
+
+    new_vm = vm.clone_vm(
+        "new-vm", datastore, folder, config_spec=ConfigSpecHandler(2, 4, [])
+    )
+
+    assert new_vm.get_vc_obj() is new_vc_vm
+    spec = vc_vm.Clone.call_args.kwargs["spec"]
+    assert (spec.config.numCPUs, spec.config.memoryMB) == (2, 4096)
+    reconfigure_vm.assert_not_called()
+
+
+def test_clone_vm_with_customization(vm, vc_vm, monkeypatch):
+    monkeypatch.setattr(
+        "cloudshell.cp.vcenter.handlers.vm_handler.Task",
+        Mock(return_value=Mock(wait=Mock(return_value=Mock()))),
+    )
+    monkeypatch.setattr(VmHandler, "_ensure_dv_ports_for_clone", Mock())
+    datastore = Mock(get_vc_obj=Mock(return_value=Mock(spec=vim.Datastore)))
+    folder = Mock(get_vc_obj=Mock(return_value=Mock(spec=vim.Folder)))
+    custom_spec = Mock()
+    custom_spec.spec.spec = vim.vm.customization.Specification()
+
+    vm.clone_vm("new-vm", datastore, folder, customization=custom_spec)
+
+    spec = vc_vm.Clone.call_args.kwargs["spec"]
+    assert spec.customization is custom_spec.spec.spec
+    assert [(o.key, o.value) for o in spec.config.extraConfig] == [
+        (CUSTOMIZATION_PENDING_KEY, "true")
+    ]
+
+
+def test_ensure_dv_ports_skips_reconnected_vnics(vm, vc_vm, monkeypatch):
+    dvs_backing = vim.vm.device.VirtualEthernetCard.DistributedVirtualPortBackingInfo
+    for device, pg_key in zip(vc_vm.config.hardware.device, ["pg1", "pg2", "pg2"]):
+        device.backing = Mock(spec=dvs_backing, port=Mock(portgroupKey=pg_key))
+    pg1 = Mock(key="pg1")
+    pg2 = Mock(key="pg2")
+    monkeypatch.setattr(VmHandler, "dv_port_groups", [pg1, pg2])
+    target_pg = Mock(spec=DVPortGroupHandler, key="pg3")
+
+    vm._ensure_dv_ports_for_clone({"Network adapter 1": target_pg, "3": target_pg})
+
+    pg1.ensure_free_ports.assert_not_called()
+    pg2.ensure_free_ports.assert_called_once_with(1)
+    target_pg.ensure_free_ports.assert_called_once_with(2)
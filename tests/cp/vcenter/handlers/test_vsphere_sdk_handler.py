@@ -2,7 +2,12 @@ from unittest.mock import Mock
 
 import pytest
 
-from cloudshell.cp.vcenter.handlers.vsphere_api_handler import TagAlreadyExists
+from cloudshell.cp.vcenter.handlers import vsphere_sdk_handler
+from cloudshell.cp.vcenter.handlers.vsphere_api_handler import (
+    TagAlreadyExists,
+    TagApiException,
+    TagIdDoesntExists,
+)
 from cloudshell.cp.vcenter.handlers.vsphere_sdk_handler import (
     VSphereSDKHandler,
     _normalize_tags,
@@ -35,3 +40,186 @@ def test_tag_was_deleted_while_we_searching_for_it():
 )
 def test__normalize_tags(tags, expected):
     assert _normalize_tags(tags) == expected
+
+
+def test_preload_cache():
+    categories = {f"cat_id{i}": f"cat{i}" for i in range(3)}
+    tags = {
+        f"tag_id{i}{j}": (f"tag{j}", f"cat_id{i}") for i in range(3) for j in range(5)
+    }
+    client = Mock(
+        get_category_list=Mock(return_value=list(categories)),
+        get_category_info=Mock(side_effect=lambda id_: {"name": categories[id_]}),
+        get_all_category_tags=Mock(
+            side_effect=lambda cid: [id_ for id_, (_, c) in tags.items() if c == cid]
+        ),
+        get_tag_info=Mock(
+            side_effect=lambda id_: {"name": tags[id_][0], "category_id": tags[id_][1]}
+        ),
+    )
+    handler = VSphereSDKHandler(client, None)
+
+    handler.preload_cache()
+    handler.preload_cache()  # already loaded
+
+    assert client.get_category_info.call_count == 3
+    assert client.get_tag_info.call_count == 15
+    assert handler._get_category_id("cat1") == "cat_id1"
+    assert handler._get_tag_id("tag4", "cat_id2") == "tag_id24"
+    assert client.get_tag_info.call_count == 15
+
+    handler.preload_cache(force=True)  # everything is cached already
+    assert client.get_tag_info.call_count == 15
+
+
+def test_delete_unused_tags(monkeypatch):
+    monkeypatch.setattr(vsphere_sdk_handler, "TAGS_BATCH_SIZE", 2)
+    # tag3 is detached after the first check, tag4 is used all the time,
+    # tag5 is omitted by vCenter, e.g. the user can't read it
+    used_per_round = [{"tag3", "tag4"}, {"tag4"}, {"tag4"}]
+    sleep = Mock(side_effect=lambda _: used_per_round.pop(0))
+    monkeypatch.setattr(vsphere_sdk_handler.time, "sleep", sleep)
+
+    def list_attached_objects_on_tags(tag_ids):
+        return [
+            {
+                "tag_id": tag_id,
+                "object_ids": (
+                    [{"id": "vm-1", "type": "VM"}]
+                    if tag_id in used_per_round[0]
+                    else []
+                ),
+            }
+            for tag_id in tag_ids
+            if tag_id != "tag5"
+        ]
+
+    client = Mock(
+        list_attached_objects_on_tags=Mock(side_effect=list_attached_objects_on_tags),
+        delete_tag=Mock(side_effect=[None, TagIdDoesntExists("tag2"), None]),
+    )
+    handler = VSphereSDKHandler(client, None)
+
+    remained = handler.delete_unused_tags(
+        ["tag4", "tag1", "tag5", "tag2", "tag3"], wait=1.2
+    )
+
+    assert remained == ["tag4", "tag5"]
+    assert client.delete_tag.call_count == 3
+    assert "tag5" not in {c.args[0] for c in client.delete_tag.call_args_list}
+    assert client.list_attached_objects_on_tags.call_count == 6
+    assert [c.args for c in sleep.call_args_list] == [(0.5,), (1.0,)]
+
+
+def test_assign_tags_to_objects_uses_cache_and_batches():
+    client = Mock(get_category_list=Mock(return_value=[]))
+    handler = VSphereSDKHandler(client, None)
+    handler.preload_cache()
+    handler._cache.add_category("Owner", "cat_id1")
+    handler._cache.add_tag("cat_id1", "admin", "tag_id1")
+    handler._cache.add_category("Sandbox ID", "cat_id2")
+    handler._cache.add_tag("cat_id2", "sandbox", "tag_id2")
+    objs = [Mock(_moId=f"vm-{i}", _wsdl_name="VirtualMachine") for i in range(3)]
+
+    handler.assign_tags_to_objects(objs, {"Owner": "admin", "Sandbox ID": "sandbox"})
+
+    client.create_category.assert_not_called()
+    client.create_tag.assert_not_called()
+    client.attach_multiple_tags_to_object.assert_not_called()
+    assert client.attach_tag_to_multiple_objects.call_count == 2
+    client.attach_tag_to_multiple_objects.assert_called_with(
+        tag_id="tag_id2", objects=[(f"vm-{i}", "VirtualMachine") for i in range(3)]
+    )
+
+
+def test_attach_tags_in_bg():
+    client = Mock(
+        get_category_list=Mock(return_value=[]),
+        attach_multiple_tags_to_object=Mock(return_value={"success": True}),
+    )
+    handler = VSphereSDKHandler(client, None)
+    handler.preload_cache()
+    handler._cache.add_category("Owner", "cat_id")
+    handler._cache.add_tag("cat_id", "admin", "tag_id")
+    vm = Mock(_moId="vm-1", _wsdl_name="VirtualMachine")
+
+    tag_ids = handler.get_or_create_tag_ids_in_bg({"Owner": "admin"})
+    handler.attach_tags_in_bg([vm], tag_ids).result()
+
+    client.attach_multiple_tags_to_object.assert_called_once_with(
+        tag_ids=["tag_id"], obj_id="vm-1", obj_type="VirtualMachine"
+    )
+
+    client.attach_multiple_tags_to_object.side_effect = TagApiException("failed")
+    with pytest.raises(TagApiException):
+        handler.attach_tags_in_bg([vm], tag_ids).result()
+
+
+def test_attach_tags_recreates_removed_cached_tag():
+    client = Mock(
+        get_category_list=Mock(return_value=[]),
+        get_all_category_tags=Mock(return_value=[]),
+        create_tag=Mock(return_value="new_tag_id"),
+        attach_multiple_tags_to_object=Mock(
+            return_value={"success": False, "error_messages": ["not found"]}
+        ),
+        attach_tag_to_multiple_objects=Mock(
+            side_effect=[TagIdDoesntExists("tag_id2"), None, None]
+        ),
+    )
+    handler = VSphereSDKHandler(client, None)
+    handler.preload_cache()
+    handler._cache.add_category("Owner", "cat_id1")
+    handler._cache.add_tag("cat_id1", "admin", "tag_id1")
+    handler._cache.add_category("Sandbox ID", "cat_id2")
+    handler._cache.add_tag("cat_id2", "sandbox", "tag_id2")
+    vm = Mock(_moId="vm-1", _wsdl_name="VirtualMachine")
+
+    handler.assign_tags_to_objects([vm], {"Sandbox ID": "sandbox", "Owner": "admin"})
+
+    client.create_tag.assert_called_once_with(name="sandbox", category_id="cat_id2")
+    assert [
+        c.kwargs["tag_id"] for c in client.attach_tag_to_multiple_objects.mock_calls
+    ] == [
+        "tag_id2",
+        "new_tag_id",
+        "tag_id1",
+    ]
+    assert handler._get_tag_id("sandbox", "cat_id2") == "new_tag_id"
+
+
+def test_get_attached_tags_on_objects(monkeypatch):
+    monkeypatch.setattr(vsphere_sdk_handler, "TAGS_BATCH_SIZE", 2)
+    client = Mock(
+        list_attached_tags_on_objects=Mock(
+            side_effect=lambda objects: [
+                {"object_id": {"id": id_, "type": type_}, "tag_ids": ["tag", id_]}
+                for id_, type_ in objects
+            ]
+        )
+    )
+    handler = VSphereSDKHandler(client, None)
+    objs = [Mock(_moId=f"obj-{i}", _wsdl_name="Folder") for i in range(3)]
+
+    tags = handler.get_attached_tags_on_objects(objs)
+
+    assert tags == {"tag", "obj-0", "obj-1", "obj-2"}
+    assert client.list_attached_tags_on_objects.call_count == 2
+
+
+def test_get_or_create_tag_ids_collects_created():
+    client = Mock(get_category_list=Mock(return_value=[]), create_tag=Mock())
+    client.create_tag.return_value = "tag_id2"
+    handler = VSphereSDKHandler(client, None)
+    handler.preload_cache()
+    handler._cache.add_category("Owner", "cat_id1")
+    handler._cache.add_tag("cat_id1", "admin", "tag_id1")
+    handler._cache.add_category("Sandbox ID", "cat_id2")
+    created = set()
+
+    tag_ids = handler.get_or_create_tag_ids(
+        {"Owner": "admin", "Sandbox ID": "sandbox"}, created
+    )
+
+    assert tag_ids == ["tag_id1", "tag_id2"]
+    assert created == {"tag_id2"}
@@ -0,0 +1,47 @@
+import pytest
+
+from cloudshell.cp.vcenter.constants import VM_FROM_TEMPLATE_DEPLOYMENT_PATH
+from cloudshell.cp.vcenter.models.base_deployment_app import (
+    GuestInfoAttrRO,
+    IncorrectVnicNetworkFormat,
+    VnicNetworksAttrRO,
+)
+
+
+class DeployApp:
+    DEPLOYMENT_PATH = VM_FROM_TEMPLATE_DEPLOYMENT_PATH
+    vnic_networks = VnicNetworksAttrRO("vNIC Networks")
+    guest_info = GuestInfoAttrRO("Guest Info")
+
+    def __init__(self, vnic_networks=""):
+        self.attributes = {f"{self.DEPLOYMENT_PATH}.vNIC Networks": vnic_networks}
+
+
+def test_vnic_networks():
+    deploy_app = DeployApp("1: QS_dvSwitch_VLAN_11_Access; Network adapter 2:Local;")
+
+    assert deploy_app.vnic_networks == {
+        "1": "QS_dvSwitch_VLAN_11_Access",
+        "Network adapter 2": "Local",
+    }
+
+
+def test_vnic_networks_empty():
+    assert DeployApp().vnic_networks == {}
+
+
+@pytest.mark.parametrize("attr_name", ("vnic_networks", "guest_info"))
+def test_missing_attribute_returns_new_dict(attr_name):
+    deploy_app = DeployApp()
+    deploy_app.attributes = {}
+
+    val = getattr(deploy_app, attr_name)
+    val["key"] = "value"
+
+    assert getattr(deploy_app, attr_name) == {}
+
+
+@pytest.mark.parametrize("text", ("1", "1:", ":Local"))
+def test_incorrect_vnic_networks(text):
+    with pytest.raises(IncorrectVnicNetworkFormat):
+        DeployApp(text).vnic_networks
@@ -87,6 +87,14 @@ def test_resource_config(resource_command_context, cs_api):
     assert conf.forged_transmits == EXPECTED_FORGED_TRANSMITS
     assert conf.mac_changes == EXPECTED_MAC_ADDRESS_CHANGES
     assert conf.enable_tags == EXPECTED_ENABLE_TAGS
+    assert conf.port_group_pool_size == 0
+    assert conf.tags_cache_path == ""
+    assert conf.max_clones_per_host == 0
+    assert conf.load_aware_host_placement is False
+    assert conf.vm_pool_size == 0
+    assert conf.customize_on_clone is False
+    assert conf.template_replicas == 0
+    assert conf.max_deploy_workers == 10
 
 
 def test_from_cs_resource_details(cs_api):
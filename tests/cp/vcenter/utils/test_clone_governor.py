@@ -0,0 +1,108 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from cloudshell.cp.core.exceptions import CancellationContextException
+
+from cloudshell.cp.vcenter.utils.clone_governor import (
+    HOST,
+    SOURCE_DATASTORE,
+    TARGET_DATASTORE,
+    CloneGovernor,
+    CloneQueueStats,
+    _ResourceSlots,
+)
+
+SRC = (SOURCE_DATASTORE, "ds1")
+DST = (TARGET_DATASTORE, "ds2")
+
+
+@pytest.fixture
+def governor():
+    return CloneGovernor()
+
+
+def test_limit_concurrent_clones(governor):
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def clone():
+        nonlocal active, max_active
+        with governor.clone_slot({SRC: 2, DST: 3}):
+            with lock:
+                active += 1
+                max_active = max(max_active, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+
+    with ThreadPoolExecutor(6) as executor:
+        for _ in range(6):
+            executor.submit(clone)
+
+    assert max_active == 2
+    assert governor.stats[SRC].active == 0
+    assert governor.stats[SRC].waiting == 0
+
+
+def test_unlimited(governor):
+    with governor.clone_slot({SRC: 0}):
+        pass
+
+    assert governor.stats == {}
+
+
+def test_fifo_order(governor):
+    order = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def first():
+        with governor.clone_slot({SRC: 1}):
+            started.set()
+            release.wait()
+
+    def clone(n):
+        with governor.clone_slot({SRC: 1}):
+            order.append(n)
+
+    with ThreadPoolExecutor(4) as executor:
+        executor.submit(first)
+        started.wait()
+        for n in range(3):
+            executor.submit(clone, n)
+            while governor.stats[SRC].waiting != n + 1:
+                time.sleep(0.001)
+        assert governor.stats[SRC] == CloneQueueStats(1, 1, 3, None)
+        release.set()
+
+    assert order == [0, 1, 2]
+
+
+def test_cancel_waiting_clone(governor):
+    with governor.clone_slot({SRC: 1}):
+        with patch("cloudshell.cp.vcenter.utils.clone_governor.WAIT_TICK", 0.01):
+            with pytest.raises(CancellationContextException):
+                with governor.clone_slot({SRC: 1, (HOST, "h"): 1}, lambda: True):
+                    pass
+
+    assert governor.stats[SRC].waiting == 0
+    assert governor.stats[(HOST, "h")].active == 0
+
+
+def test_adapt_limit_to_duration():
+    slots = _ResourceSlots(max_limit=4, limit=4)
+
+    slots.record(10)
+    assert slots.limit == 4
+    for _ in range(5):
+        slots.record(100)
+    assert slots.limit < 4
+
+    for _ in range(20):
+        slots.record(10)
+    assert slots.limit == 4
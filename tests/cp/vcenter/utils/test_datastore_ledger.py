@@ -0,0 +1,76 @@
+from unittest.mock import Mock
+
+import pytest
+
+from cloudshell.cp.vcenter.handlers.datastore_handler import DatastoreHandler
+from cloudshell.cp.vcenter.handlers.storage_pod_handler import (
+    StoragePodHandler,
+    StoragePodIsEmpty,
+)
+from cloudshell.cp.vcenter.utils.datastore_ledger import DatastoreLedger
+
+GB = 10**9
+
+
+def _datastore(name, free_space):
+    vc_ds = Mock()
+    vc_ds.name = name
+    vc_ds.summary.freeSpace = free_space
+    return DatastoreHandler(vc_ds, Mock())
+
+
+@pytest.fixture
+def ledger():
+    return DatastoreLedger()
+
+
+@pytest.fixture
+def storage_pod(monkeypatch):
+    datastores = [_datastore("ds1", 100 * GB), _datastore("ds2", 60 * GB)]
+    monkeypatch.setattr(StoragePodHandler, "datastores", datastores)
+    return StoragePodHandler(Mock(), Mock())
+
+
+def test_reserve_by_projected_free_space(ledger, storage_pod):
+    ds1, ds2 = storage_pod.datastores
+
+    reservations = [ledger.reserve(storage_pod, 30 * GB) for _ in range(3)]
+
+    assert [r.datastore for r in reservations] == [ds1, ds1, ds2]
+    assert ledger.get_projected_free_space(ds1) == 40 * GB
+    assert ledger.get_projected_free_space(ds2) == 30 * GB
+
+    for reservation in reservations:
+        ledger.release(reservation)
+    assert ledger.get_projected_free_space(ds1) == 100 * GB
+
+
+def test_spread_clones_with_similar_free_space(ledger, storage_pod):
+    ds1, ds2 = storage_pod.datastores
+    ds2.get_vc_obj().summary.freeSpace = 95 * GB
+
+    first = ledger.reserve(storage_pod, 0)
+    second = ledger.reserve(storage_pod, 0)
+
+    assert (first.datastore, second.datastore) == (ds1, ds2)
+
+
+def test_release_on_failure(ledger):
+    ds = _datastore("ds", 100 * GB)
+
+    with pytest.raises(ValueError):
+        with ledger.reserved(ds, 10 * GB) as datastore:
+            assert datastore is ds
+            assert ledger.get_projected_free_space(ds) == 90 * GB
+            raise ValueError
+
+    assert ledger.get_projected_free_space(ds) == 100 * GB
+
+
+def test_reserve_on_empty_storage_pod(ledger, monkeypatch):
+    monkeypatch.setattr(StoragePodHandler, "datastores", [])
+    vc_pod = Mock()
+    vc_pod.name = "pod"
+
+    with pytest.raises(StoragePodIsEmpty, match="Storage Pod 'pod'"):
+        ledger.reserve(StoragePodHandler(vc_pod, Mock()), GB)
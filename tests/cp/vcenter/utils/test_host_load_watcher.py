@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from collections import namedtuple
+from unittest.mock import Mock
+
+import pytest
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.utils.host_load_watcher import HostLoadWatcher
+
+change = namedtuple("change", "name val")
+GB = 10**9
+
+
+def _host_changes(cpu_usage, memory_usage, datastores, state="connected"):
+    return [
+        change("summary.quickStats.overallCpuUsage", cpu_usage),
+        change("summary.quickStats.overallMemoryUsage", memory_usage),
+        change("summary.hardware.cpuMhz", 2000),
+        change("summary.hardware.numCpuCores", 10),
+        change("summary.hardware.memorySize", 100 * GB),
+        change("runtime.connectionState", state),
+        change("runtime.inMaintenanceMode", False),
+        change("datastore", datastores),
+    ]
+
+
+@pytest.fixture()
+def vc_ds():
+    return Mock(spec=vim.Datastore)
+
+
+@pytest.fixture()
+def vc_hosts():
+    return [Mock(spec=vim.HostSystem) for _ in range(3)]
+
+
+@pytest.fixture()
+def watcher(si, container, object_spec, filter_spec, property_collector):
+    return HostLoadWatcher(si, container)
+
+
+@pytest.fixture()
+def populated_watcher(watcher, property_collector, vc_hosts, vc_ds):
+    host1, host2, host3 = vc_hosts
+    obj_set = [
+        # load 40% by memory
+        Mock(obj=host1, kind="enter", changeSet=_host_changes(2000, 40_000, [vc_ds])),
+        # load 50% by CPU
+        Mock(obj=host2, kind="enter", changeSet=_host_changes(10000, 30_000, [vc_ds])),
+        # idle, but disconnected
+        Mock(
+            obj=host3,
+            kind="enter",
+            changeSet=_host_changes(0, 0, [vc_ds], "disconnected"),
+        ),
+    ]
+    property_collector.WaitForUpdatesEx.side_effect = [
+        Mock(version="1", filterSet=[Mock(objectSet=obj_set)]),
+        None,
+    ]
+    return watcher
+
+
+def test_pick_least_loaded_host(populated_watcher, vc_hosts):
+    host1, host2, _ = vc_hosts
+
+    picked = [populated_watcher.pick_host(15 * GB).get_vc_obj() for _ in range(3)]
+
+    # reserved memory moves next VMs to the other host
+    assert picked == [host1, host2, host2]
+
+
+def test_release_host(populated_watcher, vc_hosts):
+    host1, _, _ = vc_hosts
+
+    with populated_watcher.reserved_host(20 * GB) as host:
+        assert host.get_vc_obj() == host1
+    with populated_watcher.reserved_host(20 * GB) as host:
+        assert host.get_vc_obj() == host1
+
+
+def test_no_host_with_datastore(populated_watcher, vc_ds):
+    datastore = Mock(get_vc_obj=Mock(return_value=Mock(spec=vim.Datastore)))
+
+    assert populated_watcher.pick_host(GB, datastore) is None
+    assert populated_watcher.pick_host(GB, Mock(get_vc_obj=lambda: vc_ds))
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import pytest
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.handlers.task import TaskFailed
+from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+from cloudshell.cp.vcenter.utils import linked_clone_base as base_module
+from cloudshell.cp.vcenter.utils.linked_clone_base import (
+    BASE_SNAPSHOT_NAME,
+    get_base_vm_name,
+    get_linked_clone_base,
+    remove_unused_bases,
+)
+
+
+@pytest.fixture(autouse=True)
+def last_cleanup(monkeypatch):
+    monkeypatch.setattr(base_module, "_last_cleanup", {})
+
+
+@pytest.fixture()
+def vm_template():
+    template = Mock(change_version="1", bios_uuid="bios-uuid", datastores=[Mock()])
+    template.name = "template"
+    template.get_vc_obj.return_value = Mock(_moId="vm-1")
+    return template
+
+
+@pytest.fixture()
+def base_folder():
+    return Mock(find_child=Mock(return_value=None), find_items=Mock(return_value=[]))
+
+
+@pytest.fixture()
+def get_snapshot(monkeypatch):
+    get_snapshot = Mock()
+    monkeypatch.setattr(VmHandler, "get_snapshot_by_path", get_snapshot)
+    return get_snapshot
+
+
+def test_base_name_depends_on_template_version(vm_template):
+    name = get_base_vm_name(vm_template)
+    vm_template.change_version = "2"
+
+    assert name.startswith("QS_BASE_template_")
+    assert get_base_vm_name(vm_template) != name
+
+
+def test_create_base(vm_template, base_folder):
+    base_vm = vm_template.clone_vm.return_value
+
+    vm, snapshot = get_linked_clone_base(vm_template, base_folder, Mock())
+
+    assert vm is base_vm
+    assert snapshot is base_vm.get_snapshot_by_path.return_value
+    args, kwargs = vm_template.clone_vm.call_args
+    assert args[0] == get_base_vm_name(vm_template)
+    assert args[1] is vm_template.datastores[0]
+    assert kwargs["config_spec"].bios_uuid == "bios-uuid"
+    base_vm.create_snapshot.assert_called_once_with(
+        BASE_SNAPSHOT_NAME, dump_memory=False, on_task_progress=None
+    )
+
+
+def test_reuse_base(vm_template, base_folder, get_snapshot):
+    vc_vm = Mock()
+    base_folder.find_child.return_value = vc_vm
+
+    vm, snapshot = get_linked_clone_base(vm_template, base_folder, Mock())
+
+    assert vm.get_vc_obj() is vc_vm
+    assert snapshot is get_snapshot.return_value
+    get_snapshot.assert_called_once_with(BASE_SNAPSHOT_NAME)
+    vm_template.clone_vm.assert_not_called()
+
+
+def test_base_created_by_another_process(vm_template, base_folder, get_snapshot):
+    vc_vm = Mock()
+    base_folder.find_child.side_effect = [None, vc_vm]
+    vm_template.clone_vm.side_effect = TaskFailed(Mock())
+
+    vm, _ = get_linked_clone_base(vm_template, base_folder, Mock())
+
+    assert vm.get_vc_obj() is vc_vm
+
+
+def _vc_vm(name, vmx_path, disk_parents=()):
+    backing_type = vim.vm.device.VirtualDisk.FlatVer2BackingInfo
+    backing = None
+    for file_name in reversed(disk_parents):
+        backing = backing_type(fileName=file_name, parent=backing)
+    disk = vim.vm.device.VirtualDisk(backing=backing_type(parent=backing))
+    vc_vm = Mock(config=Mock(files=Mock(vmPathName=vmx_path)))
+    vc_vm.name = name
+    vc_vm.config.hardware.device = [disk]
+    return vc_vm
+
+
+def test_remove_unused_bases(vm_template, base_folder, monkeypatch):
+    deleted = []
+    monkeypatch.setattr(VmHandler, "delete", lambda vm: deleted.append(vm.get_vc_obj()))
+    current_name = get_base_vm_name(vm_template)
+    prefix = current_name.rsplit("_", 1)[0]
+    current = _vc_vm(current_name, f"[ds] {current_name}/base.vmx")
+    used = _vc_vm(f"{prefix}_used", f"[ds] {prefix}_used/base.vmx")
+    unused = _vc_vm(f"{prefix}_unused", f"[ds] {prefix}_unused/base.vmx")
+    clone = _vc_vm(
+        "clone",
+        "[ds] clone/clone.vmx",
+        ["[ds] clone/clone.vmdk", f"[ds] {prefix}_used/base-000001.vmdk"],
+    )
+    other = _vc_vm("other", "[ds] other/other.vmx")
+    for vc_vm in (current, used, unused):
+        vc_vm.datastore = [Mock(vm=[current, used, unused, clone, other])]
+    base_folder.find_items.return_value = [current, used, unused, other]
+
+    remove_unused_bases(vm_template, base_folder)
+    remove_unused_bases(vm_template, base_folder)  # checked recently
+
+    assert deleted == [unused]
+    assert base_folder.find_items.call_count == 1
@@ -11,6 +11,11 @@ from cloudshell.cp.vcenter.handlers.network_handler import (
     NetworkHandler,
     NetworkNotFound,
 )
+from cloudshell.cp.vcenter.utils.network_watcher import (
+    acquire_network_watcher,
+    release_network_watcher,
+    shared_network_watcher,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -143,3 +148,47 @@ def test_wait_appears(network_watcher, monkeypatch):
     assert net.get_vc_obj() == net2
     # we don't need to wait for the last update
     assert len(network_watcher._networks) == 2
+
+
+def test_shared_network_watcher(
+    si, container, object_spec, filter_spec, property_collector
+):
+    with shared_network_watcher(si, container) as watcher:
+        assert watcher.in_use
+        assert acquire_network_watcher(si, container) is watcher
+        release_network_watcher(watcher)
+
+    # kept warm after release
+    assert not watcher.in_use
+    assert acquire_network_watcher(si, container) is watcher
+    release_network_watcher(watcher)
+    property_collector.Destroy.assert_not_called()
+
+    # destroyed with the session
+    si._run_on_disconnect()
+    property_collector.Destroy.assert_called_once_with()
+    assert acquire_network_watcher(si, container) is not watcher
+
+
+def test_update_networks_renamed(network_watcher, property_collector):
+    net = Mock(spec=vim.Network)
+    change = namedtuple("change", "name val")
+    property_collector.WaitForUpdatesEx.side_effect = [
+        Mock(
+            version="1",
+            filterSet=[
+                Mock(
+                    objectSet=[
+                        Mock(obj=net, kind="enter", changeSet=[change("name", "old")]),
+                        Mock(obj=net, kind="modify", changeSet=[change("name", "new")]),
+                    ]
+                )
+            ],
+        ),
+        None,
+    ]
+
+    network_watcher.update_networks(wait=0)
+
+    assert network_watcher._networks == {"new": net}
+    assert network_watcher._network_to_name == {net: "new"}
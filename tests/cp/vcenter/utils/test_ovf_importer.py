@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import io
+import tarfile
+from unittest.mock import Mock
+
+import pytest
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.utils import ovf_importer as importer_module
+from cloudshell.cp.vcenter.utils.ovf_importer import (
+    ImageArguments,
+    OvfImportCancelled,
+    OvfImporter,
+    OvfImportException,
+)
+
+DESCRIPTOR = b"<Envelope/>"
+DISKS = {"disk1.vmdk": b"a" * 100, "disk2.vmdk": b""}
+
+
+def _create_ova(path, files):
+    with tarfile.open(path, "w") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+@pytest.fixture()
+def ova(tmp_path):
+    return _create_ova(tmp_path / "image.ova", {"image.ovf": DESCRIPTOR, **DISKS})
+
+
+@pytest.fixture()
+def uploads(monkeypatch):
+    uploads = {}
+
+    def request(session, method, url, data, headers):
+        assert session.verify is False
+        assert data  # empty files are sent too
+        uploads[url] = b"".join(iter(lambda: data.read(), b""))
+        return Mock(ok=True)
+
+    monkeypatch.setattr(importer_module.requests.Session, "request", request)
+    return uploads
+
+
+class FakeLease:
+    """Lease that changes its state like vCenter, info is valid only when ready."""
+
+    def __init__(self):
+        self._state = "initializing"
+        self.entity = Mock(spec=vim.VirtualMachine)
+        self.HttpNfcLeaseProgress = Mock()
+        self.HttpNfcLeaseAbort = Mock(side_effect=self._finish)
+        self.HttpNfcLeaseComplete = Mock(side_effect=self._finish)
+
+    @property
+    def state(self):
+        state = self._state
+        if state == "initializing":
+            self._state = "ready"  # ready on the next check
+        return state
+
+    def _finish(self, *args):
+        self._state = "done"
+
+    @property
+    def info(self):
+        if self._state != "ready":
+            raise vim.fault.InvalidState()
+        return Mock(
+            entity=self.entity,
+            deviceUrl=[
+                Mock(importKey="key-1", url="https://*/nfc/disk-1"),
+                Mock(importKey="key-2", url="https://*/nfc/disk-2"),
+            ],
+        )
+
+
+@pytest.fixture()
+def vc_lease(monkeypatch):
+    monkeypatch.setattr(importer_module, "LEASE_READY_INTERVAL", 0)
+    return FakeLease()
+
+
+@pytest.fixture()
+def si():
+    spec = Mock(warning=[], error=[], importSpec=vim.VirtualMachineImportSpec())
+    spec.fileItem = [
+        Mock(path="disk1.vmdk", deviceId="key-1", size=100, create=True),
+        Mock(path="disk2.vmdk", deviceId="key-2", size=0, create=True),
+    ]
+    si = Mock(session_cookie="cookie")
+    si.get_vc_obj().content.ovfManager.CreateImportSpec.return_value = spec
+    return si
+
+
+@pytest.fixture()
+def cancellation_manager():
+    return Mock(cancellation_context=Mock(is_cancelled=False))
+
+
+@pytest.fixture()
+def resource_pool(vc_lease):
+    resource_pool = Mock()
+    resource_pool.get_vc_obj().ImportVApp.return_value = vc_lease
+    return resource_pool
+
+
+def _import(si, cancellation_manager, resource_pool, image):
+    return OvfImporter(si, cancellation_manager, "vcenter").import_vm(
+        image, "vm", resource_pool, Mock(), Mock(), ImageArguments(), {}
+    )
+
+
+def test_image_arguments():
+    args = ImageArguments.from_list(
+        ["--diskMode=thin", "--net:VM Network=QS", "--prop:ip=1.1.1.1", "--quiet"]
+    )
+
+    assert args == ImageArguments("thin", {"VM Network": "QS"}, {"ip": "1.1.1.1"})
+
+
+def test_import_ova(si, cancellation_manager, resource_pool, vc_lease, uploads, ova):
+    vm = _import(si, cancellation_manager, resource_pool, ova)
+
+    assert vm.get_vc_obj() is vc_lease.entity
+    create_spec = si.get_vc_obj().content.ovfManager.CreateImportSpec
+    assert create_spec.call_args.args[0] == DESCRIPTOR.decode()
+    assert uploads == {
+        "https://vcenter/nfc/disk-1": DISKS["disk1.vmdk"],
+        "https://vcenter/nfc/disk-2": DISKS["disk2.vmdk"],
+    }
+    vc_lease.HttpNfcLeaseComplete.assert_called_once()
+    # the default disk provisioning of vCenter
+    assert create_spec.call_args.args[3].diskProvisioning is None
+
+
+def test_import_ova_file_url(si, cancellation_manager, resource_pool, uploads, ova):
+    _import(si, cancellation_manager, resource_pool, f"file://{ova}")
+
+    assert set(uploads.values()) == set(DISKS.values())
+
+
+def test_import_unsupported_url(si, cancellation_manager, resource_pool):
+    with pytest.raises(OvfImportException, match="is not supported"):
+        _import(si, cancellation_manager, resource_pool, "s3://bucket/image.ova")
+
+
+def test_import_ova_missing_disk(si, cancellation_manager, resource_pool, tmp_path):
+    ova = _create_ova(
+        tmp_path / "image.ova", {"image.ovf": DESCRIPTOR, "disk1.vmdk": b"a"}
+    )
+
+    with pytest.raises(OvfImportException, match="disk2.vmdk"):
+        _import(si, cancellation_manager, resource_pool, ova)
+
+    resource_pool.get_vc_obj().ImportVApp.assert_not_called()
+
+
+def test_import_cancelled(
+    si, cancellation_manager, resource_pool, vc_lease, uploads, ova
+):
+    cancellation_manager.cancellation_context.is_cancelled = True
+
+    with pytest.raises(OvfImportCancelled):
+        _import(si, cancellation_manager, resource_pool, ova)
+
+    vc_lease.HttpNfcLeaseAbort.assert_called_once()
+    vc_lease.HttpNfcLeaseComplete.assert_not_called()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import pytest
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.handlers.network_handler import DVPortGroupHandler
+from cloudshell.cp.vcenter.handlers.switch_handler import PortGroupExists
+from cloudshell.cp.vcenter.handlers.task import TaskFailed
+from cloudshell.cp.vcenter.utils.port_group_pool import PortGroupPool
+
+POOL_PG_NAME = "QS_dvSwitch_POOL_12345678"
+
+
+@pytest.fixture()
+def switch():
+    switch = Mock()
+    switch.name = "dvSwitch"
+    return switch
+
+
+@pytest.fixture()
+def pool(switch, network_watcher, update_network_do_nothing):
+    return PortGroupPool(switch, network_watcher, 2)
+
+
+@pytest.fixture()
+def update_network_do_nothing(monkeypatch, network_watcher):
+    monkeypatch.setattr(network_watcher, "update_networks", Mock())
+
+
+@pytest.fixture()
+def net_settings():
+    return Mock(name="settings", vlan_id="11")
+
+
+def test_claim(pool, switch, network_watcher, net_settings):
+    vc_pg = Mock(spec=vim.dvs.DistributedVirtualPortgroup)
+    network_watcher._networks = {POOL_PG_NAME: vc_pg, "QS_dvSwitch_VLAN_11": Mock()}
+
+    pg = pool.claim(net_settings)
+
+    assert isinstance(pg, DVPortGroupHandler)
+    assert pg.get_vc_obj() is vc_pg
+    switch.reconfigure_port_group.assert_called_once()
+    # port group is not free anymore
+    assert pool.claim(net_settings) is None
+
+
+def test_claim_network_created_by_someone_else(
+    pool, switch, network_watcher, net_settings
+):
+    net_settings.name = "QS_dvSwitch_VLAN_11_Access_S"
+    network_watcher._networks = {
+        POOL_PG_NAME: Mock(spec=vim.dvs.DistributedVirtualPortgroup),
+        net_settings.name: Mock(spec=vim.dvs.DistributedVirtualPortgroup),
+    }
+    switch.reconfigure_port_group.side_effect = TaskFailed(Mock())
+
+    with pytest.raises(PortGroupExists):
+        pool.claim(net_settings)
+
+
+def test_failed_claim_keeps_port_group_in_pool(
+    pool, switch, network_watcher, net_settings
+):
+    network_watcher._networks = {
+        POOL_PG_NAME: Mock(spec=vim.dvs.DistributedVirtualPortgroup)
+    }
+    switch.reconfigure_port_group.side_effect = [Exception("failed"), None]
+
+    with pytest.raises(Exception, match="failed"):
+        pool.claim(net_settings)
+
+    assert pool.claim(net_settings) is not None
+
+
+def test_refill(pool, switch, network_watcher):
+    network_watcher._networks = {POOL_PG_NAME: Mock()}
+
+    pool.refill_in_bg()
+    pool.wait_refilled()
+
+    switch.create_port_group.assert_called_once()
+    name = switch.create_port_group.call_args.args[0]
+    assert name.startswith("QS_dvSwitch_POOL_")
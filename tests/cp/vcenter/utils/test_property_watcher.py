@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import pytest
+
+from cloudshell.cp.vcenter.utils import property_watcher
+from cloudshell.cp.vcenter.utils.property_watcher import (
+    IDLE_TIMEOUT,
+    acquire_watcher,
+    release_watcher,
+)
+
+
+class Watcher:
+    def __init__(self, si, container):
+        self._refs = 0
+        self.in_use = False
+        self.populate_in_bg = Mock()
+        self.destroy = Mock()
+
+
+@pytest.fixture()
+def now(monkeypatch):
+    now = Mock(return_value=0)
+    monkeypatch.setattr(property_watcher.time, "monotonic", now)
+    return now
+
+
+def test_watcher_created_by_another_thread(si, container):
+    created = []
+
+    class Watcher:
+        def __init__(self, si, container):
+            self._refs = 0
+            self.in_use = False
+            self.populate_in_bg = Mock()
+            self.destroy = Mock()
+            created.append(self)
+            if len(created) == 1:
+                # another thread gets the watcher while this one is created,
+                # it would be blocked if the watcher was created under the lock
+                acquire_watcher(Watcher, si, container)
+
+    watcher = acquire_watcher(Watcher, si, container)
+
+    assert watcher is created[1]
+    created[0].destroy.assert_called_once_with()
+    assert watcher._refs == 2
+    watcher.populate_in_bg.assert_called_once_with()
+    watcher.destroy.assert_not_called()
+    release_watcher(watcher)
+    release_watcher(watcher)
+    si._run_on_disconnect()
+    watcher.destroy.assert_called_once_with()
+
+
+def test_released_watcher_is_kept_warm(si, container, now):
+    watcher = acquire_watcher(Watcher, si, container)
+    release_watcher(watcher)
+
+    now.return_value = IDLE_TIMEOUT
+    assert acquire_watcher(Watcher, si, container) is watcher
+    release_watcher(watcher)
+    watcher.destroy.assert_not_called()
+    si._run_on_disconnect()
+    watcher.destroy.assert_called_once_with()
+
+
+def test_idle_watcher_is_destroyed(si, container, now):
+    watcher = acquire_watcher(Watcher, si, container)
+    release_watcher(watcher)
+    # the session is left without disconnecting, the watcher of another one
+    # removes it from the registry
+    other_si = Mock(session_key="other session")
+    now.return_value = IDLE_TIMEOUT + 1
+    other_watcher = acquire_watcher(Watcher, other_si, container)
+
+    watcher.destroy.assert_called_once_with()
+    assert watcher not in property_watcher.shared_watchers.values()
+    release_watcher(other_watcher)
+    other_watcher.destroy.assert_not_called()
+    si._run_on_disconnect()
+    property_watcher.destroy_watchers("other session")
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from collections import namedtuple
+from unittest.mock import Mock
+
+import pytest
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.handlers.cluster_handler import HostHandler
+from cloudshell.cp.vcenter.handlers.switch_handler import (
+    DvSwitchHandler,
+    DvSwitchNotFound,
+    VSwitchHandler,
+    VSwitchNotFound,
+)
+from cloudshell.cp.vcenter.utils.switch_watcher import SwitchWatcher
+
+change = namedtuple("change", "name val")
+
+
+@pytest.fixture()
+def switch_watcher(si, container, object_spec, filter_spec, property_collector):
+    return SwitchWatcher(si, container)
+
+
+def _folder(name, parent):
+    folder = Mock(spec=vim.Folder)
+    folder.name = name
+    folder.parent = parent  # the Mock argument is not the attribute
+    return folder
+
+
+@pytest.fixture()
+def network_folder():
+    return _folder("network", Mock(spec=vim.Datacenter))
+
+
+@pytest.fixture()
+def vc_dvs(network_folder):
+    dvs = Mock(spec=vim.dvs.VmwareDistributedVirtualSwitch)
+    dvs.name = "dvSwitch"
+    dvs.parent = _folder("folder", network_folder)
+    return dvs
+
+
+@pytest.fixture()
+def vc_host():
+    host = Mock(spec=vim.HostSystem)
+    host.name = "host"
+    return host
+
+
+@pytest.fixture()
+def v_switch():
+    v_switch = Mock(spec=vim.host.VirtualSwitch)
+    v_switch.name = "vSwitch0"
+    return v_switch
+
+
+@pytest.fixture()
+def populated_watcher(switch_watcher, property_collector, vc_dvs, vc_host, v_switch):
+    obj_set = [
+        Mock(obj=vc_dvs, kind="enter", changeSet=[change("name", vc_dvs.name)]),
+        Mock(
+            obj=vc_host,
+            kind="enter",
+            changeSet=[change("config.network.vswitch", [v_switch])],
+        ),
+    ]
+    property_collector.WaitForUpdatesEx.side_effect = [
+        Mock(version="1", filterSet=[Mock(objectSet=obj_set)]),
+        None,
+    ]
+    switch_watcher.update_switches(wait=0)
+    property_collector.WaitForUpdatesEx.side_effect = None
+    return switch_watcher
+
+
+def test_get_dv_switch(populated_watcher, vc_dvs):
+    dvs = populated_watcher.get_dv_switch("folder/dvSwitch")
+
+    assert isinstance(dvs, DvSwitchHandler)
+    assert dvs.get_vc_obj() is vc_dvs
+    with pytest.raises(DvSwitchNotFound):
+        populated_watcher.get_dv_switch("another")
+
+
+def test_get_switch(populated_watcher, si, vc_dvs, vc_host, v_switch):
+    host = HostHandler(vc_host, si)
+
+    assert populated_watcher.get_switch("dvSwitch", host).get_vc_obj() is vc_dvs
+    switch = populated_watcher.get_switch("vSwitch0", host)
+    assert isinstance(switch, VSwitchHandler)
+    assert switch.host is host
+    assert populated_watcher.get_hosts_with_v_switch("vSwitch0")[0].name == "host"
+    with pytest.raises(VSwitchNotFound):
+        populated_watcher.get_switch("vSwitch1", host)
+
+
+def test_switches_removed_and_renamed(
+    populated_watcher, property_collector, si, vc_dvs, vc_host
+):
+    obj_set = [
+        Mock(obj=vc_dvs, kind="modify", changeSet=[change("name", "new name")]),
+        Mock(obj=vc_host, kind="leave", changeSet=[]),
+    ]
+    updates = [Mock(version="2", filterSet=[Mock(objectSet=obj_set)])]
+    property_collector.WaitForUpdatesEx.side_effect = lambda **_: (
+        updates.pop() if updates else None
+    )
+
+    assert populated_watcher.get_dv_switch("new name").get_vc_obj() is vc_dvs
+    with pytest.raises(DvSwitchNotFound):
+        populated_watcher.get_dv_switch("dvSwitch")
+    with pytest.raises(VSwitchNotFound):
+        populated_watcher.get_v_switch("vSwitch0", HostHandler(vc_host, si))
+
+
+def test_get_dv_switch_with_the_same_name(
+    populated_watcher, property_collector, vc_dvs, network_folder
+):
+    root_dvs = Mock(spec=vim.dvs.VmwareDistributedVirtualSwitch)
+    root_dvs.parent = network_folder
+    obj_set = [Mock(obj=root_dvs, kind="enter", changeSet=[change("name", "dvSwitch")])]
+    updates = [Mock(version="2", filterSet=[Mock(objectSet=obj_set)])]
+    property_collector.WaitForUpdatesEx.side_effect = lambda **_: (
+        updates.pop() if updates else None
+    )
+
+    assert populated_watcher.get_dv_switch("dvSwitch").get_vc_obj() is root_dvs
+    assert populated_watcher.get_dv_switch("folder/dvSwitch").get_vc_obj() is vc_dvs
+    with pytest.raises(DvSwitchNotFound):
+        populated_watcher.get_dv_switch("another/dvSwitch")
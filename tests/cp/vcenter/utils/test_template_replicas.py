@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from unittest.mock import Mock
+
+import pytest
+
+from cloudshell.cp.vcenter.handlers.task import TaskState
+from cloudshell.cp.vcenter.utils import template_replicas as replicas_module
+from cloudshell.cp.vcenter.utils.template_replicas import TemplateReplicas
+
+
+def _datastore(mo_id):
+    return Mock(get_vc_obj=Mock(return_value=Mock(_moId=mo_id)))
+
+
+@pytest.fixture(autouse=True)
+def catalog(monkeypatch):
+    monkeypatch.setattr(replicas_module, "_usage", defaultdict(Counter))
+    monkeypatch.setattr(replicas_module, "_pending", {})
+    monkeypatch.setattr(replicas_module, "_retiring", {})
+    monkeypatch.setattr(replicas_module, "_removing", {})
+
+
+@pytest.fixture()
+def now(monkeypatch):
+    now = Mock(return_value=0)
+    monkeypatch.setattr(replicas_module.time, "monotonic", now)
+    return now
+
+
+@pytest.fixture()
+def vm_template():
+    template = Mock(change_version="1")
+    template.clone_vm_in_bg.return_value = Mock(state=TaskState.running)
+    template.name = "template"
+    template.get_vc_obj.return_value = Mock(_moId="vm-1")
+    return template
+
+
+@pytest.fixture()
+def replica_folder():
+    return Mock(find_items=Mock(return_value=[]))
+
+
+@pytest.fixture()
+def replicas(vm_template, replica_folder):
+    return TemplateReplicas(vm_template, replica_folder, Mock(), 1)
+
+
+def _replica(replicas, ds_id, version_prefix=None):
+    vc_vm = Mock()
+    vc_vm.Destroy_Task.return_value = Mock(info=Mock(state="running"))
+    vc_vm.name = f"{version_prefix or replicas._version_prefix}{ds_id}"
+    return vc_vm
+
+
+def test_get_replica_on_datastore(replicas, replica_folder):
+    vc_vm = _replica(replicas, "datastore-2")
+    replica_folder.find_items.return_value = [_replica(replicas, "datastore-1"), vc_vm]
+
+    assert replicas.get_replica(_datastore("datastore-2")).get_vc_obj() is vc_vm
+    assert replicas.get_replica(_datastore("datastore-3")) is None
+
+
+def test_refresh_creates_replica_once(replicas, replica_folder, vm_template):
+    datastore = _datastore("datastore-1")
+    replicas.get_replica(datastore)
+
+    replicas.refresh(datastore)
+    # the replica is being cloned
+    assert replicas.get_replica(datastore) is None
+    replicas.refresh(datastore)
+
+    vm_template.clone_vm_in_bg.assert_called_once()
+    assert vm_template.clone_vm_in_bg.call_args.args[:2] == (
+        f"{replicas._version_prefix}datastore-1",
+        datastore,
+    )
+
+
+def test_refresh_repeats_failed_clone(replicas, vm_template):
+    datastore = _datastore("datastore-1")
+    replicas.get_replica(datastore)
+    replicas.refresh(datastore)
+
+    replicas.refresh(datastore)  # is being cloned
+    vm_template.clone_vm_in_bg.return_value.state = TaskState.error
+    replicas.refresh(datastore)
+
+    assert vm_template.clone_vm_in_bg.call_count == 2
+
+
+def test_refresh_retires_less_used_and_removes_outdated(
+    replicas, replica_folder, monkeypatch, now
+):
+    rename = Mock()
+    monkeypatch.setattr(replicas_module.VmHandler, "rename", rename)
+    outdated = _replica(replicas, "datastore-1", f"{replicas._prefix}outdated_")
+    less_used = _replica(replicas, "datastore-2")
+    replica_folder.find_items.return_value = [outdated, less_used]
+    datastore = _datastore("datastore-3")
+    replicas.get_replica(_datastore("datastore-2"))
+    replicas.get_replica(datastore)
+    replicas.get_replica(datastore)
+
+    replicas.refresh(datastore)
+
+    rename.assert_called_once()
+    assert rename.call_args.args[0].startswith(f"{replicas._prefix}retired_")
+    outdated.Destroy_Task.assert_not_called()  # may be in use
+
+    now.return_value = replicas_module.RETIRE_GRACE_PERIOD + 1
+    replicas.refresh(datastore)
+    replicas.refresh(datastore)  # is being removed
+
+    outdated.Destroy_Task.assert_called_once()
+    less_used.Destroy_Task.assert_not_called()
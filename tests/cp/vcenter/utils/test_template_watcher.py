@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import pytest
+from pyVmomi import vim
+
+from cloudshell.cp.vcenter.utils.template_watcher import TemplateWatcher
+
+
+@pytest.fixture()
+def vm():
+    vc_vm = Mock(spec=vim.VirtualMachine)
+    vm = Mock(vnics=[Mock(), Mock()], guest_id="ubuntu64Guest")
+    vm.get_vc_obj.return_value = vc_vm
+    return vm
+
+
+@pytest.fixture()
+def dc(vm):
+    return Mock(get_vm_by_path=Mock(return_value=vm))
+
+
+@pytest.fixture()
+def template_watcher(si, dc, object_spec, filter_spec, property_collector):
+    return TemplateWatcher(si, dc)
+
+
+def test_get_source_is_cached(template_watcher, dc, vm, property_collector):
+    source = template_watcher.get_source("folder/template", "snapshot")
+
+    assert source.vm is vm
+    assert source.snapshot is vm.get_snapshot_by_path.return_value
+    assert source.num_vnics == 2
+    assert source.guest_id == "ubuntu64Guest"
+    property_collector.CreateFilter.assert_called_once()
+
+    assert template_watcher.get_source("folder/template", "snapshot") == source
+    dc.get_vm_by_path.assert_called_once()
+    vm.get_snapshot_by_path.assert_called_once_with("snapshot")
+
+
+def test_source_is_invalidated_on_change(template_watcher, dc, vm, property_collector):
+    template_watcher.get_source("folder/template")
+    updates = [
+        Mock(
+            version="2",
+            filterSet=[Mock(objectSet=[Mock(obj=vm.get_vc_obj(), kind="modify")])],
+        )
+    ]
+    property_collector.WaitForUpdatesEx.side_effect = lambda **_: (
+        updates.pop() if updates else None
+    )
+
+    template_watcher.get_source("folder/template")
+
+    assert dc.get_vm_by_path.call_count == 2
+    # VM is watched already
+    property_collector.CreateFilter.assert_called_once()
+
+
+def test_source_is_resolved_without_lock(template_watcher, vm, property_collector):
+    def get_snapshot_by_path(path):
+        assert not template_watcher._lock.locked()
+        # the VM is changed while its source is read
+        property_collector.WaitForUpdatesEx.side_effect = updates
+        return Mock()
+
+    vm.get_snapshot_by_path.side_effect = get_snapshot_by_path
+    updates = [
+        Mock(
+            version="2",
+            filterSet=[Mock(objectSet=[Mock(obj=vm.get_vc_obj(), kind="modify")])],
+        ),
+        None,
+    ]
+
+    template_watcher.get_source("folder/template", "snapshot")
+
+    assert not template_watcher._sources
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from datetime import datetime
+from unittest.mock import Mock
+from uuid import uuid4
+
+import pytest
+
+from cloudshell.cp.vcenter.handlers.task import TaskFailed
+from cloudshell.cp.vcenter.handlers.vm_handler import VmHandler
+from cloudshell.cp.vcenter.utils import vm_pool as vm_pool_module
+from cloudshell.cp.vcenter.utils.vm_pool import CLAIMED_KEY, VmPool
+
+TEMPLATE_MODIFIED = datetime(2026, 1, 2)
+
+
+def _vc_obj(mo_id):
+    return Mock(_moId=mo_id)
+
+
+@pytest.fixture()
+def vm_template():
+    template = Mock(modified_at=TEMPLATE_MODIFIED)
+    template.name = "template"
+    template.get_vc_obj.return_value = _vc_obj("vm-1")
+    return template
+
+
+@pytest.fixture()
+def pool_folder():
+    return Mock(find_items=Mock(return_value=[]))
+
+
+@pytest.fixture()
+def pool(vm_template, pool_folder, monkeypatch):
+    monkeypatch.setattr(vm_pool_module, "_pending", {})
+    resource_pool = Mock(get_vc_obj=Mock(return_value=_vc_obj("resgroup-1")))
+    datastore = Mock(get_vc_obj=Mock(return_value=_vc_obj("datastore-1")))
+    return VmPool(vm_template, None, resource_pool, datastore, pool_folder, 2)
+
+
+@pytest.fixture()
+def vm_methods(monkeypatch):
+    methods = Mock()
+    monkeypatch.setattr(VmHandler, "reconfigure_vm", methods.reconfigure_vm)
+    monkeypatch.setattr(VmHandler, "rename", methods.rename)
+    monkeypatch.setattr(VmHandler, "delete", methods.delete)
+    return methods
+
+
+def _member(pool, created_at=datetime(2026, 1, 3), extra_config=None):
+    vc_vm = Mock()
+    vc_vm.name = f"{pool._prefix}{uuid4().hex[:8]}"
+    vc_vm.config.createDate = created_at
+    vc_vm.config.changeVersion = "1"
+    vc_vm.config.extraConfig = [
+        Mock(key=key, value=value) for key, value in (extra_config or {}).items()
+    ]
+    vc_vm.summary.runtime.powerState = "poweredOff"
+    return vc_vm
+
+
+def test_claim(pool, pool_folder, vm_methods):
+    vc_vm = _member(pool)
+    pool_folder.find_items.return_value = [_member(pool, datetime(2026, 1, 1)), vc_vm]
+    vm_folder = Mock()
+    config_spec = Mock()
+
+    vm = pool.claim("new-vm", vm_folder, config_spec)
+
+    assert vm.get_vc_obj() is vc_vm
+    vm_methods.reconfigure_vm.assert_called_once()
+    _, kwargs = vm_methods.reconfigure_vm.call_args
+    assert kwargs["change_version"] == "1"
+    assert CLAIMED_KEY in kwargs["extra_config"]
+    vm_folder.put_inside.assert_called_once_with(vm)
+    vm_methods.rename.assert_called_once_with("new-vm", None)
+
+
+def test_claim_taken_by_another_process(pool, pool_folder, vm_methods):
+    pool_folder.find_items.return_value = [
+        _member(pool),
+        _member(pool, extra_config={CLAIMED_KEY: "1"}),
+    ]
+    vm_methods.reconfigure_vm.side_effect = TaskFailed(Mock())
+
+    assert pool.claim("new-vm", Mock(), Mock()) is None
+    vm_methods.reconfigure_vm.assert_called_once()
+
+
+def test_refill(pool, pool_folder, vm_template):
+    member = _member(pool)
+    stale_vm = _member(pool, datetime(2026, 1, 1))
+    pool_folder.find_items.return_value = [member, stale_vm]
+
+    pool.refill()
+    pool_folder.find_items.return_value = [member]
+    # started clone is counted as a pool member
+    pool.refill()
+
+    stale_vm.Destroy_Task.assert_called_once()
+    vm_template.clone_vm_in_bg.assert_called_once()
+    name = vm_template.clone_vm_in_bg.call_args.args[0]
+    assert name.startswith(pool._prefix)